@@ -0,0 +1,188 @@
+"""partition transactions by month
+
+Revision ID: a4d6f2b8c9e1
+Revises: f8a2d4c6e1b3
+Create Date: 2026-10-18 21:00:00.000000
+
+Transforma transactions em uma tabela particionada por RANGE (created_at),
+com uma partição por mês em UTC (transactions_pAAAAMM) e uma partição
+DEFAULT para datas sem mês criado. Consultas com faixa de created_at
+passam a ler só os meses envolvidos (partition pruning), e arquivar um mês
+vira um DETACH PARTITION em vez de um DELETE em massa.
+
+O PostgreSQL não converte uma tabela existente em particionada, então os
+dados são copiados para a tabela nova e os nomes trocados, tudo na mesma
+transação. Escritas ficam bloqueadas durante a cópia e leituras apenas na
+troca final: aplique em janela de manutenção. Depois, mantenha as partições
+futuras com `invoke partitions` (ver src/partitions.py).
+
+A chave primária passa a ser (id, created_at), pois toda restrição única de
+uma tabela particionada precisa incluir a chave de partição.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'a4d6f2b8c9e1'
+down_revision = 'f8a2d4c6e1b3'
+branch_labels = None
+depends_on = None
+
+# Meses futuros criados já na migração (depois, o job de manutenção assume)
+MONTHS_AHEAD = 3
+
+# Índices de transactions; na tabela particionada, o PostgreSQL os cria em
+# cada partição (inclusive nas que forem criadas depois)
+INDEXES = (
+    ('idx_transactions_type', '(type)'),
+    ('idx_transactions_created_at', '(created_at)'),
+    ('idx_transactions_amount', '(amount_cents)'),
+    ('ix_transactions_category_id', '(category_id)'),
+    ('idx_transactions_user_created_at', '(user_id, created_at DESC)'),
+    ('idx_transactions_user_category', '(user_id, category_id)'),
+)
+
+# Trigger de updated_at do database/create_tables.sql, recriado se existir
+UPDATED_AT_TRIGGER = 'update_transactions_updated_at'
+
+
+def _copy_security(old: str, new: str) -> None:
+    """
+    Repassa a new o RLS, as políticas e os GRANTs de old
+
+    CREATE TABLE ... LIKE não copia nada disso, e o DROP de old levaria
+    junto as políticas do supabase/schema.sql ("Allow all operations") e
+    as permissões de anon/authenticated. As políticas são recriadas a
+    partir de pg_policies, então ajustes feitos depois do schema.sql
+    também são preservados.
+    """
+    op.execute(f"""
+        DO $$
+        DECLARE
+            source regclass := '{old}'::regclass;
+            policy record;
+            grant_row record;
+        BEGIN
+            IF (SELECT relrowsecurity FROM pg_class WHERE oid = source) THEN
+                EXECUTE 'ALTER TABLE {new} ENABLE ROW LEVEL SECURITY';
+            END IF;
+            IF (SELECT relforcerowsecurity FROM pg_class WHERE oid = source) THEN
+                EXECUTE 'ALTER TABLE {new} FORCE ROW LEVEL SECURITY';
+            END IF;
+
+            FOR policy IN
+                SELECT * FROM pg_policies
+                WHERE schemaname = current_schema() AND tablename = '{old}'
+            LOOP
+                EXECUTE format(
+                    'CREATE POLICY %I ON {new} AS %s FOR %s TO %s%s%s',
+                    policy.policyname, policy.permissive, policy.cmd,
+                    (SELECT string_agg(CASE WHEN role = 'public' THEN 'PUBLIC' ELSE quote_ident(role) END, ', ')
+                     FROM unnest(policy.roles) AS role),
+                    COALESCE(' USING (' || policy.qual || ')', ''),
+                    COALESCE(' WITH CHECK (' || policy.with_check || ')', '')
+                );
+            END LOOP;
+
+            FOR grant_row IN
+                SELECT acl.privilege_type, acl.grantee
+                FROM pg_class, aclexplode(pg_class.relacl) AS acl
+                WHERE pg_class.oid = source AND acl.grantee <> pg_class.relowner
+            LOOP
+                EXECUTE format(
+                    'GRANT %s ON {new} TO %s', grant_row.privilege_type,
+                    CASE WHEN grant_row.grantee = 0 THEN 'PUBLIC' ELSE grant_row.grantee::regrole::text END
+                );
+            END LOOP;
+        END $$;
+    """)
+
+
+def _copy_table(source: str, target: str, partition_by: str = '') -> None:
+    """Cria target com as colunas, defaults, CHECKs e comentários de source"""
+    op.execute(f"""
+        CREATE TABLE {target} (
+            LIKE {source} INCLUDING DEFAULTS INCLUDING CONSTRAINTS INCLUDING COMMENTS INCLUDING STORAGE
+        ) {partition_by}
+    """)
+
+
+def _swap(old: str, new: str, primary_key: str) -> None:
+    """Copia as linhas de old para new, remove old e dá a new o nome transactions"""
+    op.execute(f'INSERT INTO {new} SELECT * FROM {old}')
+
+    op.execute(f"""
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM pg_trigger
+                       WHERE tgname = '{UPDATED_AT_TRIGGER}' AND tgrelid = '{old}'::regclass) THEN
+                EXECUTE 'CREATE TRIGGER {UPDATED_AT_TRIGGER} BEFORE UPDATE ON {new}
+                         FOR EACH ROW EXECUTE FUNCTION update_updated_at_column()';
+            END IF;
+        END $$;
+    """)
+    _copy_security(old, new)
+
+    op.execute(f'DROP TABLE {old}')
+    op.execute(f'ALTER TABLE {new} RENAME TO transactions')
+
+    # Chave, FK e índices só depois da carga: construir de uma vez é mais
+    # rápido do que manter a cada linha inserida
+    op.execute(f'ALTER TABLE transactions ADD CONSTRAINT transactions_pkey PRIMARY KEY {primary_key}')
+    op.execute(
+        'ALTER TABLE transactions ADD CONSTRAINT transactions_category_id_fkey '
+        'FOREIGN KEY (category_id) REFERENCES categories (id)'
+    )
+    for name, columns in INDEXES:
+        op.execute(f'CREATE INDEX {name} ON transactions {columns}')
+    op.execute("COMMENT ON TABLE transactions IS "
+               "'Tabela para armazenar todas as transações financeiras (receitas e despesas)'")
+
+
+def upgrade() -> None:
+    # Bloqueia escritas (leituras seguem) enquanto os dados são copiados
+    op.execute('LOCK TABLE transactions IN SHARE ROW EXCLUSIVE MODE')
+
+    # A chave de partição não pode ser nula
+    op.execute('UPDATE transactions SET created_at = COALESCE(updated_at, now()) WHERE created_at IS NULL')
+    op.execute('ALTER TABLE transactions ALTER COLUMN created_at SET NOT NULL')
+
+    _copy_table('transactions', 'transactions_partitioned', 'PARTITION BY RANGE (created_at)')
+
+    # Uma partição por mês, do mais antigo com dados até MONTHS_AHEAD à frente
+    op.execute(f"""
+        DO $$
+        DECLARE
+            partition_month timestamp;
+        BEGIN
+            FOR partition_month IN
+                SELECT generate_series(
+                    date_trunc('month', COALESCE(min(created_at), now()) AT TIME ZONE 'UTC'),
+                    date_trunc('month', now() AT TIME ZONE 'UTC') + interval '{MONTHS_AHEAD} months',
+                    interval '1 month'
+                )
+                FROM transactions
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF transactions_partitioned FOR VALUES FROM (%L) TO (%L)',
+                    'transactions_p' || to_char(partition_month, 'YYYYMM'),
+                    to_char(partition_month, 'YYYY-MM-DD') || ' 00:00:00+00',
+                    to_char(partition_month + interval '1 month', 'YYYY-MM-DD') || ' 00:00:00+00'
+                );
+            END LOOP;
+        END $$;
+    """)
+    op.execute('CREATE TABLE transactions_default PARTITION OF transactions_partitioned DEFAULT')
+
+    _swap('transactions', 'transactions_partitioned', '(id, created_at)')
+
+
+def downgrade() -> None:
+    op.execute('LOCK TABLE transactions IN SHARE ROW EXCLUSIVE MODE')
+
+    _copy_table('transactions', 'transactions_unpartitioned')
+
+    # DROP TABLE na tabela mãe remove todas as partições ligadas; meses já
+    # desligados (arquivados) ficam como tabelas avulsas
+    _swap('transactions', 'transactions_unpartitioned', '(id)')
+    op.execute('ALTER TABLE transactions ALTER COLUMN created_at DROP NOT NULL')
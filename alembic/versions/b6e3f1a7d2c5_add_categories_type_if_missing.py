@@ -0,0 +1,86 @@
+"""add categories.type when missing
+
+Revision ID: b6e3f1a7d2c5
+Revises: a4d6f2b8c9e1
+Create Date: 2026-10-18 21:30:00.000000
+
+O modelo Category mapeia a coluna type (enum categorytype, NOT NULL), mas
+nenhuma migração a criava: bancos montados só pelo Alembic ficavam sem ela.
+Categorias sem tipo recebem o tipo da maioria das suas transações
+(despesa quando não há nenhuma). Nos bancos em que a coluna já existe
+preenchida, a migração não faz nada.
+
+O que foi alterado fica registrado no comentário da coluna, para que o
+downgrade desfaça só isso: remover a coluna (e o enum) se foram criados
+aqui, ou apenas voltar a aceitar nulos se só o NOT NULL foi aplicado.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b6e3f1a7d2c5'
+down_revision = 'a4d6f2b8c9e1'
+branch_labels = None
+depends_on = None
+
+# Comentários de categories.type que registram o que a migração alterou
+CREATED_COLUMN_AND_TYPE = f'{revision}: coluna e enum criados'
+CREATED_COLUMN = f'{revision}: coluna criada'
+SET_NOT_NULL = f'{revision}: NOT NULL aplicado'
+
+
+def _column_nullable(connection):
+    """None se categories.type não existe; senão, se aceita nulos"""
+    is_nullable = connection.execute(sa.text("""
+        SELECT is_nullable FROM information_schema.columns
+        WHERE table_schema = current_schema() AND table_name = 'categories' AND column_name = 'type'
+    """)).scalar()
+    return None if is_nullable is None else is_nullable == 'YES'
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+    nullable = _column_nullable(connection)
+    type_exists = connection.execute(sa.text("SELECT to_regtype('categorytype') IS NOT NULL")).scalar()
+
+    # Valores gravados pelo SQLAlchemy: nomes dos membros de CategoryType
+    if not type_exists:
+        op.execute("CREATE TYPE categorytype AS ENUM ('EXPENSE', 'INCOME')")
+    op.execute('ALTER TABLE categories ADD COLUMN IF NOT EXISTS type categorytype')
+    op.execute("""
+        UPDATE categories c
+        SET type = CASE
+            WHEN (SELECT count(*) FILTER (WHERE t.type = 'income') > count(*) FILTER (WHERE t.type = 'expense')
+                  FROM transactions t WHERE t.category_id = c.id)
+            THEN 'INCOME' ELSE 'EXPENSE'
+        END::categorytype
+        WHERE c.type IS NULL
+    """)
+    # categories é pequena: o SET NOT NULL varre a tabela sob lock por pouco tempo
+    op.execute('ALTER TABLE categories ALTER COLUMN type SET NOT NULL')
+
+    if nullable is None:
+        marker = CREATED_COLUMN if type_exists else CREATED_COLUMN_AND_TYPE
+    elif nullable:
+        marker = SET_NOT_NULL
+    else:
+        return
+    op.execute(f"COMMENT ON COLUMN categories.type IS '{marker}'")
+
+
+def downgrade() -> None:
+    marker = op.get_bind().execute(sa.text("""
+        SELECT col_description('categories'::regclass, attnum)
+        FROM pg_attribute
+        WHERE attrelid = 'categories'::regclass AND attname = 'type' AND NOT attisdropped
+    """)).scalar()
+
+    if marker in (CREATED_COLUMN, CREATED_COLUMN_AND_TYPE):
+        op.execute('ALTER TABLE categories DROP COLUMN type')
+        if marker == CREATED_COLUMN_AND_TYPE:
+            op.execute('DROP TYPE categorytype')
+    elif marker == SET_NOT_NULL:
+        op.execute('ALTER TABLE categories ALTER COLUMN type DROP NOT NULL')
+        op.execute('COMMENT ON COLUMN categories.type IS NULL')
+    # Sem comentário, a coluna já existia completa e nada foi alterado
@@ -0,0 +1,49 @@
+"""create refresh_tokens table
+
+Revision ID: c2d8e4a61f93
+Revises: a9c3e5f17b02
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2d8e4a61f93'
+down_revision = 'a9c3e5f17b02'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('refresh_tokens',
+        sa.Column('jti', sa.UUID(), nullable=False),
+        sa.Column('family_id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=False),
+        sa.Column('token_hash', sa.String(length=64), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('revoked_reason', sa.String(length=20), nullable=True),
+        sa.Column('replaced_by', sa.UUID(), nullable=True),
+        sa.PrimaryKeyConstraint('jti'),
+        sa.UniqueConstraint('token_hash'),
+        sa.CheckConstraint(
+            "revoked_reason IN ('rotated', 'logout', 'reuse', 'deleted')",
+            name='check_refresh_token_revoked_reason',
+        ),
+    )
+    op.create_index('idx_refresh_tokens_family_id', 'refresh_tokens', ['family_id'], unique=False)
+    op.create_index('idx_refresh_tokens_user_id', 'refresh_tokens', ['user_id'], unique=False)
+    op.create_index(
+        'idx_refresh_tokens_revoked_at', 'refresh_tokens', ['revoked_at'],
+        unique=False, postgresql_where=sa.text('revoked_at IS NOT NULL'),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_refresh_tokens_revoked_at', table_name='refresh_tokens')
+    op.drop_index('idx_refresh_tokens_user_id', table_name='refresh_tokens')
+    op.drop_index('idx_refresh_tokens_family_id', table_name='refresh_tokens')
+    op.drop_table('refresh_tokens')
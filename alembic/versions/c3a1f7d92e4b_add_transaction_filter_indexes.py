@@ -0,0 +1,28 @@
+"""add composite indexes for transaction filters
+
+Revision ID: c3a1f7d92e4b
+Revises: 49c69a18767d
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c3a1f7d92e4b'
+down_revision = '49c69a18767d'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filtro por tipo + período, ordenado por created_at (GET /transactions/?type=...)
+    op.create_index('idx_transactions_type_created_at', 'transactions', ['type', 'created_at'], unique=False)
+    # Filtro por categorias + período (GET /transactions/?category_id=...)
+    op.create_index('idx_transactions_category_created_at', 'transactions', ['category_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_transactions_category_created_at', table_name='transactions')
+    op.drop_index('idx_transactions_type_created_at', table_name='transactions')
@@ -0,0 +1,63 @@
+"""drop unused transaction indexes
+
+Revision ID: c9f4a2e8b1d7
+Revises: b6e3f1a7d2c5
+Create Date: 2026-10-18 22:00:00.000000
+
+Medido antes da remoção, em um banco novo com os dados sintéticos da
+suíte de planos (200 mil transações, 20 usuários):
+
+    invoke explain-queries --seed --revision b6e3f1a7d2c5 --update-baseline
+
+O relatório de índices sem uso (scripts/query_plan_unused_indexes.txt)
+dessa execução, na revisão b6e3f1a7d2c5, listou:
+
+    categories.ix_categories_is_active
+    categories.ix_categories_is_default
+    categories.ix_categories_user_id
+    transactions.idx_transactions_amount
+    transactions.idx_transactions_created_at
+    transactions.idx_transactions_type
+    transactions.ix_transactions_category_id
+
+Todas as consultas filtram por user_id primeiro e usam os índices
+compostos por usuário, com type e amount_cents como filtros residuais.
+Depois de aplicar esta migração, a mesma execução sem --update-baseline
+terminou com "Planos iguais ao baseline": nenhum plano mudou. Os dois
+índices só custavam escrita em cada INSERT e UPDATE de valor.
+
+Os demais índices do relatório ficam. ix_transactions_category_id atende
+à FK de transactions para categories. idx_transactions_created_at e os
+índices de categories não entram nesta migração: pedem uma avaliação à parte.
+"""
+from alembic import op
+
+from src.partitions import create_index_concurrently
+
+
+# revision identifiers, used by Alembic.
+revision = 'c9f4a2e8b1d7'
+down_revision = 'b6e3f1a7d2c5'
+branch_labels = None
+depends_on = None
+
+UNUSED_INDEXES = (
+    ('idx_transactions_type', '(type)'),
+    ('idx_transactions_amount', '(amount_cents)'),
+)
+
+
+def upgrade() -> None:
+    # DROP INDEX CONCURRENTLY não vale para índices de tabela particionada. O
+    # DROP só altera o catálogo, mas pede lock exclusivo em transactions: o
+    # lock_timeout evita que escritas fiquem enfileiradas atrás de uma leitura longa
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    for name, _ in UNUSED_INDEXES:
+        op.execute(f'DROP INDEX IF EXISTS {name}')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        connection = op.get_bind()
+        for name, columns in UNUSED_INDEXES:
+            create_index_concurrently(connection, name, columns)
@@ -0,0 +1,81 @@
+"""require transactions.user_id
+
+Revision ID: d3f5b7a9c1e4
+Revises: c9f4a2e8b1d7
+Create Date: 2026-10-18 23:00:00.000000
+
+f4b1d9a6c2e8 deixou sem dono as transações que o backfill não conseguiu
+atribuir, invisíveis na API. Esta migração torna user_id NOT NULL e, se
+ainda houver transações sem dono, falha listando-as em vez de escondê-las:
+atribua um dono ou remova essas linhas e rode a migração de novo.
+
+Sem varrer a tabela sob lock exclusivo:
+1. CHECK (user_id IS NOT NULL) NOT VALID na tabela particionada (propaga
+   para as partições): a partir daqui nenhuma linha nova sem dono entra.
+2. VALIDATE partição por partição e depois na tabela mãe, cada um na sua
+   própria transação; VALIDATE não bloqueia escritas.
+3. SET NOT NULL, apoiado no CHECK validado, só altera o catálogo.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from src.partitions import attached_partitions
+
+
+# revision identifiers, used by Alembic.
+revision = 'd3f5b7a9c1e4'
+down_revision = 'c9f4a2e8b1d7'
+branch_labels = None
+depends_on = None
+
+CONSTRAINT = 'check_transactions_user_id_not_null'
+
+# Ids de transações sem dono mostrados no erro
+REPORT_SAMPLE_SIZE = 10
+
+
+def _report_unassigned(connection) -> None:
+    """Falha com a contagem e uma amostra das transações sem user_id"""
+    count = connection.execute(sa.text('SELECT count(*) FROM transactions WHERE user_id IS NULL')).scalar()
+    if not count:
+        return
+    sample = connection.execute(
+        sa.text('SELECT id FROM transactions WHERE user_id IS NULL ORDER BY created_at LIMIT :limit'),
+        {"limit": REPORT_SAMPLE_SIZE},
+    ).scalars().all()
+    raise RuntimeError(
+        f"{count} transação(ões) sem user_id (ex.: {', '.join(str(transaction_id) for transaction_id in sample)}). "
+        "Atribua um dono (UPDATE transactions SET user_id = ... WHERE user_id IS NULL AND ...) "
+        "ou remova-as antes de aplicar esta migração."
+    )
+
+
+def upgrade() -> None:
+    connection = op.get_bind()
+
+    # Antes do ALTER: a varredura não pode acontecer sob o lock exclusivo,
+    # que dura até o fim da transação. A aplicação sempre grava user_id; uma
+    # linha sem dono que entrasse depois daqui falharia no VALIDATE
+    _report_unassigned(connection)
+
+    # Só catálogo, com lock exclusivo breve
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    op.execute(
+        f'ALTER TABLE transactions DROP CONSTRAINT IF EXISTS {CONSTRAINT}, '
+        f'ADD CONSTRAINT {CONSTRAINT} CHECK (user_id IS NOT NULL) NOT VALID'
+    )
+
+    partitions = attached_partitions(connection)
+    with op.get_context().autocommit_block():
+        # Uma partição por transação; a validação da tabela mãe, depois,
+        # pula as partições já validadas
+        for partition in partitions:
+            op.execute(f'ALTER TABLE {partition} VALIDATE CONSTRAINT {CONSTRAINT}')
+        op.execute(f'ALTER TABLE transactions VALIDATE CONSTRAINT {CONSTRAINT}')
+
+        op.execute('ALTER TABLE transactions ALTER COLUMN user_id SET NOT NULL')
+        op.execute(f'ALTER TABLE transactions DROP CONSTRAINT {CONSTRAINT}')
+
+
+def downgrade() -> None:
+    op.execute('ALTER TABLE transactions ALTER COLUMN user_id DROP NOT NULL')
@@ -0,0 +1,48 @@
+"""create monthly_totals rollup table
+
+Revision ID: d7e2b8c4f519
+Revises: c3a1f7d92e4b
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd7e2b8c4f519'
+down_revision = 'c3a1f7d92e4b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table('monthly_totals',
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.UUID(), nullable=True),
+        sa.Column('month', sa.String(length=7), nullable=False),
+        sa.Column('category_id', sa.UUID(), nullable=True),
+        sa.Column('type', sa.String(length=10), nullable=False),
+        sa.Column('total_amount', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('transaction_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+        sa.ForeignKeyConstraint(['category_id'], ['categories.id']),
+        sa.CheckConstraint("type IN ('income', 'expense')", name='check_monthly_total_type'),
+    )
+    op.create_index('idx_monthly_totals_user_month', 'monthly_totals', ['user_id', 'month'], unique=False)
+
+    # Backfill a partir das transações existentes (meses no fuso padrão da aplicação)
+    op.execute("""
+        INSERT INTO monthly_totals (id, user_id, month, category_id, type, total_amount, transaction_count)
+        SELECT gen_random_uuid(), NULL,
+               to_char(date_trunc('month', created_at AT TIME ZONE 'America/Sao_Paulo'), 'YYYY-MM'),
+               category_id, type, SUM(amount), COUNT(*)
+        FROM transactions
+        GROUP BY 3, category_id, type;
+    """)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_monthly_totals_user_month', table_name='monthly_totals')
+    op.drop_table('monthly_totals')
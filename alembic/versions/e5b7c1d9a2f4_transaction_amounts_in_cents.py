@@ -0,0 +1,179 @@
+"""store transaction amounts as integer cents (expand)
+
+Revision ID: e5b7c1d9a2f4
+Revises: c2d8e4a61f93
+Create Date: 2026-10-18 20:00:00.000000
+
+Primeira etapa de uma migração online, sem reescrever nem travar a tabela:
+
+1. Adiciona transactions.amount_cents (BIGINT) e currency, e
+   monthly_totals.total_cents (BIGINT).
+2. Instala triggers que mantêm as colunas antigas e novas em sincronia.
+   Assim, instâncias com a versão anterior da aplicação (que gravam
+   amount / total_amount) e com a nova (que gravam os centavos) convivem
+   durante o deploy.
+3. Adiciona como NOT VALID os CHECKs novos, inclusive os que sustentam o
+   NOT NULL dos centavos: só o catálogo muda, e as escritas novas já os
+   cumprem (os triggers preenchem os centavos).
+4. Preenche os centavos em lotes, percorrendo a chave primária em faixas,
+   cada lote na sua própria transação.
+5. Valida cada CHECK e aplica SET NOT NULL em transações separadas:
+   VALIDATE varre a tabela sem bloquear escritas, e SET NOT NULL, apoiado
+   no CHECK já validado, só altera o catálogo sob o lock exclusivo.
+
+As etapas 1 a 3 são confirmadas ao entrar no primeiro autocommit_block e
+são idempotentes: se o preenchimento ou uma validação falhar, basta rodar
+a migração de novo, e ela continua de onde parou.
+
+Depois que nenhuma instância antiga estiver no ar, a revisão seguinte
+(f8a2d4c6e1b3) remove as colunas em ponto flutuante e os triggers.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b7c1d9a2f4'
+down_revision = 'c2d8e4a61f93'
+branch_labels = None
+depends_on = None
+
+# Linhas por transação no preenchimento
+BACKFILL_BATCH_SIZE = 5000
+
+# Menor UUID: ponto de partida da varredura da chave primária
+FIRST_ID = '00000000-0000-0000-0000-000000000000'
+
+# (tabela, restrição, condição) adicionadas como NOT VALID e validadas à parte
+CHECKS = (
+    ('transactions', 'check_transactions_amount_cents_not_null', 'amount_cents IS NOT NULL'),
+    ('monthly_totals', 'check_monthly_totals_total_cents_not_null', 'total_cents IS NOT NULL'),
+    ('transactions', 'check_amount_cents_positive', 'amount_cents > 0'),
+    ('transactions', 'check_transaction_currency', "currency IN ('BRL', 'USD', 'EUR', 'GBP')"),
+)
+
+# Colunas que passam a NOT NULL, e o CHECK validado que dispensa a varredura
+NOT_NULL = (
+    ('transactions', 'amount_cents', 'check_transactions_amount_cents_not_null'),
+    ('monthly_totals', 'total_cents', 'check_monthly_totals_total_cents_not_null'),
+)
+
+
+def _backfill(table: str, target: str, source: str) -> None:
+    """
+    Preenche target = source em centavos, em lotes com commit próprio
+
+    Cada lote é a próxima faixa de ids depois do último visto, lida pelo
+    índice da chave primária; filtrar só por target IS NULL obrigaria cada
+    lote a passar de novo pelas linhas já preenchidas.
+    """
+    connection = op.get_bind()
+    statement = sa.text(f"""
+        WITH batch AS (
+            SELECT id FROM {table} WHERE id > CAST(:last_id AS uuid) ORDER BY id LIMIT :batch_size
+        ), filled AS (
+            UPDATE {table} SET {target} = (round({source}::numeric, 2) * 100)::bigint
+            FROM batch WHERE {table}.id = batch.id AND {table}.{target} IS NULL
+        )
+        SELECT id FROM batch ORDER BY id DESC LIMIT 1
+    """)
+    last_id = FIRST_ID
+    while last_id is not None:
+        last_id = connection.execute(statement, {"last_id": str(last_id), "batch_size": BACKFILL_BATCH_SIZE}).scalar()
+
+
+def upgrade() -> None:
+    # Só mudanças de catálogo, com lock exclusivo breve; o lock_timeout evita
+    # que escritas fiquem enfileiradas atrás de uma leitura longa
+    op.execute("SET LOCAL lock_timeout = '5s'")
+
+    # Colunas novas: nullable ou com default constante, sem reescrita da tabela
+    op.execute('ALTER TABLE transactions ADD COLUMN IF NOT EXISTS amount_cents BIGINT')
+    op.execute("ALTER TABLE transactions ADD COLUMN IF NOT EXISTS currency VARCHAR(3) NOT NULL DEFAULT 'BRL'")
+    op.execute('ALTER TABLE monthly_totals ADD COLUMN IF NOT EXISTS total_cents BIGINT')
+
+    # A aplicação nova não grava amount/total_amount: deixam de ser obrigatórias
+    op.alter_column('transactions', 'amount', nullable=True)
+    op.alter_column('monthly_totals', 'total_amount', nullable=True)
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION transactions_sync_amount() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' OR NEW.amount IS DISTINCT FROM OLD.amount THEN
+                IF NEW.amount IS NOT NULL AND (TG_OP = 'INSERT' AND NEW.amount_cents IS NULL
+                        OR TG_OP = 'UPDATE' AND NEW.amount_cents IS NOT DISTINCT FROM OLD.amount_cents) THEN
+                    NEW.amount_cents := (round(NEW.amount::numeric, 2) * 100)::bigint;
+                END IF;
+            END IF;
+            IF NEW.amount_cents IS NOT NULL AND (TG_OP = 'INSERT' AND NEW.amount IS NULL
+                    OR TG_OP = 'UPDATE' AND NEW.amount_cents IS DISTINCT FROM OLD.amount_cents
+                        AND NEW.amount IS NOT DISTINCT FROM OLD.amount) THEN
+                NEW.amount := NEW.amount_cents / 100.0;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute('DROP TRIGGER IF EXISTS transactions_sync_amount ON transactions')
+    op.execute("""
+        CREATE TRIGGER transactions_sync_amount BEFORE INSERT OR UPDATE ON transactions
+        FOR EACH ROW EXECUTE FUNCTION transactions_sync_amount();
+    """)
+    op.execute("""
+        CREATE OR REPLACE FUNCTION monthly_totals_sync_total() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' OR NEW.total_amount IS DISTINCT FROM OLD.total_amount THEN
+                IF NEW.total_amount IS NOT NULL AND (TG_OP = 'INSERT' AND NEW.total_cents IS NULL
+                        OR TG_OP = 'UPDATE' AND NEW.total_cents IS NOT DISTINCT FROM OLD.total_cents) THEN
+                    NEW.total_cents := (round(NEW.total_amount::numeric, 2) * 100)::bigint;
+                END IF;
+            END IF;
+            IF NEW.total_cents IS NOT NULL AND (TG_OP = 'INSERT' AND NEW.total_amount IS NULL
+                    OR TG_OP = 'UPDATE' AND NEW.total_cents IS DISTINCT FROM OLD.total_cents
+                        AND NEW.total_amount IS NOT DISTINCT FROM OLD.total_amount) THEN
+                NEW.total_amount := NEW.total_cents / 100.0;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute('DROP TRIGGER IF EXISTS monthly_totals_sync_total ON monthly_totals')
+    op.execute("""
+        CREATE TRIGGER monthly_totals_sync_total BEFORE INSERT OR UPDATE ON monthly_totals
+        FOR EACH ROW EXECUTE FUNCTION monthly_totals_sync_total();
+    """)
+    op.alter_column('monthly_totals', 'total_cents', server_default='0')
+
+    for table, constraint, condition in CHECKS:
+        op.execute(
+            f'ALTER TABLE {table} DROP CONSTRAINT IF EXISTS {constraint}, '
+            f'ADD CONSTRAINT {constraint} CHECK ({condition}) NOT VALID'
+        )
+
+    # Daqui em diante cada comando é a sua própria transação
+    with op.get_context().autocommit_block():
+        _backfill('transactions', 'amount_cents', 'amount')
+        _backfill('monthly_totals', 'total_cents', 'total_amount')
+
+        # VALIDATE pede só SHARE UPDATE EXCLUSIVE: escritas seguem durante a varredura
+        for table, constraint, _ in CHECKS:
+            op.execute(f'ALTER TABLE {table} VALIDATE CONSTRAINT {constraint}')
+
+        # Com o CHECK validado, SET NOT NULL não varre a tabela (PostgreSQL 12+)
+        for table, column, constraint in NOT_NULL:
+            op.execute(f'ALTER TABLE {table} ALTER COLUMN {column} SET NOT NULL')
+            op.execute(f'ALTER TABLE {table} DROP CONSTRAINT {constraint}')
+
+
+def downgrade() -> None:
+    op.drop_constraint('check_transaction_currency', 'transactions', type_='check')
+    op.drop_constraint('check_amount_cents_positive', 'transactions', type_='check')
+    op.execute('DROP TRIGGER monthly_totals_sync_total ON monthly_totals')
+    op.execute('DROP FUNCTION monthly_totals_sync_total()')
+    op.execute('DROP TRIGGER transactions_sync_amount ON transactions')
+    op.execute('DROP FUNCTION transactions_sync_amount()')
+    op.alter_column('monthly_totals', 'total_amount', nullable=False)
+    op.alter_column('transactions', 'amount', nullable=False)
+    op.drop_column('monthly_totals', 'total_cents')
+    op.drop_column('transactions', 'currency')
+    op.drop_column('transactions', 'amount_cents')
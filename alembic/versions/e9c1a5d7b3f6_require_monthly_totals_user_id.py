@@ -0,0 +1,43 @@
+"""require monthly_totals.user_id
+
+Revision ID: e9c1a5d7b3f6
+Revises: d3f5b7a9c1e4
+Create Date: 2026-10-18 23:30:00.000000
+
+Complementa d3f5b7a9c1e4: com transactions.user_id NOT NULL, uma linha do
+rollup sem dono só pode ser resto de antes do backfill de user_id (o resumo,
+que sempre filtra por user_id, nunca a lê). Essas linhas são removidas e a
+coluna passa a ser NOT NULL. Se alguma foi removida, os totais dessas
+transações faltam nas linhas dos donos: a migração avisa para rodar
+`invoke rebuild-monthly-totals`.
+
+monthly_totals é pequena (uma linha por usuário, mês, categoria e tipo), então
+o SET NOT NULL varre a tabela sob lock por pouco tempo.
+"""
+import logging
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e9c1a5d7b3f6'
+down_revision = 'd3f5b7a9c1e4'
+branch_labels = None
+depends_on = None
+
+logger = logging.getLogger(f'alembic.{revision}')
+
+
+def upgrade() -> None:
+    op.execute("SET LOCAL lock_timeout = '5s'")
+    removed = op.get_bind().execute(sa.text('DELETE FROM monthly_totals WHERE user_id IS NULL')).rowcount
+    if removed:
+        logger.warning(
+            '%s linha(s) do rollup sem user_id removida(s); rode `invoke rebuild-monthly-totals`', removed
+        )
+    op.execute('ALTER TABLE monthly_totals ALTER COLUMN user_id SET NOT NULL')
+
+
+def downgrade() -> None:
+    op.execute('ALTER TABLE monthly_totals ALTER COLUMN user_id DROP NOT NULL')
@@ -0,0 +1,73 @@
+"""add user_id to transactions
+
+Revision ID: f4b1d9a6c2e8
+Revises: d7e2b8c4f519
+Create Date: 2026-10-18 14:00:00.000000
+
+Backfill: transações com categoria herdam o dono da categoria; as demais
+são atribuídas ao único usuário cadastrado, quando houver apenas um.
+Transações que continuarem sem dono ficam invisíveis na API.
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f4b1d9a6c2e8'
+down_revision = 'd7e2b8c4f519'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('transactions', sa.Column('user_id', sa.UUID(), nullable=True))
+
+    op.execute("""
+        UPDATE transactions t
+        SET user_id = c.user_id
+        FROM categories c
+        WHERE t.category_id = c.id AND t.user_id IS NULL;
+    """)
+    op.execute("""
+        UPDATE transactions
+        SET user_id = (SELECT user_id FROM user_profiles LIMIT 1)
+        WHERE user_id IS NULL AND (SELECT COUNT(*) FROM user_profiles) = 1;
+    """)
+
+    # Listagem/paginação por usuário e filtros por categoria do usuário
+    op.create_index('idx_transactions_user_created_at', 'transactions', ['user_id', sa.text('created_at DESC')], unique=False)
+    op.create_index('idx_transactions_user_category', 'transactions', ['user_id', 'category_id'], unique=False)
+    # Substituídos pelos índices com user_id à frente (toda query filtra por usuário)
+    op.drop_index('idx_transactions_category_created_at', table_name='transactions')
+    op.drop_index('idx_transactions_type_created_at', table_name='transactions')
+
+    # Reconstrói o rollup mensal agora com o dono de cada transação
+    op.execute("DELETE FROM monthly_totals;")
+    op.execute("""
+        INSERT INTO monthly_totals (id, user_id, month, category_id, type, total_amount, transaction_count)
+        SELECT gen_random_uuid(), user_id,
+               to_char(date_trunc('month', created_at AT TIME ZONE 'America/Sao_Paulo'), 'YYYY-MM'),
+               category_id, type, SUM(amount), COUNT(*)
+        FROM transactions
+        GROUP BY user_id, 3, category_id, type;
+    """)
+
+
+def downgrade() -> None:
+    op.create_index('idx_transactions_type_created_at', 'transactions', ['type', 'created_at'], unique=False)
+    op.create_index('idx_transactions_category_created_at', 'transactions', ['category_id', 'created_at'], unique=False)
+    op.drop_index('idx_transactions_user_category', table_name='transactions')
+    op.drop_index('idx_transactions_user_created_at', table_name='transactions')
+
+    op.execute("DELETE FROM monthly_totals;")
+    op.execute("""
+        INSERT INTO monthly_totals (id, user_id, month, category_id, type, total_amount, transaction_count)
+        SELECT gen_random_uuid(), NULL,
+               to_char(date_trunc('month', created_at AT TIME ZONE 'America/Sao_Paulo'), 'YYYY-MM'),
+               category_id, type, SUM(amount), COUNT(*)
+        FROM transactions
+        GROUP BY 3, category_id, type;
+    """)
+
+    op.drop_column('transactions', 'user_id')
@@ -0,0 +1,93 @@
+"""drop float amount columns (contract)
+
+Revision ID: f8a2d4c6e1b3
+Revises: e5b7c1d9a2f4
+Create Date: 2026-10-18 20:30:00.000000
+
+Segunda etapa da migração para centavos. Aplique só depois que todas as
+instâncias estiverem na versão que grava amount_cents (alembic upgrade
+e5b7c1d9a2f4 antes do deploy, alembic upgrade head depois dele).
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f8a2d4c6e1b3'
+down_revision = 'e5b7c1d9a2f4'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute('DROP TRIGGER transactions_sync_amount ON transactions')
+    op.execute('DROP FUNCTION transactions_sync_amount()')
+    op.execute('DROP TRIGGER monthly_totals_sync_total ON monthly_totals')
+    op.execute('DROP FUNCTION monthly_totals_sync_total()')
+
+    # Remover a coluna só altera o catálogo; leva junto idx_transactions_amount
+    # e check_amount_positive, que eram sobre amount
+    op.drop_column('transactions', 'amount')
+    op.drop_column('monthly_totals', 'total_amount')
+
+    # Filtros de faixa de valor passam a usar amount_cents
+    with op.get_context().autocommit_block():
+        op.execute('CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_transactions_amount ON transactions (amount_cents)')
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute('DROP INDEX CONCURRENTLY IF EXISTS idx_transactions_amount')
+
+    op.add_column('transactions', sa.Column('amount', sa.Float(), nullable=True))
+    op.add_column('monthly_totals', sa.Column('total_amount', sa.Float(), nullable=True))
+    op.execute('UPDATE transactions SET amount = amount_cents / 100.0')
+    op.execute('UPDATE monthly_totals SET total_amount = total_cents / 100.0')
+    op.create_check_constraint('check_amount_positive', 'transactions', 'amount > 0')
+    op.create_index('idx_transactions_amount', 'transactions', ['amount'], unique=False)
+
+    # Volta ao estado da etapa anterior, com as colunas sincronizadas por trigger
+    op.execute("""
+        CREATE FUNCTION transactions_sync_amount() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' OR NEW.amount IS DISTINCT FROM OLD.amount THEN
+                IF NEW.amount IS NOT NULL AND (TG_OP = 'INSERT' AND NEW.amount_cents IS NULL
+                        OR TG_OP = 'UPDATE' AND NEW.amount_cents IS NOT DISTINCT FROM OLD.amount_cents) THEN
+                    NEW.amount_cents := (round(NEW.amount::numeric, 2) * 100)::bigint;
+                END IF;
+            END IF;
+            IF NEW.amount_cents IS NOT NULL AND (TG_OP = 'INSERT' AND NEW.amount IS NULL
+                    OR TG_OP = 'UPDATE' AND NEW.amount_cents IS DISTINCT FROM OLD.amount_cents
+                        AND NEW.amount IS NOT DISTINCT FROM OLD.amount) THEN
+                NEW.amount := NEW.amount_cents / 100.0;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER transactions_sync_amount BEFORE INSERT OR UPDATE ON transactions
+        FOR EACH ROW EXECUTE FUNCTION transactions_sync_amount();
+    """)
+    op.execute("""
+        CREATE FUNCTION monthly_totals_sync_total() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP = 'INSERT' OR NEW.total_amount IS DISTINCT FROM OLD.total_amount THEN
+                IF NEW.total_amount IS NOT NULL AND (TG_OP = 'INSERT' AND NEW.total_cents IS NULL
+                        OR TG_OP = 'UPDATE' AND NEW.total_cents IS NOT DISTINCT FROM OLD.total_cents) THEN
+                    NEW.total_cents := (round(NEW.total_amount::numeric, 2) * 100)::bigint;
+                END IF;
+            END IF;
+            IF NEW.total_cents IS NOT NULL AND (TG_OP = 'INSERT' AND NEW.total_amount IS NULL
+                    OR TG_OP = 'UPDATE' AND NEW.total_cents IS DISTINCT FROM OLD.total_cents
+                        AND NEW.total_amount IS NOT DISTINCT FROM OLD.total_amount) THEN
+                NEW.total_amount := NEW.total_cents / 100.0;
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql;
+    """)
+    op.execute("""
+        CREATE TRIGGER monthly_totals_sync_total BEFORE INSERT OR UPDATE ON monthly_totals
+        FOR EACH ROW EXECUTE FUNCTION monthly_totals_sync_total();
+    """)
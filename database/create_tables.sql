@@ -5,16 +5,15 @@
 CREATE TABLE IF NOT EXISTS public.transactions (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     type VARCHAR(10) NOT NULL CHECK (type IN ('income', 'expense')),
-    amount DECIMAL(12, 2) NOT NULL CHECK (amount > 0),
+    amount_cents BIGINT NOT NULL CHECK (amount_cents > 0),
+    currency VARCHAR(3) NOT NULL DEFAULT 'BRL' CHECK (currency IN ('BRL', 'USD', 'EUR', 'GBP')),
     description TEXT NOT NULL,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
 -- Criar índices para melhor performance
-CREATE INDEX IF NOT EXISTS idx_transactions_type ON public.transactions(type);
 CREATE INDEX IF NOT EXISTS idx_transactions_created_at ON public.transactions(created_at DESC);
-CREATE INDEX IF NOT EXISTS idx_transactions_amount ON public.transactions(amount);
 
 -- Criar função para atualizar updated_at automaticamente
 CREATE OR REPLACE FUNCTION update_updated_at_column()
@@ -33,19 +32,20 @@ CREATE TRIGGER update_transactions_updated_at
     EXECUTE FUNCTION update_updated_at_column();
 
 -- Inserir dados de exemplo (opcional - remover em produção)
-INSERT INTO public.transactions (type, amount, description) VALUES
-    ('income', 2500.00, 'Salário Janeiro'),
-    ('expense', 350.00, 'Supermercado'),
-    ('expense', 80.00, 'Combustível'),
-    ('income', 200.00, 'Freelance'),
-    ('expense', 1200.00, 'Aluguel')
+INSERT INTO public.transactions (type, amount_cents, description) VALUES
+    ('income', 250000, 'Salário Janeiro'),
+    ('expense', 35000, 'Supermercado'),
+    ('expense', 8000, 'Combustível'),
+    ('income', 20000, 'Freelance'),
+    ('expense', 120000, 'Aluguel')
 ON CONFLICT (id) DO NOTHING;
 
 -- Comentários para documentação
 COMMENT ON TABLE public.transactions IS 'Tabela para armazenar todas as transações financeiras (receitas e despesas)';
 COMMENT ON COLUMN public.transactions.id IS 'Identificador único da transação';
 COMMENT ON COLUMN public.transactions.type IS 'Tipo da transação: income (receita) ou expense (despesa)';
-COMMENT ON COLUMN public.transactions.amount IS 'Valor da transação em reais (sempre positivo)';
+COMMENT ON COLUMN public.transactions.amount_cents IS 'Valor da transação em centavos (sempre positivo)';
+COMMENT ON COLUMN public.transactions.currency IS 'Moeda da transação (ISO 4217)';
 COMMENT ON COLUMN public.transactions.description IS 'Descrição detalhada da transação';
 COMMENT ON COLUMN public.transactions.created_at IS 'Data e hora de criação da transação';
 COMMENT ON COLUMN public.transactions.updated_at IS 'Data e hora da última atualização da transação';
\ No newline at end of file
@@ -1,5 +1,5 @@
 import React from 'react';
-import { render, screen } from '@testing-library/react';
+import { render, screen, fireEvent } from '@testing-library/react';
 import { MemoryRouter } from 'react-router-dom';
 import Dashboard from './components/Dashboard';
 import { vi } from 'vitest';
@@ -76,6 +76,26 @@ vi.mock('./contexts/CategoryContext', () => ({
   }),
 }));
 
+const emptySummary = {
+  current_balance: 0,
+  monthly_income: 0,
+  monthly_expenses: 0,
+  previous_month_balance: 0,
+  percentage_change: 0,
+  timezone: 'America/Sao_Paulo',
+  months: [],
+};
+
+const transaction = (id: string, description: string) => ({
+  id,
+  type: 'expense',
+  amount: 50,
+  description,
+  created_at: '2023-01-01T00:00:00Z',
+  category_id: '1',
+  category: null,
+});
+
 describe('Dashboard', () => {
   beforeEach(() => {
     // Create a proper mock for axios instance
@@ -96,7 +116,11 @@ describe('Dashboard', () => {
     
     // Mock axios.create to return our mockApi
     mockedAxios.create.mockReturnValue(mockApi as any);
-    mockApi.get.mockResolvedValue({ data: [] });
+    mockApi.get.mockImplementation((url: string) =>
+      Promise.resolve({
+        data: url === '/transactions/summary' ? emptySummary : { items: [], next_cursor: null },
+      })
+    );
   });
 
   it('renders without crashing', async () => {
@@ -111,7 +135,7 @@ describe('Dashboard', () => {
 
   it('displays empty state when no transactions', async () => {
     const mockApi = mockedAxios.create();
-    mockApi.get.mockResolvedValueOnce({ data: [] });
+    mockApi.get.mockResolvedValueOnce({ data: { items: [], next_cursor: null } });
     
     render(
       <MemoryRouter>
@@ -142,7 +166,7 @@ describe('Dashboard', () => {
     ];
 
     const mockApi = mockedAxios.create();
-    mockApi.get.mockResolvedValueOnce({ data: mockTransactions });
+    mockApi.get.mockResolvedValueOnce({ data: { items: mockTransactions, next_cursor: null } });
     
     render(
       <MemoryRouter>
@@ -153,4 +177,51 @@ describe('Dashboard', () => {
     // Wait for transactions to load - using a more specific selector
     expect(await screen.findByText(/Monthly Salary/i)).toBeInTheDocument();
   });
-});
\ No newline at end of file
+
+  it('takes the totals from the summary endpoint instead of the loaded page', async () => {
+    const mockApi = mockedAxios.create();
+    mockApi.get.mockImplementation((url: string) =>
+      Promise.resolve({
+        data: url === '/transactions/summary'
+          ? { ...emptySummary, current_balance: 4321, monthly_income: 5000, monthly_expenses: 679 }
+          : { items: [transaction('1', 'Mercado')], next_cursor: null },
+      })
+    );
+
+    render(
+      <MemoryRouter>
+        <Dashboard />
+      </MemoryRouter>
+    );
+
+    expect(await screen.findByText(/4\.321,00/)).toBeInTheDocument();
+    expect(screen.getByText(/5\.000,00/)).toBeInTheDocument();
+    expect(screen.getByText(/679,00/)).toBeInTheDocument();
+  });
+
+  it('loads the next page from next_cursor', async () => {
+    const mockApi = mockedAxios.create();
+    mockApi.get.mockImplementation((url: string, config?: { params?: { cursor?: string } }) => {
+      if (url === '/transactions/summary') {
+        return Promise.resolve({ data: emptySummary });
+      }
+      return Promise.resolve({
+        data: config?.params?.cursor === 'page-2'
+          ? { items: [transaction('2', 'Farmácia')], next_cursor: null }
+          : { items: [transaction('1', 'Mercado')], next_cursor: 'page-2' },
+      });
+    });
+
+    render(
+      <MemoryRouter>
+        <Dashboard />
+      </MemoryRouter>
+    );
+
+    fireEvent.click(await screen.findByRole('button', { name: /Carregar mais/i }));
+
+    expect(await screen.findByText(/Farmácia/)).toBeInTheDocument();
+    expect(screen.getByText(/Mercado/)).toBeInTheDocument();
+    expect(screen.queryByRole('button', { name: /Carregar mais/i })).not.toBeInTheDocument();
+  });
+});
@@ -39,6 +39,20 @@ interface Transaction {
   category: Category;
 }
 
+interface TransactionPage {
+  items: Transaction[];
+  next_cursor: string | null;
+}
+
+// Totais agregados no servidor por GET /transactions/summary
+interface Summary {
+  current_balance: number;
+  monthly_income: number;
+  monthly_expenses: number;
+}
+
+const EMPTY_SUMMARY: Summary = { current_balance: 0, monthly_income: 0, monthly_expenses: 0 };
+
 interface User {
   id: string;
   email: string;
@@ -52,6 +66,9 @@ const Dashboard: React.FC = () => {
   const { expenseCategories, incomeCategories } = useCategories();
   
   const [transactions, setTransactions] = useState<Transaction[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [summary, setSummary] = useState<Summary>(EMPTY_SUMMARY);
   const [form, setForm] = useState<Omit<Transaction, 'id' | 'created_at' | 'category'>>({ 
     type: 'income', 
     amount: 0, 
@@ -72,25 +89,46 @@ const Dashboard: React.FC = () => {
     return config;
   });
 
-  useEffect(() => {
-    const loadData = async () => {
-      try {
-        const [transactionsResponse] = await Promise.all([
-          api.get('/transactions/'),
-        ]);
-        
-        const transactionsData = Array.isArray(transactionsResponse.data) ? transactionsResponse.data : [];
-        setTransactions(transactionsData as Transaction[]);
+  // Primeira página da lista e totais do resumo; a lista é paginada por
+  // cursor, então os totais nunca são somados a partir dela
+  const loadData = async () => {
+    try {
+      const [transactionsResponse, summaryResponse] = await Promise.all([
+        api.get<TransactionPage>('/transactions/'),
+        api.get<Summary>('/transactions/summary', { params: { months: 0 } }),
+      ]);
+      
+      const transactionsData = Array.isArray(transactionsResponse.data?.items) ? transactionsResponse.data.items : [];
+      setTransactions(transactionsData);
+      setNextCursor(transactionsResponse.data?.next_cursor ?? null);
+      setSummary({ ...EMPTY_SUMMARY, ...summaryResponse.data });
 
-      } catch (error) {
-        console.error('Erro ao carregar dados:', error);
-        setTransactions([]);
-      }
-    };
+    } catch (error) {
+      console.error('Erro ao carregar dados:', error);
+      setTransactions([]);
+      setNextCursor(null);
+    }
+  };
 
+  useEffect(() => {
     loadData();
   }, []);
 
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const response = await api.get<TransactionPage>('/transactions/', { params: { cursor: nextCursor } });
+      const data = Array.isArray(response.data?.items) ? response.data.items : [];
+      setTransactions(prev => [...prev, ...data]);
+      setNextCursor(response.data?.next_cursor ?? null);
+    } catch (error) {
+      console.error('Erro ao carregar mais transações:', error);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleChange = (e: React.ChangeEvent<HTMLInputElement | HTMLTextAreaElement> | SelectChangeEvent) => {
     const { name, value } = e.target;
     setForm({ ...form, [name]: value });
@@ -106,14 +144,12 @@ const Dashboard: React.FC = () => {
     if (!form.description || !form.amount || !form.category_id) return;
     
     try {
-      const res = await api.post('/transactions/', { 
+      await api.post('/transactions/', { 
         ...form, 
         amount: Number(form.amount) 
       });
-      // After creating a transaction, we should reload the transactions to get the category object
-      const response = await api.get('/transactions/');
-      const data = Array.isArray(response.data) ? response.data : [];
-      setTransactions(data as Transaction[]);
+      // Recarrega a primeira página (com o objeto category) e os totais
+      await loadData();
       setForm({ ...form, amount: 0, description: '', category_id: '' });
     } catch (error) {
       console.error('Erro ao criar transação:', error);
@@ -137,15 +173,7 @@ const Dashboard: React.FC = () => {
     });
   };
 
-  const totalIncome = transactions
-    .filter(t => t.type === 'income')
-    .reduce((sum, t) => sum + t.amount, 0);
-
-  const totalExpense = transactions
-    .filter(t => t.type === 'expense')
-    .reduce((sum, t) => sum + t.amount, 0);
-
-  const balance = totalIncome - totalExpense;
+  const balance = summary.current_balance;
 
   return (
     <>
@@ -153,13 +181,13 @@ const Dashboard: React.FC = () => {
         {/* Resumo Financeiro */}
         <Box sx={{ display: 'grid', gridTemplateColumns: { xs: '1fr', md: 'repeat(3, 1fr)' }, gap: 2, mb: 4 }}>
           <Paper elevation={2} sx={{ p: 3, textAlign: 'center', bgcolor: 'success.light', color: 'white' }}>
-            <Typography variant="h6">Receitas</Typography>
-            <Typography variant="h4">{formatCurrency(totalIncome)}</Typography>
+            <Typography variant="h6">Receitas do mês</Typography>
+            <Typography variant="h4">{formatCurrency(summary.monthly_income)}</Typography>
           </Paper>
           
           <Paper elevation={2} sx={{ p: 3, textAlign: 'center', bgcolor: 'error.light', color: 'white' }}>
-            <Typography variant="h6">Despesas</Typography>
-            <Typography variant="h4">{formatCurrency(totalExpense)}</Typography>
+            <Typography variant="h6">Despesas do mês</Typography>
+            <Typography variant="h4">{formatCurrency(summary.monthly_expenses)}</Typography>
           </Paper>
           
           <Paper elevation={2} sx={{ p: 3, textAlign: 'center', bgcolor: balance >= 0 ? 'primary.light' : 'error.main', color: 'white' }}>
@@ -230,7 +258,7 @@ const Dashboard: React.FC = () => {
             </Typography>
           ) : (
             <List>
-              {transactions.slice().reverse().map((transaction, i) => (
+              {transactions.map((transaction, i) => (
                 <React.Fragment key={transaction.id}>
                   <ListItem>
                     <ListItemText
@@ -292,6 +320,14 @@ const Dashboard: React.FC = () => {
               ))}
             </List>
           )}
+
+          {nextCursor && (
+            <Box sx={{ display: 'flex', justifyContent: 'center', mt: 2 }}>
+              <Button onClick={loadMore} disabled={loadingMore} variant="outlined">
+                {loadingMore ? 'Carregando...' : 'Carregar mais'}
+              </Button>
+            </Box>
+          )}
         </Paper>
       </Container>
     </>
@@ -16,6 +16,7 @@ import {
 import { List as ListComponent } from 'react-window';
 import { Edit as EditIcon, Delete as DeleteIcon } from '@mui/icons-material';
 import { useTransactions } from '../../contexts/TransactionContext';
+import type { TransactionQueryParams } from '../../contexts/TransactionContext';
 import { useAdvancedFilters } from '../../hooks/useAdvancedFilters';
 import { useToast } from '../../hooks/useToast';
 import AdvancedFilters from '../filters/AdvancedFilters';
@@ -74,7 +75,7 @@ const FilteredTransactionsList: React.FC<FilteredTransactionsListProps> = ({
   onDeleteTransaction
 }) => {
   const navigate = useNavigate();
-  const { transactions, loading, error, fetchTransactions } = useTransactions();
+  const { transactions, loading, error, hasMore, loadingMore, fetchTransactions, loadMore } = useTransactions();
   const { filters, updateFilters } = useAdvancedFilters();
   const toast = useToast();
   
@@ -110,49 +111,38 @@ const FilteredTransactionsList: React.FC<FilteredTransactionsListProps> = ({
     setTransactionToDelete(null);
   };
 
-  const filteredTransactions = useMemo(() => {
-    if (!transactions) return [];
-
-    return transactions.filter(transaction => {
-      // Filtro por período
-      if (filters.dateRange?.startDate || filters.dateRange?.endDate) {
-        const transactionDate = new Date(transaction.created_at);
-        if (filters.dateRange.startDate && transactionDate < filters.dateRange.startDate) {
-          return false;
-        }
-        if (filters.dateRange.endDate && transactionDate > filters.dateRange.endDate) {
-          return false;
-        }
-      }
-
-      // Filtro por categorias
-      if (filters.categories && filters.categories.length > 0) {
-        if (!transaction.category_id || !filters.categories.includes(transaction.category_id)) {
-          return false;
-        }
-      }
-
-      // Filtro por valor
-      if (filters.amountRange?.minAmount || filters.amountRange?.maxAmount) {
-        const amount = Number(transaction.amount);
-        if (filters.amountRange.minAmount && amount < filters.amountRange.minAmount) {
-          return false;
-        }
-        if (filters.amountRange.maxAmount && amount > filters.amountRange.maxAmount) {
-          return false;
-        }
-      }
-
-      // Filtro por tipo
-      if (filters.status?.type && filters.status.type !== 'all') {
-        if (transaction.type !== filters.status.type) {
-          return false;
-        }
-      }
-
-      return true;
-    });
-  }, [transactions, filters]);
+  // Converte os filtros da UI nos query parameters aceitos pela API
+  const queryParams = useMemo<TransactionQueryParams>(() => {
+    const params: TransactionQueryParams = {};
+    if (filters.dateRange?.startDate) {
+      params.start_date = new Date(filters.dateRange.startDate).toISOString();
+    }
+    if (filters.dateRange?.endDate) {
+      params.end_date = new Date(filters.dateRange.endDate).toISOString();
+    }
+    if (filters.categories && filters.categories.length > 0) {
+      params.category_id = filters.categories;
+    }
+    if (filters.amountRange?.minAmount) {
+      params.min_amount = filters.amountRange.minAmount;
+    }
+    if (filters.amountRange?.maxAmount) {
+      params.max_amount = filters.amountRange.maxAmount;
+    }
+    if (filters.status?.type && filters.status.type !== 'all') {
+      params.type = filters.status.type;
+    }
+    return params;
+  }, [filters]);
+
+  const hasActiveFilters = Object.keys(queryParams).length > 0;
+
+  // Os filtros são aplicados no servidor; recarrega quando mudam
+  useEffect(() => {
+    fetchTransactions(queryParams);
+  }, [queryParams]);
+
+  const filteredTransactions = transactions || [];
 
   if (loading) {
     return (
@@ -184,12 +174,13 @@ const FilteredTransactionsList: React.FC<FilteredTransactionsListProps> = ({
 
       <Box sx={{ display: 'flex', justifyContent: 'space-between', alignItems: 'center', mb: 2 }}>
         <Typography variant="h6">
-          Transações ({filteredTransactions.length})
+          {/* Só as páginas já carregadas são conhecidas; "+" indica que há mais */}
+          Transações ({filteredTransactions.length}{hasMore ? '+' : ''})
         </Typography>
         
-        {filteredTransactions.length !== transactions?.length && (
+        {hasActiveFilters && (
           <Chip
-            label={`Filtrado de ${transactions?.length || 0} transações`}
+            label="Filtros aplicados"
             color="primary"
             variant="outlined"
             size="small"
@@ -224,6 +215,14 @@ const FilteredTransactionsList: React.FC<FilteredTransactionsListProps> = ({
         </Box>
       )}
 
+      {hasMore && (
+        <Box sx={{ display: 'flex', justifyContent: 'center', mt: 2 }}>
+          <Button onClick={loadMore} disabled={loadingMore} variant="outlined">
+            {loadingMore ? 'Carregando...' : 'Carregar mais'}
+          </Button>
+        </Box>
+      )}
+
       <Dialog
         open={deleteDialogOpen}
         onClose={handleDeleteCancel}
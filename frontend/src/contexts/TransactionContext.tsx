@@ -1,5 +1,5 @@
 // src/contexts/TransactionContext.tsx
-import React, { createContext, useContext, useState, useEffect } from 'react';
+import React, { createContext, useContext, useState, useEffect, useRef } from 'react';
 import api from '../lib/api';
 import { APP_CONFIG } from '../config';
 
@@ -15,11 +15,30 @@ interface Transaction {
   notes?: string;
 }
 
+// Filtros aceitos por GET /transactions/ (aplicados no servidor)
+export interface TransactionQueryParams {
+  start_date?: string;
+  end_date?: string;
+  category_id?: string[];
+  min_amount?: number;
+  max_amount?: number;
+  type?: 'income' | 'expense';
+}
+
+interface TransactionPage {
+  items: Transaction[];
+  next_cursor: string | null;
+}
+
 interface TransactionContextData {
   transactions: Transaction[];
   loading: boolean;
   error: string | null;
-  fetchTransactions: () => Promise<void>;
+  // Há mais páginas no servidor além das já carregadas
+  hasMore: boolean;
+  loadingMore: boolean;
+  fetchTransactions: (params?: TransactionQueryParams) => Promise<void>;
+  loadMore: () => Promise<void>;
 }
 
 const TransactionContext = createContext<TransactionContextData>({} as TransactionContextData);
@@ -28,19 +47,61 @@ export const TransactionProvider: React.FC<{ children: React.ReactNode }> = ({ c
   const [transactions, setTransactions] = useState<Transaction[]>([]);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState<string | null>(null);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+  // Últimos filtros usados, para que recarregamentos sem argumentos os preservem
+  const lastParams = useRef<TransactionQueryParams | undefined>(undefined);
+  // Incrementado a cada recarga: páginas pedidas com filtros antigos são descartadas
+  const generation = useRef(0);
 
-  const fetchTransactions = async () => {
+  const fetchPage = (cursor?: string) =>
+    api.get<TransactionPage>(
+      APP_CONFIG.api.endpoints.transactions,
+      // category_id é enviado repetido (?category_id=a&category_id=b)
+      { params: { ...lastParams.current, cursor }, paramsSerializer: { indexes: null } }
+    );
+
+  const fetchTransactions = async (params?: TransactionQueryParams) => {
+    if (params !== undefined) {
+      lastParams.current = params;
+    }
+    const current = ++generation.current;
     setLoading(true);
     setError(null);
     try {
-      const response = await api.get<Transaction[]>(APP_CONFIG.api.endpoints.transactions);
-      setTransactions(response.data);
+      const response = await fetchPage();
+      if (current !== generation.current) return;
+      setTransactions(response.data.items);
+      setNextCursor(response.data.next_cursor);
     } catch (err: any) {
+      if (current !== generation.current) return;
       console.error('Error fetching transactions:', err);
       setError(err.response?.data?.detail || 'Failed to load transactions.');
       setTransactions([]);
+      setNextCursor(null);
+    } finally {
+      if (current === generation.current) {
+        setLoading(false);
+      }
+    }
+  };
+
+  // Acrescenta a página seguinte, a partir do next_cursor da última resposta
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    const current = generation.current;
+    setLoadingMore(true);
+    try {
+      const response = await fetchPage(nextCursor);
+      if (current !== generation.current) return;
+      setTransactions(prev => [...prev, ...response.data.items]);
+      setNextCursor(response.data.next_cursor);
+    } catch (err: any) {
+      if (current !== generation.current) return;
+      console.error('Error fetching more transactions:', err);
+      setError(err.response?.data?.detail || 'Failed to load transactions.');
     } finally {
-      setLoading(false);
+      setLoadingMore(false);
     }
   };
 
@@ -49,7 +110,15 @@ export const TransactionProvider: React.FC<{ children: React.ReactNode }> = ({ c
   }, []);
 
   return (
-    <TransactionContext.Provider value={{ transactions, loading, error, fetchTransactions }}>
+    <TransactionContext.Provider value={{
+      transactions,
+      loading,
+      error,
+      hasMore: nextCursor !== null,
+      loadingMore,
+      fetchTransactions,
+      loadMore,
+    }}>
       {children}
     </TransactionContext.Provider>
   );
@@ -1,7 +1,9 @@
 // src/hooks/useTransactions.ts
 import { useState, useEffect } from 'react';
-import axios from 'axios';
-import { API_BASE_URL, APP_CONFIG } from '../config';
+import api from '../lib/api';
+import { APP_CONFIG } from '../config';
+
+const RECENT_TRANSACTIONS_LIMIT = 10;
 
 interface Transaction {
   id: string;
@@ -14,6 +16,22 @@ interface Transaction {
   };
 }
 
+interface TransactionPage {
+  items: Transaction[];
+  next_cursor: string | null;
+  limit: number;
+}
+
+interface TransactionSummary {
+  current_balance: number;
+  monthly_income: number;
+  monthly_expenses: number;
+  previous_month_balance: number;
+  percentage_change: number;
+  timezone: string;
+  months: { month: string; income: number; expenses: number; balance: number }[];
+}
+
 interface BalanceData {
   currentBalance: number;
   monthlyIncome: number;
@@ -32,60 +50,23 @@ export const useTransactions = () => {
     setLoading(true);
     setError(null);
     try {
-      const response = await axios.get<Transaction[]>(`${API_BASE_URL}${APP_CONFIG.api.endpoints.transactions}`);
-      const fetchedTransactions = response.data;
-
-      // Calcular dados do saldo atual
-      const currentBalance = fetchedTransactions.reduce((sum, t) => 
-        t.type === 'income' ? sum + t.amount : sum - t.amount, 0);
-
-      // Filtrar transações do mês atual
-      const currentDate = new Date();
-      const currentMonth = currentDate.getMonth();
-      const currentYear = currentDate.getFullYear();
-      
-      const monthlyTransactions = fetchedTransactions.filter(t => {
-        const transactionDate = new Date(t.created_at);
-        return transactionDate.getMonth() === currentMonth && 
-               transactionDate.getFullYear() === currentYear;
-      });
-
-      const monthlyIncome = monthlyTransactions
-        .filter(t => t.type === 'income')
-        .reduce((sum, t) => sum + t.amount, 0);
-        
-      const monthlyExpenses = monthlyTransactions
-        .filter(t => t.type === 'expense')
-        .reduce((sum, t) => sum + t.amount, 0);
-
-      // Calcular transações do mês anterior
-      const previousMonth = currentMonth === 0 ? 11 : currentMonth - 1;
-      const previousYear = currentMonth === 0 ? currentYear - 1 : currentYear;
-      
-      const previousMonthTransactions = fetchedTransactions.filter(t => {
-        const transactionDate = new Date(t.created_at);
-        return transactionDate.getMonth() === previousMonth && 
-               transactionDate.getFullYear() === previousYear;
-      });
-
-      const previousMonthBalance = previousMonthTransactions.reduce((sum, t) => 
-        t.type === 'income' ? sum + t.amount : sum - t.amount, 0);
-
-      // Calcular variação percentual
-      let percentageChange = 0;
-      if (previousMonthBalance !== 0) {
-        percentageChange = ((currentBalance - previousMonthBalance) / Math.abs(previousMonthBalance)) * 100;
-      } else if (currentBalance > 0) {
-        percentageChange = 100; // Se não havia saldo no mês anterior mas há agora
-      }
+      // Saldo e totais mensais vêm agregados do servidor; apenas as
+      // transações mais recentes são baixadas para a listagem
+      const [summaryResponse, transactionsResponse] = await Promise.all([
+        api.get<TransactionSummary>(APP_CONFIG.api.endpoints.transactionsSummary),
+        api.get<TransactionPage>(APP_CONFIG.api.endpoints.transactions, {
+          params: { limit: RECENT_TRANSACTIONS_LIMIT },
+        }),
+      ]);
+      const summary = summaryResponse.data;
 
-      setRecentTransactions(fetchedTransactions);
+      setRecentTransactions(transactionsResponse.data.items);
       setBalanceData({
-        currentBalance,
-        monthlyIncome,
-        monthlyExpenses,
-        previousMonthBalance,
-        percentageChange,
+        currentBalance: summary.current_balance,
+        monthlyIncome: summary.monthly_income,
+        monthlyExpenses: summary.monthly_expenses,
+        previousMonthBalance: summary.previous_month_balance,
+        percentageChange: summary.percentage_change,
       });
     } catch (err) {
       console.error('Error fetching transactions:', err);
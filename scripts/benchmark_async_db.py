@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Benchmark de throughput com requisições concorrentes: rota async def com
+Session síncrona (como as rotas eram) vs AsyncSession (como são agora)
+
+Cada requisição executa uma query lenta (pg_sleep no PostgreSQL, função
+sleep registrada no SQLite). Com a Session síncrona a query bloqueia o
+event loop e as requisições de um worker são atendidas uma por vez.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+import httpx
+from dotenv import load_dotenv
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+# Carrega variáveis de ambiente
+load_dotenv()
+
+# Permite importar o pacote src a partir da raiz do projeto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+def sqlite_engines(pool_size):
+    """Engines síncrono e assíncrono sobre um arquivo SQLite temporário"""
+    path = os.path.join(tempfile.mkdtemp(), "benchmark.db")
+    sync_engine = create_engine(f"sqlite:///{path}", connect_args={"check_same_thread": False}, pool_size=pool_size)
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=AsyncAdaptedQueuePool, pool_size=pool_size)
+
+    def register_sleep(dbapi_connection, _):
+        dbapi_connection.create_function("sleep", 1, lambda seconds: time.sleep(seconds) or 0)
+
+    event.listen(sync_engine, "connect", register_sleep)
+    event.listen(async_engine.sync_engine, "connect", register_sleep)
+    return sync_engine, async_engine, text("SELECT sleep(:delay)")
+
+def database_engines():
+    """Engines configurados da aplicação (DATABASE_URL)"""
+    from src.database_sqlalchemy import engine, async_engine
+    return engine, async_engine, text("SELECT pg_sleep(:delay)")
+
+def build_app(sync_engine, async_engine, slow_query, delay):
+    app = FastAPI()
+    SyncSession = sessionmaker(bind=sync_engine)
+    AsyncSession = async_sessionmaker(async_engine)
+
+    @app.get("/sync")
+    async def sync_route():
+        with SyncSession() as db:
+            db.execute(slow_query, {"delay": delay})
+        return {}
+
+    @app.get("/async")
+    async def async_route():
+        async with AsyncSession() as db:
+            await db.execute(slow_query, {"delay": delay})
+        return {}
+
+    return app
+
+async def measure(client, path, total, concurrency):
+    """Dispara total requisições com no máximo concurrency simultâneas"""
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.get(path)
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50": statistics.median(latencies) * 1000,
+        "p95": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+    }
+
+async def run(args):
+    if args.sqlite:
+        sync_engine, async_engine, slow_query = sqlite_engines(args.concurrency)
+    else:
+        sync_engine, async_engine, slow_query = database_engines()
+
+    app = build_app(sync_engine, async_engine, slow_query, args.delay)
+    results = {}
+    async with httpx.AsyncClient(app=app, base_url="http://benchmark") as client:
+        for label, path in (("Session síncrona (antes)", "/sync"), ("AsyncSession (depois)", "/async")):
+            # Aquecimento do pool de conexões
+            await measure(client, path, args.concurrency, args.concurrency)
+            results[label] = await measure(client, path, args.requests, args.concurrency)
+
+    await async_engine.dispose()
+    sync_engine.dispose()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Compara throughput de rotas com Session síncrona e AsyncSession")
+    parser.add_argument("--requests", type=int, default=200, help="Total de requisições por cenário")
+    parser.add_argument("--concurrency", type=int, default=10, help="Requisições simultâneas")
+    parser.add_argument("--delay", type=float, default=0.02, help="Duração da query lenta em segundos")
+    parser.add_argument("--sqlite", action="store_true", help="Usa um SQLite temporário em vez de DATABASE_URL")
+    args = parser.parse_args()
+
+    print(f"⏱️  {args.requests} requisições, {args.concurrency} simultâneas, query de {args.delay * 1000:.0f} ms")
+    results = asyncio.run(run(args))
+    for label, result in results.items():
+        print(f"   {label:<26} {result['rps']:8.1f} req/s   p50 {result['p50']:7.1f} ms   p95 {result['p95']:7.1f} ms")
+
+    before, after = results.values()
+    print(f"✅ Throughput {after['rps'] / before['rps']:.1f}x com AsyncSession")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
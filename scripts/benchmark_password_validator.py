@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark do PasswordValidator
+
+Mede o tempo por chamada de validate() sobre senhas fortes, fracas e
+longas, com e sem lista de senhas vazadas (arquivo sintético com
+--breached-entries digests aleatórios ou o de BREACHED_PASSWORDS_FILE).
+Termina com código 1 se algum p99 passar de --budget-ms.
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Permite importar o pacote src a partir da raiz do projeto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.auth.utils.breached_passwords import DIGEST_SIZE, BreachedPasswordList
+from src.auth.utils.password_validator import PasswordValidator
+
+SAMPLES = {
+    "forte": "Tr0ub4dor&3-Horse!",
+    "fraca": "abc123",
+    "pessoal": "Maria1990!",
+    "longa (128)": "aB3$" * 32,
+}
+
+def synthetic_list(entries):
+    """Arquivo temporário com digests aleatórios ordenados"""
+    digests = sorted(os.urandom(DIGEST_SIZE) for _ in range(entries))
+    file = tempfile.NamedTemporaryFile(delete=False, suffix=".sha1")
+    with file:
+        file.write(b"".join(digests))
+    return file.name
+
+def measure(validator, password, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        validator.validate(password)
+        timings.append(time.perf_counter() - start)
+    timings.sort()
+    return statistics.mean(timings) * 1e6, timings[int(len(timings) * 0.99) - 1] * 1e6
+
+def run(label, validator, iterations, budget_us):
+    print(f"\n{label}")
+    ok = True
+    for name, password in SAMPLES.items():
+        mean_us, p99_us = measure(validator, password, iterations)
+        ok = ok and p99_us <= budget_us
+        print(f"   {name:<12} média {mean_us:8.1f} µs   p99 {p99_us:8.1f} µs")
+    return ok
+
+def main():
+    parser = argparse.ArgumentParser(description="Micro-benchmark do PasswordValidator")
+    parser.add_argument("--iterations", type=int, default=20000)
+    parser.add_argument("--breached-entries", type=int, default=1_000_000,
+                        help="Tamanho da lista sintética, se BREACHED_PASSWORDS_FILE não estiver definida")
+    parser.add_argument("--budget-ms", type=float, default=1.0)
+    args = parser.parse_args()
+    budget_us = args.budget_ms * 1000
+
+    ok = run("Sem lista de senhas vazadas", PasswordValidator(), args.iterations, budget_us)
+
+    path = os.getenv("BREACHED_PASSWORDS_FILE")
+    synthetic = None
+    if not path:
+        print(f"\nGerando lista sintética com {args.breached_entries} digests...")
+        path = synthetic = synthetic_list(args.breached_entries)
+    breached = BreachedPasswordList(path)
+    try:
+        ok = run(f"Com lista de senhas vazadas ({len(breached)} entradas)",
+                 PasswordValidator(breached), args.iterations, budget_us) and ok
+    finally:
+        breached.close()
+        if synthetic:
+            os.unlink(synthetic)
+
+    if not ok:
+        print(f"\n❌ p99 acima de {args.budget_ms} ms")
+        sys.exit(1)
+    print(f"\n✅ p99 abaixo de {args.budget_ms} ms em todos os casos")
+
+if __name__ == "__main__":
+    main()
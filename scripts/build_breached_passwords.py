@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Gera o arquivo binário de senhas vazadas usado por BREACHED_PASSWORDS_FILE
+
+Aceita, uma entrada por linha:
+- o formato do Have I Been Pwned (SHA1 em hexadecimal, opcionalmente
+  seguido de :contagem);
+- senhas em texto puro (o hash é calculado aqui).
+
+A ordenação é externa: blocos de --chunk-size digests são ordenados em
+memória, gravados em arquivos temporários e intercalados no final, de
+modo que listas com centenas de milhões de entradas não precisam caber
+na memória. Digests duplicados são descartados.
+"""
+import argparse
+import heapq
+import os
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+# Permite importar o pacote src a partir da raiz do projeto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.auth.utils.breached_passwords import DIGEST_SIZE, password_digest
+
+SHA1_LINE = re.compile(r"^([0-9A-Fa-f]{40})(?::\d+)?$")
+
+def parse_line(line: str):
+    entry = line.rstrip("\r\n")
+    if not entry:
+        return None
+    match = SHA1_LINE.match(entry)
+    if match:
+        return bytes.fromhex(match.group(1))
+    return password_digest(entry)
+
+def write_run(digests, directory):
+    digests.sort()
+    run = tempfile.NamedTemporaryFile(dir=directory, delete=False, suffix=".run")
+    with run:
+        run.write(b"".join(digests))
+    return run.name
+
+def read_run(path):
+    with open(path, "rb") as file:
+        while True:
+            digest = file.read(DIGEST_SIZE)
+            if not digest:
+                return
+            yield digest
+
+def build(sources, output, chunk_size, plain=False):
+    """Lê as fontes e grava os digests ordenados e únicos em output"""
+    output_dir = os.path.dirname(os.path.abspath(output))
+    os.makedirs(output_dir, exist_ok=True)
+    runs = []
+    digests = []
+    read = 0
+    try:
+        for source in sources:
+            with open(source, encoding="utf-8", errors="replace") as file:
+                for line in file:
+                    if plain:
+                        entry = line.rstrip("\r\n")
+                        digest = password_digest(entry) if entry else None
+                    else:
+                        digest = parse_line(line)
+                    if digest is None:
+                        continue
+                    digests.append(digest)
+                    read += 1
+                    if len(digests) >= chunk_size:
+                        runs.append(write_run(digests, output_dir))
+                        digests = []
+        if digests:
+            runs.append(write_run(digests, output_dir))
+
+        written = 0
+        previous = None
+        partial = output + ".tmp"
+        with open(partial, "wb") as out:
+            for digest in heapq.merge(*(read_run(run) for run in runs)):
+                if digest != previous:
+                    out.write(digest)
+                    written += 1
+                    previous = digest
+        os.replace(partial, output)
+    finally:
+        for run in runs:
+            os.unlink(run)
+    return read, written
+
+def main():
+    parser = argparse.ArgumentParser(description="Gera o arquivo ordenado de senhas vazadas (SHA-1)")
+    parser.add_argument("sources", nargs="+", help="Arquivos de entrada (HIBP SHA1:contagem ou texto puro)")
+    parser.add_argument("--output", "-o", required=True, help="Arquivo binário de saída")
+    parser.add_argument("--chunk-size", type=int, default=5_000_000, help="Digests ordenados em memória por bloco")
+    parser.add_argument("--plain", action="store_true", help="Trata todas as linhas como senhas em texto puro")
+    args = parser.parse_args()
+
+    read, written = build(args.sources, args.output, args.chunk_size, args.plain)
+    size_mb = written * DIGEST_SIZE / 1024 / 1024
+    print(f"✅ {written} digests únicos de {read} entradas gravados em {args.output} ({size_mb:.1f} MB)")
+
+if __name__ == "__main__":
+    main()
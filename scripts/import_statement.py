@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Script para importar um extrato bancário (CSV ou OFX) em blocos,
+com commit e relatório de progresso por bloco
+"""
+import argparse
+import sys
+from uuid import UUID
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Carrega variáveis de ambiente
+load_dotenv()
+
+# Permite importar o pacote src a partir da raiz do projeto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.config import settings
+from src.database_sqlalchemy import SessionLocal
+from src.statement_import import SUPPORTED_FORMATS, StatementParseError, detect_format, import_statement, iter_statement_rows
+
+def main():
+    parser = argparse.ArgumentParser(description="Importa um extrato bancário CSV/OFX como transações")
+    parser.add_argument("path", help="Caminho do arquivo de extrato")
+    parser.add_argument("--user-id", required=True, type=UUID, help="ID do usuário dono das transações")
+    parser.add_argument("--format", choices=SUPPORTED_FORMATS, help="Formato do extrato (padrão: pela extensão)")
+    parser.add_argument("--encoding", default="utf-8", help="Codificação do arquivo (padrão: utf-8)")
+    parser.add_argument("--chunk-size", type=int, default=settings.IMPORT_CHUNK_SIZE, help="Linhas por commit")
+    args = parser.parse_args()
+
+    statement_format = args.format or detect_format(args.path)
+    db = SessionLocal()
+    try:
+        with open(args.path, encoding=args.encoding, errors="replace", newline="") as stream:
+            for progress in import_statement(db, args.user_id, iter_statement_rows(stream, statement_format), args.chunk_size):
+                if progress.done:
+                    print(f"✅ Importação concluída: {progress.rows_read} linha(s), "
+                          f"{progress.created} criada(s), {progress.rejected} rejeitada(s)")
+                    break
+                print(f"📦 Bloco {progress.chunk}: {progress.rows_read} linha(s) lidas, "
+                      f"{progress.created} criada(s), {progress.rejected} rejeitada(s)")
+                for error in progress.errors:
+                    print(f"   ⚠️  linha {error.index}: {'; '.join(error.errors)}")
+        return 1 if progress.rejected else 0
+    except StatementParseError as e:
+        print(f"❌ {e}")
+        return 1
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
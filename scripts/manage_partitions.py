@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Script de manutenção das partições mensais de transactions
+
+Sem argumentos, cria as partições do mês corrente e dos próximos meses
+(rode periodicamente, por exemplo uma vez por dia). Com --detach AAAA-MM,
+desliga a partição do mês para arquivamento.
+"""
+import argparse
+import sys
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Carrega variáveis de ambiente
+load_dotenv()
+
+# Permite importar o pacote src a partir da raiz do projeto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.database_sqlalchemy import engine
+from src.partitions import (
+    DEFAULT_MONTHS_AHEAD,
+    attached_partitions,
+    detach_partition,
+    ensure_partitions,
+    parse_month,
+)
+
+def main():
+    parser = argparse.ArgumentParser(description="Mantém as partições mensais de transactions")
+    parser.add_argument("--months-ahead", type=int, default=DEFAULT_MONTHS_AHEAD,
+                        help="Meses futuros com partição já criada")
+    parser.add_argument("--detach", metavar="AAAA-MM", help="Desliga a partição do mês para arquivamento")
+    parser.add_argument("--list", action="store_true", help="Apenas lista as partições ligadas")
+    args = parser.parse_args()
+
+    with engine.begin() as connection:
+        if args.list:
+            for name in attached_partitions(connection):
+                print(f"   {name}")
+            return 0
+
+        if args.detach:
+            try:
+                name = detach_partition(connection, parse_month(args.detach))
+            except ValueError as e:
+                print(f"❌ {e}")
+                return 1
+            print(f"📦 Partição {name} desligada; arquive-a e remova com DROP TABLE {name}")
+            return 0
+
+        try:
+            created = ensure_partitions(connection, months_ahead=args.months_ahead)
+        except ValueError as e:
+            print(f"❌ {e}")
+            return 1
+
+    if created:
+        print(f"✅ {len(created)} partição(ões) criada(s): {', '.join(created)}")
+    else:
+        print("✅ Partições já existentes")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Perfil de inicialização do backend (cold start)
+
+Cada rodada usa um interpretador novo e mede:
+- import: tempo de `import src.main` (módulos, engines, rotas)
+- primeira resposta: do início do processo do uvicorn até o primeiro
+  200 em /health (import + lifespan + primeira requisição)
+
+Também lista os pacotes que mais pesam no import (python -X importtime,
+tempo próprio somado por pacote de primeiro nível). Usa o .env do
+projeto, como o backend.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+IMPORT_SNIPPET = (
+    "import time; start = time.perf_counter(); import src.main; "
+    "print(time.perf_counter() - start)"
+)
+
+def measure_import():
+    result = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+def import_profile(top):
+    """[(pacote, ms)] dos pacotes com maior tempo próprio de import"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import src.main"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    totals = defaultdict(int)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _cumulative, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        parts = name.split(".")
+        # Módulos do projeto aparecem individualmente (src.auth, src.database...)
+        package = ".".join(parts[:2]) if parts[0] == "src" else parts[0]
+        totals[package] += int(self_us)
+    ranking = sorted(totals.items(), key=lambda item: item[1], reverse=True)
+    return [(package, us / 1000) for package, us in ranking[:top]]
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def measure_first_response(timeout=60.0):
+    port = free_port()
+    url = f"http://127.0.0.1:{port}/health"
+    start = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "src.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            if server.poll() is not None:
+                raise RuntimeError(f"uvicorn terminou na inicialização:\n{server.stderr.read().decode()}")
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except (urllib.error.URLError, ConnectionError):
+                time.sleep(0.01)
+        raise RuntimeError(f"Sem resposta de {url} em {timeout:.0f}s")
+    finally:
+        server.terminate()
+        server.wait()
+
+def report(label, samples):
+    print(f"  {label:<18} mediana {statistics.median(samples) * 1000:8.1f} ms"
+          f"   mín {min(samples) * 1000:8.1f} ms   máx {max(samples) * 1000:8.1f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Rodadas de cada medição")
+    parser.add_argument("--top", type=int, default=15, help="Pacotes listados no perfil de import")
+    parser.add_argument("--no-server", action="store_true", help="Não mede a primeira resposta via uvicorn")
+    args = parser.parse_args()
+
+    os.chdir(ROOT)
+    print(f"Cold start ({args.runs} rodadas)")
+    report("import src.main", [measure_import() for _ in range(args.runs)])
+    if not args.no_server:
+        report("primeira resposta", [measure_first_response() for _ in range(args.runs)])
+
+    print("\nPacotes mais pesados no import (tempo próprio)")
+    for package, ms in import_profile(args.top):
+        print(f"  {package:<32} {ms:8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+#!/usr/bin/env python3
+"""
+Script para verificar ou reconstruir o rollup mensal (monthly_totals)
+a partir da tabela transactions
+"""
+import argparse
+import sys
+from pathlib import Path
+from dotenv import load_dotenv
+
+# Carrega variáveis de ambiente
+load_dotenv()
+
+# Permite importar o pacote src a partir da raiz do projeto
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.database_sqlalchemy import SessionLocal
+from src.money import from_cents
+from src.rollup import verify_monthly_totals, rebuild_monthly_totals
+
+def main():
+    parser = argparse.ArgumentParser(description="Verifica ou reconstrói o rollup monthly_totals")
+    parser.add_argument("--verify", action="store_true", help="Apenas verifica divergências, sem alterar o rollup")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        drift = verify_monthly_totals(db)
+        if drift:
+            print(f"⚠️  {len(drift)} chave(s) divergente(s) no rollup:")
+            for key, expected, current in sorted(drift, key=lambda d: (d[0].month, d[0].type)):
+                print(f"   {key.month} {key.type} categoria={key.category_id}: "
+                      f"esperado={from_cents(expected[0]):.2f} ({expected[1]}) "
+                      f"registrado={from_cents(current[0]):.2f} ({current[1]})")
+        else:
+            print("✅ Rollup consistente com as transações")
+
+        if args.verify:
+            return 1 if drift else 0
+
+        rows = rebuild_monthly_totals(db)
+        print(f"✅ Rollup reconstruído com {rows} linha(s)")
+        return 0
+    finally:
+        db.close()
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Stub local da API do Resend para desenvolvimento e testes
+
+Aceita POST /emails e POST /emails/batch como o Resend, guarda as
+mensagens em memória e as lista em GET /emails. Com RESEND_API_URL
+apontando para este servidor, o dispatcher da outbox envia para cá.
+
+    uv run python scripts/resend_stub.py --port 8025
+"""
+import argparse
+import sys
+import uuid
+from typing import Any, Dict, Iterable
+from fastapi import FastAPI, HTTPException, Request
+
+def create_app(fail_with: int = 0, reject: Iterable[str] = ()) -> FastAPI:
+    """
+    Args:
+        fail_with: Se diferente de zero, responde todo envio com este status
+            (para exercitar novas tentativas)
+        reject: Destinatários recusados com 422, como um endereço inválido
+    """
+    app = FastAPI(title="Resend stub")
+    app.state.emails = []
+    app.state.requests = 0
+    app.state.fail_with = fail_with
+    app.state.reject = set(reject)
+
+    def validate(email: Dict[str, Any]) -> None:
+        if not email.get("to") or not email.get("subject"):
+            raise HTTPException(status_code=422, detail="to e subject são obrigatórios")
+        rejected = app.state.reject.intersection(email["to"])
+        if rejected:
+            raise HTTPException(status_code=422, detail=f"Destinatário inválido: {', '.join(sorted(rejected))}")
+
+    def accept(email: Dict[str, Any]) -> Dict[str, str]:
+        email_id = str(uuid.uuid4())
+        app.state.emails.append({"id": email_id, **email})
+        print(f"📧 {email.get('subject')} -> {', '.join(email['to'])}")
+        return {"id": email_id}
+
+    @app.post("/emails")
+    async def send(request: Request):
+        app.state.requests += 1
+        if app.state.fail_with:
+            raise HTTPException(status_code=app.state.fail_with, detail="Falha simulada")
+        email = await request.json()
+        validate(email)
+        return accept(email)
+
+    @app.post("/emails/batch")
+    async def send_batch(request: Request):
+        app.state.requests += 1
+        if app.state.fail_with:
+            raise HTTPException(status_code=app.state.fail_with, detail="Falha simulada")
+        # Como o Resend, valida o lote inteiro antes de enviar: uma mensagem
+        # inválida recusa todas
+        emails = await request.json()
+        for email in emails:
+            validate(email)
+        return {"data": [accept(email) for email in emails]}
+
+    @app.get("/emails")
+    async def list_emails():
+        return app.state.emails
+
+    return app
+
+def main():
+    parser = argparse.ArgumentParser(description="Stub local da API do Resend")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8025)
+    parser.add_argument("--fail-with", type=int, default=0, help="Responde todo envio com este status HTTP")
+    args = parser.parse_args()
+
+    import uvicorn
+    print(f"📮 Stub do Resend em http://{args.host}:{args.port} (defina RESEND_API_URL com esta URL)")
+    uvicorn.run(create_app(args.fail_with), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
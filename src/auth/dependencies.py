@@ -5,24 +5,86 @@ Este módulo implementa as dependências necessárias para autenticação
 e autorização nas rotas da API.
 """
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from typing import Optional
 from .service import AuthService
 from .utils.jwt_handler import JWTHandler
+from .utils.token_cache import VerifiedTokenCache
+from .utils.rate_limiter import AuthRateLimiter
+from .revocation import revocation_store
 from .models import User
+import logging
+import math
+
+logger = logging.getLogger(__name__)
 
 # Configurar HTTPBearer para autenticação
 security = HTTPBearer(auto_error=False)
 
-# Função para obter instância do serviço de autenticação (lazy loading)
+# Instância única do serviço de autenticação no processo, criada no
+# lifespan da aplicação (ou sob demanda, fora dele)
+_auth_service: Optional[AuthService] = None
+
+def init_auth_service() -> AuthService:
+    """Cria o AuthService compartilhado, se ainda não existir"""
+    global _auth_service
+    if _auth_service is None:
+        _auth_service = AuthService()
+    return _auth_service
+
+def close_auth_service() -> None:
+    """Descarta o AuthService compartilhado e fecha suas conexões"""
+    global _auth_service
+    if _auth_service is not None:
+        _auth_service.close()
+        _auth_service = None
+
 def get_auth_service_instance() -> AuthService:
-    """Retorna uma instância do AuthService"""
-    return AuthService()
+    """Retorna a instância compartilhada do AuthService (lazy loading)"""
+    return init_auth_service()
+
+def profile_cache_stats() -> Optional[dict]:
+    """Estatísticas do cache de perfis da instância compartilhada, se criada"""
+    return _auth_service.profile_cache.stats() if _auth_service is not None else None
+
+_jwt_handler: Optional[JWTHandler] = None
 
 def get_jwt_handler() -> JWTHandler:
-    """Retorna uma instância do JWTHandler"""
-    return JWTHandler()
+    """Retorna a instância compartilhada do JWTHandler"""
+    global _jwt_handler
+    if _jwt_handler is None:
+        _jwt_handler = JWTHandler()
+    return _jwt_handler
+
+# Tokens já verificados, para não repetir HMAC e construção do User
+token_cache = VerifiedTokenCache()
+
+def _authenticate(token: str) -> User:
+    """
+    Verifica o token e monta o User, consultando antes o cache
+    
+    A revogação da sessão (sid) é conferida em memória a cada chamada,
+    inclusive quando o User vem do cache.
+    
+    Raises:
+        Exception: Se o token for inválido, expirado ou de sessão revogada
+    """
+    user = token_cache.get(token)
+    if user is None:
+        user_data = get_jwt_handler().verify_token(token)
+        if user_data.get("type") == "refresh":
+            raise ValueError("Refresh token não é aceito como token de acesso")
+        expires_at = user_data.get("exp")
+        # Renomear 'user_id' para 'id' para corresponder ao modelo Pydantic User
+        user_data = {**user_data, "id": user_data["user_id"], "session_id": user_data.get("sid")}
+        user = User(**user_data)
+        token_cache.set(token, user, expires_at)
+    
+    if user.session_id is not None and revocation_store.is_revoked(user.session_id):
+        token_cache.discard(token)
+        raise ValueError("Sessão revogada")
+    return user
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(security)
@@ -47,17 +109,9 @@ async def get_current_user(
         )
     
     try:
-        token = credentials.credentials
-        print(f"Token recebido: {token}")  # Log do token recebido
-        jwt_handler = get_jwt_handler()
-        print(f"JWT Handler: {jwt_handler}")  # Log do JWT Handler
-        user_data = jwt_handler.verify_token(token)
-        print(f"Dados do usuário decodificados: {user_data}")  # Log dos dados do usuário
-        # Renomear 'user_id' para 'id' para corresponder ao modelo Pydantic User
-        user_data['id'] = user_data.pop('user_id')
-        return User(**user_data)
+        return _authenticate(credentials.credentials)
     except Exception as e:
-        print(f"Erro ao verificar token: {e}")
+        logger.debug("Token rejeitado: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Token inválido",
@@ -80,10 +134,7 @@ async def get_current_user_optional(
         return None
     
     try:
-        token = credentials.credentials
-        jwt_handler = get_jwt_handler()
-        user_data = jwt_handler.verify_token(token)
-        return User(**user_data)
+        return _authenticate(credentials.credentials)
     except Exception:
         return None
 
@@ -147,6 +198,48 @@ async def get_auth_service() -> AuthService:
     """
     return get_auth_service_instance()
 
+# Limites de login, registro e recuperação de senha (por processo)
+auth_rate_limiter = AuthRateLimiter()
+
+def rate_limit(scope: str):
+    """
+    Dependência que aplica o limitador de autenticação ao endpoint
+    
+    Limita por IP do cliente e pelo campo email do corpo JSON, se houver.
+    A verificação acontece antes do bcrypt e das chamadas ao Supabase.
+    
+    Args:
+        scope: Nome do endpoint (cada endpoint tem buckets próprios)
+        
+    Returns:
+        Função de dependência
+    """
+    async def check_rate_limit(request: Request) -> None:
+        email = None
+        try:
+            body = await request.json()
+            if isinstance(body, dict) and isinstance(body.get("email"), str):
+                email = body["email"]
+        except Exception:
+            pass
+        
+        client_ip = request.client.host if request.client else None
+        limited = auth_rate_limiter.check(scope, client_ip, email)
+        if limited:
+            status_code, retry_after = limited
+            detail = (
+                "Servidor ocupado, tente novamente em instantes"
+                if status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+                else "Muitas tentativas, tente novamente mais tarde"
+            )
+            raise HTTPException(
+                status_code=status_code,
+                detail=detail,
+                headers={"Retry-After": str(math.ceil(retry_after))},
+            )
+    
+    return check_rate_limit
+
 # Função para verificar se o usuário tem permissão específica
 def require_permission(permission: str):
     """
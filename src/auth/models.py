@@ -179,3 +179,4 @@ class ResetPasswordRequest(BaseModel):
 class User(BaseModel):
     id: UUID
     email: EmailStr
+    session_id: Optional[UUID] = None  # sid do token: sessão revogável no logout
@@ -0,0 +1,134 @@
+"""
+Revogação de sessões verificada em memória
+
+O RevocationStore do processo é reconstruído a partir de refresh_tokens
+no início da aplicação e, depois, sincronizado periodicamente com as
+revogações feitas pelos outros workers (AUTH_REVOCATION_SYNC_INTERVAL).
+As revogações feitas neste processo entram no conjunto na hora.
+
+Entram no conjunto o jti de todo refresh token trocado ou revogado e o
+family_id (sid dos access tokens) das sessões encerradas por logout,
+reuso de token ou exclusão da conta.
+"""
+
+import asyncio
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, List, Optional, Tuple
+from sqlalchemy import select
+from src.database import RefreshToken
+from .utils.revocation_store import RevocationStore
+
+logger = logging.getLogger(__name__)
+
+revocation_store = RevocationStore()
+
+# Folga na sincronização incremental para revogações commitadas com atraso
+# ou com relógios ligeiramente diferentes entre hosts
+SYNC_OVERLAP = timedelta(seconds=60)
+
+
+def _timestamp(value: datetime) -> float:
+    # SQLite devolve datas sem fuso; são gravadas em UTC
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def revoked_identifiers(row) -> List[Tuple[str, float]]:
+    """Identificadores que uma linha revogada de refresh_tokens torna inválidos"""
+    expires_at = _timestamp(row.expires_at)
+    identifiers = [(str(row.jti), expires_at)]
+    if row.revoked_reason != "rotated":
+        identifiers.append((str(row.family_id), expires_at))
+    return identifiers
+
+
+def remember_revoked(identifiers: Iterable[Tuple[str, float]]) -> None:
+    """Adiciona ao conjunto do processo identificadores recém-revogados (após o commit)"""
+    for identifier, expires_at in identifiers:
+        revocation_store.add(identifier, expires_at)
+
+
+async def load_revocations(session_factory=None, since: Optional[datetime] = None) -> int:
+    """
+    Carrega as revogações ainda relevantes do banco
+
+    Args:
+        session_factory: Fábrica de AsyncSession (padrão: AsyncSessionLocal)
+        since: Apenas revogações a partir deste instante; None reconstrói
+            o conjunto inteiro
+
+    Returns:
+        Número de linhas lidas
+    """
+    if session_factory is None:
+        from src.database_sqlalchemy import AsyncSessionLocal
+        session_factory = AsyncSessionLocal
+    statement = select(
+        RefreshToken.jti, RefreshToken.family_id, RefreshToken.revoked_reason, RefreshToken.expires_at
+    ).where(
+        RefreshToken.revoked_at.is_not(None),
+        RefreshToken.expires_at > datetime.now(timezone.utc),
+    )
+    if since is not None:
+        statement = statement.where(RefreshToken.revoked_at >= since)
+
+    async with session_factory() as db:
+        rows = (await db.execute(statement)).all()
+
+    if since is None:
+        revocation_store.replace(entry for row in rows for entry in revoked_identifiers(row))
+    else:
+        remember_revoked(entry for row in rows for entry in revoked_identifiers(row))
+    return len(rows)
+
+
+_sync_task: Optional[asyncio.Task] = None
+
+
+async def _sync(session_factory, last_sync: Optional[datetime]) -> Optional[datetime]:
+    """Reconstrói (sem last_sync) ou atualiza o conjunto; retorna o novo last_sync"""
+    started_at = datetime.now(timezone.utc)
+    try:
+        if last_sync is None:
+            count = await load_revocations(session_factory)
+            logger.info("Conjunto de tokens revogados reconstruído (%s registros)", count)
+        else:
+            await load_revocations(session_factory, since=last_sync - SYNC_OVERLAP)
+            revocation_store.prune()
+    except Exception as e:
+        logger.error("Erro ao sincronizar tokens revogados: %s", e)
+        return last_sync
+    return started_at
+
+
+async def _sync_loop(session_factory, interval: float, last_sync: Optional[datetime]) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        last_sync = await _sync(session_factory, last_sync)
+
+
+async def start_revocation_sync(session_factory=None, interval: Optional[float] = None) -> None:
+    """
+    Reconstrói o conjunto de revogados e inicia a sincronização periódica
+
+    Se o banco estiver indisponível, a reconstrução é tentada de novo a
+    cada intervalo.
+    """
+    global _sync_task
+    interval = interval or float(os.getenv("AUTH_REVOCATION_SYNC_INTERVAL", "30"))
+    last_sync = await _sync(session_factory, None)
+    _sync_task = asyncio.create_task(_sync_loop(session_factory, interval, last_sync))
+
+
+async def stop_revocation_sync() -> None:
+    global _sync_task
+    if _sync_task is not None:
+        _sync_task.cancel()
+        try:
+            await _sync_task
+        except asyncio.CancelledError:
+            pass
+        _sync_task = None
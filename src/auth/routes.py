@@ -22,13 +22,14 @@ from .service import AuthService
 from .dependencies import (
     get_current_user,
     get_current_user_id,
-    get_auth_service
+    get_auth_service,
+    rate_limit
 )
 
 # Configurar router
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
-@router.post("/register", status_code=status.HTTP_201_CREATED)
+@router.post("/register", status_code=status.HTTP_201_CREATED, dependencies=[Depends(rate_limit("register"))])
 async def register_user(user_data: UserRegister, auth_service: AuthService = Depends(get_auth_service)):
     """
     Registra um novo usuário
@@ -44,14 +45,14 @@ async def register_user(user_data: UserRegister, auth_service: AuthService = Dep
             detail=f"Erro interno do servidor: {str(e)}"
         )
 
-@router.post("/login")
+@router.post("/login", dependencies=[Depends(rate_limit("login"))])
 async def login_user(user_data: UserLogin, auth_service: AuthService = Depends(get_auth_service)):
     """
     Autentica um usuário
     """
     return await auth_service.login_user(user_data)
 
-@router.post("/forgot-password")
+@router.post("/forgot-password", dependencies=[Depends(rate_limit("forgot-password"))])
 async def forgot_password(request_data: ForgotPasswordRequest, auth_service: AuthService = Depends(get_auth_service)):
     """
     Solicita recuperação de senha
@@ -70,7 +71,7 @@ async def logout_user(current_user: User = Depends(get_current_user), auth_servi
     """
     Realiza logout do usuário
     """
-    return await auth_service.logout_user(current_user.id)
+    return await auth_service.logout_user(current_user.id, current_user.session_id)
 
 @router.post("/refresh")
 async def refresh_token(request_data: RefreshTokenRequest, auth_service: AuthService = Depends(get_auth_service)):
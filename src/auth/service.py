@@ -5,34 +5,102 @@ Este módulo implementa a lógica de negócio para autenticação usando Supabas
 incluindo registro, login, logout e gerenciamento de perfis de usuário.
 """
 
+import hashlib
+import logging
 import os
 import uuid
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Dict, Any, Optional
 from fastapi import HTTPException, status
-from supabase import create_client, Client
 from .models import UserRegister, UserLogin, UserProfileUpdate, ForgotPasswordRequest, ResetPasswordRequest, RefreshTokenRequest
 from .utils.password_validator import PasswordValidator
+from .utils.password_hasher import PasswordHasher
+from .utils.profile_cache import ProfileCache
 from .utils.jwt_handler import JWTHandler
-from src.database import UserProfile
+from .revocation import remember_revoked, revoked_identifiers
+from src.config import settings
+from src.database import RefreshToken, Transaction, UserProfile
+from src.email_outbox import enqueue_email, notify_dispatcher
+from src.email_templates import render_recovery_email, render_welcome_email
+from src.rollup import rebuild_user_monthly_totals
 from src.database_sqlalchemy import SessionLocal
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+logger = logging.getLogger(__name__)
+
+
+def hash_refresh_token(token: str) -> str:
+    """SHA-256 do refresh token, como guardado em refresh_tokens.token_hash"""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+def create_client(supabase_url: str, supabase_key: str, options) -> "Client":
+    """
+    supabase.create_client, importado só quando o primeiro cliente é criado
+
+    O pacote supabase leva centenas de milissegundos para importar e só é
+    usado no cadastro e na exclusão de contas; importá-lo aqui tira esse
+    custo da inicialização do processo.
+    """
+    from supabase import create_client as supabase_create_client
+    return supabase_create_client(supabase_url, supabase_key, options)
+
+
+def create_supabase_client() -> "Client":
+    """
+    Cria o cliente do Supabase compartilhado pelo serviço de autenticação
+    
+    Como o cliente atende requisições de todos os usuários, não guarda
+    sessão nem agenda refresh automático de tokens (o que faria um login
+    afetar as chamadas seguintes de outros usuários).
+    """
+    supabase_url = os.getenv("SUPABASE_URL")
+    supabase_key = os.getenv("SUPABASE_ANON_KEY")
+    
+    if not supabase_url or not supabase_key:
+        raise ValueError("Configuração do Supabase não encontrada")
+    
+    from supabase.lib.client_options import ClientOptions
+    return create_client(
+        supabase_url,
+        supabase_key,
+        ClientOptions(auto_refresh_token=False, persist_session=False),
+    )
 
 class AuthService:
-    def __init__(self):
+    def __init__(self, supabase: Optional["Client"] = None):
         """
         Inicializa o serviço de autenticação
-        """
-        # Configurar Supabase
-        supabase_url = os.getenv("SUPABASE_URL")
-        supabase_key = os.getenv("SUPABASE_ANON_KEY")
         
-        if not supabase_url or not supabase_key:
-            raise ValueError("Configuração do Supabase não encontrada")
+        A aplicação mantém uma única instância por processo (ver
+        init_auth_service em dependencies), reaproveitando o cliente HTTP
+        do Supabase e suas conexões keep-alive entre requisições.
         
-        self.supabase: Client = create_client(supabase_url, supabase_key)
+        Args:
+            supabase: Cliente do Supabase já configurado (opcional; sem ele,
+                o cliente é criado no primeiro uso)
+        """
+        self._supabase: Optional["Client"] = supabase
         
         self.password_validator = PasswordValidator()
+        self.password_hasher = PasswordHasher()
         self.jwt_handler = JWTHandler()
+        self.profile_cache = ProfileCache()
+    
+    @property
+    def supabase(self) -> "Client":
+        """Cliente do Supabase, criado no primeiro uso"""
+        if self._supabase is None:
+            self._supabase = create_supabase_client()
+        return self._supabase
+    
+    def close(self) -> None:
+        """Fecha o pool de conexões HTTP do cliente do Supabase e o pool do bcrypt"""
+        if self._supabase is not None:
+            self._supabase.auth.close()
+        self.password_hasher.shutdown()
     
     async def register_user(self, user_data: UserRegister) -> Dict[str, Any]:
         """
@@ -56,6 +124,10 @@ class AuthService:
                     detail=f"Senha não atende aos requisitos de segurança: {'; '.join(password_validation.errors)}"
                 )
             
+            # Hash da senha para nosso banco (antes do Supabase: com o pool
+            # do bcrypt lotado, o registro é recusado sem criar o usuário)
+            hashed_password = await self.password_hasher.hash(user_data.password)
+            
             # Registrar usuário no Supabase Auth
             auth_response = self.supabase.auth.sign_up({
                 "email": user_data.email,
@@ -76,10 +148,6 @@ class AuthService:
             
             user_id = auth_response.user.id
             
-            # Hash da senha para nosso banco
-            from .utils.password_validator import hash_password
-            hashed_password = hash_password(user_data.password)
-            
             # Criar perfil do usuário
             try:
                 db = SessionLocal()
@@ -96,16 +164,15 @@ class AuthService:
                 )
                 
                 db.add(profile)
+                # Email informativo (sem confirmação) na mesma transação do
+                # perfil; o envio fica com o dispatcher da outbox
+                if settings.RESEND_API_KEY:
+                    subject, html = render_welcome_email(user_data.full_name, settings.FRONTEND_URL)
+                    enqueue_email(db, user_data.email, subject, html)
                 db.commit()
                 db.refresh(profile)
                 db.close()
-                
-                # Enviar email informativo (sem confirmação)
-                try:
-                    await self._send_welcome_email(user_data.email, user_data.full_name)
-                except Exception as email_error:
-                    print(f"Erro ao enviar email de boas-vindas: {email_error}")
-                    # Não falhar o registro se o email falhar
+                notify_dispatcher()
                     
             except Exception as profile_error:
                 # Se falhar ao criar perfil, deletar o usuário criado
@@ -132,99 +199,6 @@ class AuthService:
                 detail=f"Erro interno do servidor: {str(e)}"
             )
     
-    async def _send_welcome_email(self, email: str, full_name: str) -> None:
-        """
-        Envia email de boas-vindas após registro
-        
-        Args:
-            email: Email do usuário
-            full_name: Nome completo do usuário
-        """
-        try:
-            import httpx
-            
-            resend_api_key = os.getenv("RESEND_API_KEY")
-            if not resend_api_key:
-                print("RESEND_API_KEY não configurada")
-                return
-            
-            # URL da aplicação
-            app_url = os.getenv("FRONTEND_URL", "http://localhost:5173")
-            
-            # Template do email
-            html_content = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="utf-8">
-                <title>Bem-vindo ao MyFinance</title>
-                <style>
-                    body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                    .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                    .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-                    .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-                    .button {{ display: inline-block; background: #667eea; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; margin: 20px 0; }}
-                    .footer {{ text-align: center; margin-top: 30px; color: #666; font-size: 14px; }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="header">
-                        <h1>🎉 Bem-vindo ao MyFinance!</h1>
-                    </div>
-                    <div class="content">
-                        <h2>Olá, {full_name}!</h2>
-                        <p>Seu cadastro foi realizado com sucesso no MyFinance.</p>
-                        <p>Você já pode acessar sua conta e começar a gerenciar suas finanças!</p>
-                        
-                        <div style="text-align: center;">
-                            <a href="{app_url}" class="button">Acessar MyFinance</a>
-                        </div>
-                        
-                        <p><strong>Dicas para começar:</strong></p>
-                        <ul>
-                            <li>Configure suas categorias de gastos</li>
-                            <li>Adicione suas primeiras transações</li>
-                            <li>Visualize seus relatórios financeiros</li>
-                        </ul>
-                        
-                        <p>Se você tiver alguma dúvida, não hesite em entrar em contato conosco.</p>
-                        
-                        <p>Atenciosamente,<br>Equipe MyFinance</p>
-                    </div>
-                    <div class="footer">
-                        <p>Este é um email automático, não responda a esta mensagem.</p>
-                        <p>© 2024 MyFinance. Todos os direitos reservados.</p>
-                    </div>
-                </div>
-            </body>
-            </html>
-            """
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.resend.com/emails",
-                    headers={
-                        "Authorization": f"Bearer {resend_api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "from": "MyFinance <onboarding@resend.dev>",
-                        "to": [email],
-                        "subject": "Bem-vindo ao MyFinance! 🎉",
-                        "html": html_content
-                    },
-                    timeout=30.0
-                )
-                
-                if response.status_code == 200:
-                    print(f"Email de boas-vindas enviado para {email}")
-                else:
-                    print(f"Erro ao enviar email: {response.status_code} - {response.text}")
-                    
-        except Exception as e:
-            print(f"Erro ao enviar email de boas-vindas: {str(e)}")
-    
     async def login_user(self, user_data: UserLogin) -> Dict[str, Any]:
         """
         Autentica um usuário
@@ -251,26 +225,22 @@ class AuthService:
                 )
             
             # Verificar senha
-            from .utils.password_validator import verify_password
-            
-            if not verify_password(user_data.password, profile.password_hash):
+            if not await self.password_hasher.verify(user_data.password, profile.password_hash):
                 raise HTTPException(
                     status_code=status.HTTP_401_UNAUTHORIZED,
                     detail="Credenciais inválidas"
                 )
             
-            # Gerar token JWT
-            token_data = {
-                "user_id": str(profile.user_id),
-                "email": profile.email,
-                "full_name": profile.full_name
-            }
-            
-            token = self.jwt_handler.create_token(token_data)
+            # Gerar tokens JWT de uma nova sessão
+            db = SessionLocal()
+            try:
+                tokens, _ = self._issue_tokens(db, profile.user_id, profile.email, profile.full_name)
+                db.commit()
+            finally:
+                db.close()
             
             return {
-                "access_token": token,
-                "token_type": "bearer",
+                **tokens,
                 "user": {
                     "id": str(profile.user_id),
                     "email": profile.email,
@@ -286,7 +256,7 @@ class AuthService:
         except HTTPException:
             raise
         except Exception as e:
-            print(f"Erro no login: {str(e)}")
+            logger.exception("Erro no login: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Erro interno do servidor"
@@ -327,125 +297,31 @@ class AuthService:
             # Salvar token no banco (você pode criar uma tabela para isso)
             # Por enquanto, vamos usar uma abordagem simples
             
-            # Enviar email via Resend
-            try:
-                await self._send_recovery_email(request_data.email, profile.full_name, recovery_token)
-                return {
-                    "message": "Email de recuperação de senha enviado com sucesso"
-                }
-            except Exception as email_error:
-                print(f"Erro ao enviar email de recuperação: {email_error}")
+            # Enfileirar email de recuperação (enviado pelo dispatcher da outbox)
+            if not settings.RESEND_API_KEY:
+                logger.warning("RESEND_API_KEY não configurada - email de recuperação não enviado")
                 return {
                     "message": "Se o email estiver cadastrado, você receberá um link de recuperação"
                 }
             
+            subject, html = render_recovery_email(profile.full_name, settings.FRONTEND_URL, request_data.email, recovery_token)
+            db = SessionLocal()
+            try:
+                enqueue_email(db, request_data.email, subject, html)
+                db.commit()
+            finally:
+                db.close()
+            notify_dispatcher()
+            return {
+                "message": "Email de recuperação de senha enviado com sucesso"
+            }
+            
         except Exception as e:
             # Não revelar se o email existe ou não por segurança
             return {
                 "message": "Se o email estiver cadastrado, você receberá um link de recuperação"
             }
     
-    async def _send_recovery_email(self, email: str, full_name: str, token: str) -> None:
-        """
-        Envia email de recuperação de senha
-        
-        Args:
-            email: Email do usuário
-            full_name: Nome completo do usuário
-            token: Token de recuperação
-        """
-        try:
-            import httpx
-            
-            resend_api_key = os.getenv("RESEND_API_KEY")
-            if not resend_api_key:
-                print("RESEND_API_KEY não configurada")
-                return
-            
-            # URL da aplicação
-            app_url = os.getenv("FRONTEND_URL", "http://localhost:5173")
-            reset_url = f"{app_url}/auth/reset-password?token={token}&email={email}"
-            
-            # Template do email
-            html_content = f"""
-            <!DOCTYPE html>
-            <html>
-            <head>
-                <meta charset="utf-8">
-                <title>Recuperação de Senha - MyFinance</title>
-                <style>
-                    body {{ font-family: Arial, sans-serif; line-height: 1.6; color: #333; }}
-                    .container {{ max-width: 600px; margin: 0 auto; padding: 20px; }}
-                    .header {{ background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }}
-                    .content {{ background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }}
-                    .button {{ display: inline-block; background: #667eea; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; margin: 20px 0; }}
-                    .footer {{ text-align: center; margin-top: 30px; color: #666; font-size: 14px; }}
-                    .warning {{ background: #fff3cd; border: 1px solid #ffeaa7; padding: 15px; border-radius: 5px; margin: 20px 0; }}
-                </style>
-            </head>
-            <body>
-                <div class="container">
-                    <div class="header">
-                        <h1>🔐 Recuperação de Senha</h1>
-                    </div>
-                    <div class="content">
-                        <h2>Olá, {full_name}!</h2>
-                        <p>Recebemos uma solicitação para redefinir sua senha no MyFinance.</p>
-                        
-                        <div style="text-align: center;">
-                            <a href="{reset_url}" class="button">Redefinir Senha</a>
-                        </div>
-                        
-                        <div class="warning">
-                            <strong>⚠️ Importante:</strong>
-                            <ul>
-                                <li>Este link é válido por 24 horas</li>
-                                <li>Se você não solicitou esta recuperação, ignore este email</li>
-                                <li>Nunca compartilhe este link com outras pessoas</li>
-                            </ul>
-                        </div>
-                        
-                        <p>Se o botão não funcionar, copie e cole este link no seu navegador:</p>
-                        <p style="word-break: break-all; background: #f8f9fa; padding: 10px; border-radius: 5px; font-family: monospace; font-size: 12px;">
-                            {reset_url}
-                        </p>
-                        
-                        <p>Atenciosamente,<br>Equipe MyFinance</p>
-                    </div>
-                    <div class="footer">
-                        <p>Este é um email automático, não responda a esta mensagem.</p>
-                        <p>© 2024 MyFinance. Todos os direitos reservados.</p>
-                    </div>
-                </div>
-            </body>
-            </html>
-            """
-            
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    "https://api.resend.com/emails",
-                    headers={
-                        "Authorization": f"Bearer {resend_api_key}",
-                        "Content-Type": "application/json"
-                    },
-                    json={
-                        "from": "MyFinance <onboarding@resend.dev>",
-                        "to": [email],
-                        "subject": "🔐 Recuperação de Senha - MyFinance",
-                        "html": html_content
-                    },
-                    timeout=30.0
-                )
-                
-                if response.status_code == 200:
-                    print(f"Email de recuperação enviado para {email}")
-                else:
-                    print(f"Erro ao enviar email de recuperação: {response.status_code} - {response.text}")
-                    
-        except Exception as e:
-            print(f"Erro ao enviar email de recuperação: {str(e)}")
-            raise
-    
     async def reset_password(self, request_data: ResetPasswordRequest) -> Dict[str, str]:
         """
         Redefine a senha do usuário
@@ -489,8 +365,7 @@ class AuthService:
                 )
             
             # Hash da nova senha
-            from .utils.password_validator import hash_password
-            hashed_password = hash_password(request_data.new_password)
+            hashed_password = await self.password_hasher.hash(request_data.new_password)
             
             # Atualizar senha no perfil
             profile.password_hash = hashed_password
@@ -506,7 +381,7 @@ class AuthService:
         except HTTPException:
             raise
         except Exception as e:
-            print(f"Erro ao redefinir senha: {str(e)}")
+            logger.exception("Erro ao redefinir senha: %s", e)
             raise HTTPException(
                 status_code=500,
                 detail="Erro interno do servidor"
@@ -516,6 +391,9 @@ class AuthService:
         """
         Busca o perfil de um usuário
         
+        Consulta primeiro o cache de perfis; o banco só é acessado em caso
+        de falha ou expiração.
+        
         Args:
             user_id: ID do usuário
             
@@ -525,6 +403,10 @@ class AuthService:
         Raises:
             HTTPException: Se houver erro ao buscar perfil
         """
+        cached = self.profile_cache.get(user_id)
+        if cached is not None:
+            return cached
+        
         try:
             db = SessionLocal()
             profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
@@ -536,7 +418,7 @@ class AuthService:
                     detail="Perfil do usuário não encontrado"
                 )
             
-            return {
+            result = {
                 "id": profile.id,
                 "user_id": profile.user_id,
                 "email": profile.email,
@@ -548,6 +430,8 @@ class AuthService:
                 "created_at": profile.created_at,
                 "updated_at": profile.updated_at
             }
+            self.profile_cache.set(user_id, result)
+            return result
             
         except HTTPException:
             raise
@@ -584,14 +468,34 @@ class AuthService:
             
             # Atualizar campos fornecidos
             update_data = profile_data.dict(exclude_unset=True)
+            timezone_changed = "timezone" in update_data and update_data["timezone"] != profile.timezone
+            
+            # Os agregados somam as transações sem separar moedas
+            if update_data.get("currency") not in (None, profile.currency):
+                other_currency = db.query(Transaction.id).filter(
+                    Transaction.user_id == profile.user_id,
+                    Transaction.currency != update_data["currency"],
+                ).first()
+                if other_currency is not None:
+                    db.close()
+                    raise HTTPException(
+                        status_code=status.HTTP_409_CONFLICT,
+                        detail="Não é possível trocar a moeda do perfil enquanto houver transações em outra moeda"
+                    )
             for field, value in update_data.items():
                 setattr(profile, field, value)
             
+            # O rollup mensal é delimitado no fuso do perfil
+            if timezone_changed:
+                db.flush()
+                rebuild_user_monthly_totals(db, profile.user_id)
+            
             db.commit()
+            self.profile_cache.invalidate(user_id)
             db.refresh(profile)
             db.close()
             
-            return {
+            result = {
                 "id": profile.id,
                 "user_id": profile.user_id,
                 "email": profile.email,
@@ -603,6 +507,8 @@ class AuthService:
                 "created_at": profile.created_at,
                 "updated_at": profile.updated_at
             }
+            self.profile_cache.set(user_id, result)
+            return result
             
         except HTTPException:
             raise
@@ -612,12 +518,17 @@ class AuthService:
                 detail=f"Erro interno do servidor: {str(e)}"
             )
     
-    async def logout_user(self, user_id: str) -> Dict[str, str]:
+    async def logout_user(self, user_id: str, session_id: Optional[str] = None) -> Dict[str, str]:
         """
         Realiza logout do usuário
         
+        Revoga o refresh token da sessão; o sid da sessão entra no conjunto
+        de revogados e os access tokens dela deixam de ser aceitos.
+        
         Args:
             user_id: ID do usuário
+            session_id: sid do access token usado (sem ele, todas as sessões
+                do usuário são encerradas)
             
         Returns:
             Mensagem de confirmação
@@ -626,12 +537,14 @@ class AuthService:
             HTTPException: Se houver erro no logout
         """
         try:
-            # Em um sistema real, aqui você poderia:
-            # 1. Invalidar tokens no banco de dados
-            # 2. Adicionar tokens à blacklist
-            # 3. Limpar sessões ativas
+            db = SessionLocal()
+            try:
+                revoked = self._revoke_sessions(db, "logout", user_id, session_id)
+                db.commit()
+            finally:
+                db.close()
+            remember_revoked(revoked)
             
-            # Por enquanto, apenas retorna sucesso
             return {"message": "Logout realizado com sucesso"}
             
         except Exception as e:
@@ -644,28 +557,121 @@ class AuthService:
         """
         Atualiza o token de acesso usando refresh token
         
+        Cada refresh token vale uma única vez: é trocado por um novo da
+        mesma sessão. Reapresentar um token já trocado revoga a sessão.
+        
         Args:
             request_data: Dados da requisição contendo refresh token
-            
+        
         Returns:
             Novos tokens de acesso e refresh
-            
+        
         Raises:
-            HTTPException: Se o refresh token for inválido
+            HTTPException: Se o refresh token for inválido, expirado ou já usado
         """
+        invalid = HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token de refresh inválido",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+        token = request_data.refresh_token
         try:
-            # TODO: Implementar validação real do refresh token
-            # Por enquanto, apenas simula a renovação
-            new_access_token = "new-access-token-123"
-            new_refresh_token = "new-refresh-token-123"
-            
-            return {
-                "access_token": new_access_token,
-                "refresh_token": new_refresh_token,
-                "token_type": "bearer"
-            }
+            payload = self.jwt_handler.verify_token(token)
+            jti = uuid.UUID(payload["jti"])
+        except Exception:
+            raise invalid
+        if payload.get("type") != "refresh":
+            raise invalid
+        
+        db = SessionLocal()
+        try:
+            # FOR UPDATE: duas trocas simultâneas do mesmo token não geram dois sucessores
+            stored = db.query(RefreshToken).filter(RefreshToken.jti == jti).with_for_update().first()
+            if stored is None or stored.token_hash != hash_refresh_token(token):
+                raise invalid
+            
+            if stored.revoked_at is not None:
+                if stored.revoked_reason == "rotated":
+                    # Token já trocado apresentado de novo: provável vazamento,
+                    # encerra a sessão inteira
+                    revoked = self._revoke_sessions(db, "reuse", stored.user_id, stored.family_id)
+                    db.commit()
+                    remember_revoked(revoked)
+                    logger.warning("Reuso de refresh token detectado; sessão %s revogada", stored.family_id)
+                raise invalid
+            
+            tokens, successor = self._issue_tokens(
+                db, stored.user_id, payload.get("email"), payload.get("full_name"), stored.family_id
+            )
+            stored.revoked_at = datetime.now(timezone.utc)
+            stored.revoked_reason = "rotated"
+            stored.replaced_by = successor.jti
+            rotated = revoked_identifiers(stored)
+            db.commit()
+            remember_revoked(rotated)
+            return tokens
+        except HTTPException:
+            raise
         except Exception as e:
-            raise HTTPException(status_code=401, detail="Token de refresh inválido")
+            db.rollback()
+            logger.error("Erro ao renovar token: %s", e)
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="Erro interno do servidor"
+            )
+        finally:
+            db.close()
+    
+    def _issue_tokens(self, db, user_id, email: Optional[str], full_name: Optional[str], family_id=None):
+        """
+        Emite access e refresh token de uma sessão, sem commit
+        
+        O refresh token é registrado em refresh_tokens apenas pelo hash.
+        
+        Returns:
+            (tokens da resposta, linha RefreshToken criada)
+        """
+        user_id = uuid.UUID(str(user_id))
+        family_id = family_id or uuid.uuid4()
+        jti = uuid.uuid4()
+        claims = {"user_id": str(user_id), "email": email, "full_name": full_name, "sid": str(family_id)}
+        
+        refresh_token = self.jwt_handler.create_refresh_token({**claims, "jti": str(jti), "type": "refresh"})
+        stored = RefreshToken(
+            jti=jti,
+            family_id=family_id,
+            user_id=user_id,
+            token_hash=hash_refresh_token(refresh_token),
+            expires_at=datetime.now(timezone.utc) + timedelta(days=self.jwt_handler.refresh_token_expire_days),
+        )
+        db.add(stored)
+        
+        tokens = {
+            "access_token": self.jwt_handler.create_access_token(claims),
+            "refresh_token": refresh_token,
+            "token_type": "bearer",
+            "expires_in": self.jwt_handler.access_token_expire_minutes * 60,
+        }
+        return tokens, stored
+    
+    def _revoke_sessions(self, db, reason: str, user_id, family_id=None):
+        """
+        Revoga os refresh tokens ativos de uma sessão (ou de todas as do usuário), sem commit
+        
+        Returns:
+            Identificadores revogados, para remember_revoked após o commit
+        """
+        conditions = [RefreshToken.user_id == user_id, RefreshToken.revoked_at.is_(None)]
+        if family_id is not None:
+            conditions.append(RefreshToken.family_id == family_id)
+        rows = db.query(RefreshToken).filter(*conditions).all()
+        now = datetime.now(timezone.utc)
+        revoked = []
+        for row in rows:
+            row.revoked_at = now
+            row.revoked_reason = reason
+            revoked.extend(revoked_identifiers(row))
+        return revoked
     
     async def delete_user(self, user_id: str) -> Dict[str, str]:
         """
@@ -681,21 +687,24 @@ class AuthService:
             HTTPException: Se houver erro na exclusão
         """
         try:
-            # Deletar perfil do usuário
+            # Deletar perfil do usuário e encerrar suas sessões
             db = SessionLocal()
             profile = db.query(UserProfile).filter(UserProfile.user_id == user_id).first()
+            revoked = self._revoke_sessions(db, "deleted", user_id)
             
             if profile:
                 db.delete(profile)
-                db.commit()
+            db.commit()
             
             db.close()
+            remember_revoked(revoked)
+            self.profile_cache.invalidate(user_id)
             
             # Deletar usuário no Supabase
             try:
                 self.supabase.auth.admin.delete_user(user_id)
             except Exception as e:
-                print(f"Erro ao deletar usuário no Supabase: {str(e)}")
+                logger.warning("Erro ao deletar usuário no Supabase: %s", e)
             
             return {"message": "Usuário deletado com sucesso"}
             
@@ -0,0 +1,90 @@
+"""
+Lista de senhas vazadas em arquivo ordenado mapeado em memória
+
+O arquivo contém apenas digests SHA-1 de 20 bytes, ordenados e sem
+separadores (gerado por scripts/build_breached_passwords.py a partir de
+uma lista em texto ou do formato SHA1:contagem do Have I Been Pwned).
+A consulta é uma busca binária sobre o mmap: nada é carregado no heap, e
+os workers do mesmo host compartilham as páginas pelo cache do sistema
+operacional. Com 10 milhões de entradas são ~24 leituras de 20 bytes.
+"""
+
+import hashlib
+import mmap
+import os
+from typing import Optional
+
+DIGEST_SIZE = 20
+
+
+def password_digest(password: str) -> bytes:
+    """SHA-1 da senha em UTF-8, no mesmo formato das entradas do arquivo"""
+    return hashlib.sha1(password.encode("utf-8")).digest()
+
+
+class BreachedPasswordList:
+    """Conjunto somente leitura de digests SHA-1 sobre um arquivo ordenado"""
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Arquivo binário de digests SHA-1 ordenados
+
+        Raises:
+            ValueError: Se o tamanho do arquivo não for múltiplo de 20 bytes
+        """
+        self.path = path
+        size = os.path.getsize(path)
+        if size % DIGEST_SIZE:
+            raise ValueError(f"Arquivo de senhas vazadas inválido: {path} ({size} bytes)")
+        self._count = size // DIGEST_SIZE
+        self._mmap: Optional[mmap.mmap] = None
+        if self._count:
+            with open(path, "rb") as file:
+                self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        return self._count
+
+    def contains_digest(self, digest: bytes) -> bool:
+        low, high = 0, self._count
+        data = self._mmap
+        while low < high:
+            middle = (low + high) // 2
+            offset = middle * DIGEST_SIZE
+            entry = data[offset:offset + DIGEST_SIZE]
+            if entry < digest:
+                low = middle + 1
+            elif entry > digest:
+                high = middle
+            else:
+                return True
+        return False
+
+    def __contains__(self, password: str) -> bool:
+        return self.contains_digest(password_digest(password))
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+            self._count = 0
+
+
+_breached_passwords: Optional[BreachedPasswordList] = None
+_loaded = False
+
+
+def get_breached_password_list() -> Optional[BreachedPasswordList]:
+    """
+    Lista configurada em BREACHED_PASSWORDS_FILE, aberta na primeira chamada
+
+    Returns:
+        None se a variável não estiver definida
+    """
+    global _breached_passwords, _loaded
+    if not _loaded:
+        path = os.getenv("BREACHED_PASSWORDS_FILE")
+        _breached_passwords = BreachedPasswordList(path) if path else None
+        _loaded = True
+    return _breached_passwords
@@ -0,0 +1,69 @@
+"""
+Hash de senhas fora do event loop
+
+O bcrypt consome centenas de milissegundos de CPU por chamada. Executado
+dentro de uma corrotina, bloqueia todas as outras requisições do worker.
+Este módulo envia hash e verificação para um pool de threads de tamanho
+fixo (o bcrypt libera o GIL durante o cálculo) e limita quantas operações
+podem aguardar: acima do limite, responde 503 em vez de enfileirar.
+"""
+
+import asyncio
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+from fastapi import HTTPException, status
+from .password_validator import hash_password, verify_password
+
+class PasswordHasher:
+    """Pool limitado de threads para hash e verificação de senhas com bcrypt"""
+
+    def __init__(
+        self,
+        workers: Optional[int] = None,
+        max_pending: Optional[int] = None,
+        rounds: Optional[int] = None,
+    ):
+        """
+        Args:
+            workers: Threads dedicadas ao bcrypt (BCRYPT_WORKERS)
+            max_pending: Operações simultâneas, em execução ou na fila,
+                antes de recusar com 503 (BCRYPT_MAX_PENDING)
+            rounds: Fator de custo dos novos hashes (BCRYPT_ROUNDS)
+        """
+        self.workers = workers or int(os.getenv("BCRYPT_WORKERS", str(min(4, os.cpu_count() or 1))))
+        self.max_pending = max_pending or int(os.getenv("BCRYPT_MAX_PENDING", str(self.workers * 8)))
+        self.rounds = rounds or int(os.getenv("BCRYPT_ROUNDS", "12"))
+
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="bcrypt")
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+
+    async def _run(self, fn, *args):
+        if not self._slots.acquire(blocking=False):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Servidor ocupado, tente novamente em instantes",
+                headers={"Retry-After": "1"},
+            )
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._slots.release()
+            raise
+        # Libera a vaga quando a thread termina, mesmo que a requisição
+        # tenha sido cancelada antes
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        """Gera o hash bcrypt da senha com o fator de custo configurado"""
+        return await self._run(hash_password, password, self.rounds)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """Verifica a senha contra o hash (o custo vem do próprio hash)"""
+        return await self._run(verify_password, password, hashed_password)
+
+    def shutdown(self) -> None:
+        """Encerra o pool após concluir as operações em andamento"""
+        self._executor.shutdown(wait=True)
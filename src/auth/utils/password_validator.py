@@ -5,9 +5,12 @@ Este módulo implementa validação robusta de senhas com políticas de seguran
 para garantir que as senhas sejam fortes e seguras.
 """
 
+import os
 import re
-from typing import List, NamedTuple
+from collections import Counter
+from typing import List, NamedTuple, Optional
 from dataclasses import dataclass
+from .breached_passwords import BreachedPasswordList, get_breached_password_list
 
 @dataclass
 class PasswordValidationResult:
@@ -16,45 +19,68 @@ class PasswordValidationResult:
     errors: List[str]
     score: int  # 0-100
 
+# Senhas comuns que devem ser rejeitadas
+COMMON_PASSWORDS = frozenset({
+    'password', '123456', '123456789', 'qwerty', 'abc123',
+    'password123', 'admin', 'letmein', 'welcome', 'monkey',
+    '1234567890', '1234567', '12345678', '12345678910',
+    'password1', 'password12', 'password1234', 'password12345',
+    'admin123', 'admin1234', 'admin12345', 'admin123456',
+    'user', 'user123', 'user1234', 'user12345', 'user123456',
+    'test', 'test123', 'test1234', 'test12345', 'test123456',
+    'guest', 'guest123', 'guest1234', 'guest12345', 'guest123456',
+    'demo', 'demo123', 'demo1234', 'demo12345', 'demo123456',
+    'temp', 'temp123', 'temp1234', 'temp12345', 'temp123456',
+    'pass', 'pass123', 'pass1234', 'pass12345', 'pass123456',
+    'login', 'login123', 'login1234', 'login12345', 'login123456',
+    'welcome123', 'welcome1234', 'welcome12345', 'welcome123456',
+    'letmein123', 'letmein1234', 'letmein12345', 'letmein123456',
+    'monkey123', 'monkey1234', 'monkey12345', 'monkey123456',
+    'qwerty123', 'qwerty1234', 'qwerty12345', 'qwerty123456',
+    'abc123456', 'abc1234567', 'abc12345678', 'abc123456789',
+    '123456789a', '123456789ab', '123456789abc', '123456789abcd',
+    'a123456789', 'ab123456789', 'abc123456789', 'abcd123456789'
+})
+
+# Padrões de informações pessoais, compilados em uma única expressão
+PERSONAL_INFO_PATTERNS = (
+    r'(joao|maria|jose|ana|pedro|julia|lucas|sophia|gabriel|isabella)',
+    r'(silva|santos|oliveira|souza|rodrigues|ferreira|almeida|pereira|lima|gomes)',
+    r'(brasil|brazil|sao paulo|rio de janeiro|minas gerais|bahia|parana|pernambuco)',
+    r'(1990|1991|1992|1993|1994|1995|1996|1997|1998|1999|2000|2001|2002|2003|2004|2005)'
+)
+_PERSONAL_INFO_RE = re.compile('|'.join(PERSONAL_INFO_PATTERNS))
+
+SPECIAL_CHARS = frozenset('!@#$%^&*()_+-=[]{}|;:,.<>?')
+
+# Trincas de caracteres consecutivos ('012' ... '890', 'abc' ... 'xyz')
+_SEQUENCES = frozenset(
+    alphabet[i:i + 3]
+    for alphabet in ('01234567890', 'abcdefghijklmnopqrstuvwxyz')
+    for i in range(len(alphabet) - 2)
+)
+
 class PasswordValidator:
     """Validador de senha com políticas de segurança"""
     
-    def __init__(self):
-        # Senhas comuns que devem ser rejeitadas
-        self.common_passwords = {
-            'password', '123456', '123456789', 'qwerty', 'abc123',
-            'password123', 'admin', 'letmein', 'welcome', 'monkey',
-            '1234567890', '1234567', '12345678', '12345678910',
-            'password1', 'password12', 'password1234', 'password12345',
-            'admin123', 'admin1234', 'admin12345', 'admin123456',
-            'user', 'user123', 'user1234', 'user12345', 'user123456',
-            'test', 'test123', 'test1234', 'test12345', 'test123456',
-            'guest', 'guest123', 'guest1234', 'guest12345', 'guest123456',
-            'demo', 'demo123', 'demo1234', 'demo12345', 'demo123456',
-            'temp', 'temp123', 'temp1234', 'temp12345', 'temp123456',
-            'pass', 'pass123', 'pass1234', 'pass12345', 'pass123456',
-            'login', 'login123', 'login1234', 'login12345', 'login123456',
-            'welcome123', 'welcome1234', 'welcome12345', 'welcome123456',
-            'letmein123', 'letmein1234', 'letmein12345', 'letmein123456',
-            'monkey123', 'monkey1234', 'monkey12345', 'monkey123456',
-            'qwerty123', 'qwerty1234', 'qwerty12345', 'qwerty123456',
-            'abc123456', 'abc1234567', 'abc12345678', 'abc123456789',
-            '123456789a', '123456789ab', '123456789abc', '123456789abcd',
-            'a123456789', 'ab123456789', 'abc123456789', 'abcd123456789'
-        }
-        
-        # Padrões de informações pessoais
-        self.personal_info_patterns = [
-            r'(joao|maria|jose|ana|pedro|julia|lucas|sophia|gabriel|isabella)',
-            r'(silva|santos|oliveira|souza|rodrigues|ferreira|almeida|pereira|lima|gomes)',
-            r'(brasil|brazil|sao paulo|rio de janeiro|minas gerais|bahia|parana|pernambuco)',
-            r'(1990|1991|1992|1993|1994|1995|1996|1997|1998|1999|2000|2001|2002|2003|2004|2005)'
-        ]
+    def __init__(self, breached_passwords: Optional[BreachedPasswordList] = None):
+        """
+        Args:
+            breached_passwords: Lista de senhas vazadas (padrão: arquivo de
+                BREACHED_PASSWORDS_FILE, se configurado)
+        """
+        self.common_passwords = COMMON_PASSWORDS
+        if breached_passwords is None:
+            breached_passwords = get_breached_password_list()
+        self.breached_passwords = breached_passwords
     
     def validate(self, password: str) -> PasswordValidationResult:
         """
         Valida uma senha de acordo com as políticas de segurança
         
+        Classes de caracteres, sequências, repetições e variedade são
+        apuradas em uma única passada pela senha.
+        
         Args:
             password: Senha a ser validada
             
@@ -63,78 +89,110 @@ class PasswordValidator:
         """
         errors = []
         score = 0
+        length = len(password)
+        password_lower = password.lower()
+        
+        has_upper = has_lower = has_digit = has_special = False
+        has_sequence = has_run = False
+        counts = {}
+        previous = None
+        run = 0
+        tail = ''
+        for char in password:
+            if char.isupper():
+                has_upper = True
+            elif char.islower():
+                has_lower = True
+            elif char.isdigit():
+                has_digit = True
+            elif char in SPECIAL_CHARS:
+                has_special = True
+            
+            counts[char] = counts.get(char, 0) + 1
+            
+            run = run + 1 if char == previous else 1
+            if run >= 3:
+                has_run = True
+            previous = char
+            
+            tail = (tail + char.lower())[-3:]
+            if tail in _SEQUENCES:
+                has_sequence = True
+        
+        has_repeats = length >= 4 and (has_run or max(counts.values()) > length * 0.5)
         
         # Verificar comprimento mínimo
-        if len(password) < 8:
+        if length < 8:
             errors.append("A senha deve ter um mínimo de 8 caracteres")
         else:
             score += 10
         
         # Verificar comprimento máximo
-        if len(password) > 128:
+        if length > 128:
             errors.append("A senha deve ter no máximo 128 caracteres")
         else:
             score += 5
         
         # Verificar letras maiúsculas
-        if not any(c.isupper() for c in password):
+        if not has_upper:
             errors.append("A senha deve conter pelo menos uma letra maiúscula")
         else:
             score += 10
         
         # Verificar letras minúsculas
-        if not any(c.islower() for c in password):
+        if not has_lower:
             errors.append("A senha deve conter pelo menos uma letra minúscula")
         else:
             score += 10
         
         # Verificar números
-        if not any(c.isdigit() for c in password):
+        if not has_digit:
             errors.append("A senha deve conter pelo menos um número")
         else:
             score += 10
         
         # Verificar caracteres especiais
-        special_chars = '!@#$%^&*()_+-=[]{}|;:,.<>?'
-        if not any(c in special_chars for c in password):
+        if not has_special:
             errors.append("A senha deve conter pelo menos um caractere especial")
         else:
             score += 15
         
-        # Verificar senhas comuns
-        if password.lower() in self.common_passwords:
+        # Verificar senhas comuns e vazadas
+        if password_lower in self.common_passwords:
             errors.append("A senha é muito comum")
+        elif self.breached_passwords is not None and password in self.breached_passwords:
+            errors.append("A senha aparece em vazamentos de dados conhecidos")
         else:
             score += 20
         
         # Verificar informações pessoais
-        if self._contains_personal_info(password):
+        if _PERSONAL_INFO_RE.search(password_lower):
             errors.append("A senha não deve conter informações pessoais")
         else:
             score += 10
         
         # Verificar caracteres sequenciais (apenas para senhas fracas)
-        if self._has_sequential_chars(password) and len(password) < 10:
+        if has_sequence and length < 10:
             errors.append("A senha não deve conter sequências de caracteres")
         else:
             score += 5
         
         # Verificar caracteres repetidos
-        if self._has_repeated_chars(password):
+        if has_repeats:
             errors.append("A senha não deve conter muitos caracteres repetidos")
         else:
             score += 5
         
         # Verificar complexidade geral
-        if len(set(password)) < len(password) * 0.7:
+        if len(counts) < length * 0.7:
             errors.append("A senha deve ter boa variedade de caracteres")
         else:
             score += 10
         
         # Ajustar score baseado no comprimento
-        if len(password) >= 12:
+        if length >= 12:
             score += 10
-        elif len(password) >= 10:
+        elif length >= 10:
             score += 5
         
         # Limitar score máximo
@@ -148,32 +206,12 @@ class PasswordValidator:
     
     def _contains_personal_info(self, password: str) -> bool:
         """Verifica se a senha contém informações pessoais"""
-        password_lower = password.lower()
-        
-        for pattern in self.personal_info_patterns:
-            if re.search(pattern, password_lower):
-                return True
-        
-        return False
+        return _PERSONAL_INFO_RE.search(password.lower()) is not None
     
     def _has_sequential_chars(self, password: str) -> bool:
         """Verifica se a senha contém sequências de caracteres"""
-        # Sequências numéricas
-        numeric_sequences = ['123', '234', '345', '456', '567', '678', '789', '890',
-                           '012', '1234', '2345', '3456', '4567', '5678', '6789', '7890']
-        
-        # Sequências alfabéticas
-        alpha_sequences = ['abc', 'bcd', 'cde', 'def', 'efg', 'fgh', 'ghi', 'hij',
-                          'ijk', 'jkl', 'klm', 'lmn', 'mno', 'nop', 'opq', 'pqr',
-                          'qrs', 'rst', 'stu', 'tuv', 'uvw', 'vwx', 'wxy', 'xyz']
-        
         password_lower = password.lower()
-        
-        for seq in numeric_sequences + alpha_sequences:
-            if seq in password_lower:
-                return True
-        
-        return False
+        return any(password_lower[i:i + 3] in _SEQUENCES for i in range(len(password_lower) - 2))
     
     def _has_repeated_chars(self, password: str) -> bool:
         """Verifica se a senha contém muitos caracteres repetidos"""
@@ -186,15 +224,8 @@ class PasswordValidator:
                 return True
         
         # Verificar se mais de 50% dos caracteres são repetidos
-        char_counts = {}
-        for char in password:
-            char_counts[char] = char_counts.get(char, 0) + 1
-        
-        max_repetition = max(char_counts.values())
-        if max_repetition > len(password) * 0.5:
-            return True
-        
-        return False
+        max_repetition = max(Counter(password).values())
+        return max_repetition > len(password) * 0.5
     
     def get_strength_description(self, score: int) -> str:
         """Retorna descrição da força da senha baseada no score"""
@@ -225,8 +256,7 @@ class PasswordValidator:
         if not any(c.isdigit() for c in password):
             suggestions.append("Adicione pelo menos um número")
         
-        special_chars = '!@#$%^&*()_+-=[]{}|;:,.<>?'
-        if not any(c in special_chars for c in password):
+        if not any(c in SPECIAL_CHARS for c in password):
             suggestions.append("Adicione pelo menos um caractere especial")
         
         if len(password) < 12:
@@ -257,12 +287,16 @@ def validate_password(password: str) -> List[str]:
     result = validator.validate(password)
     return result.errors
 
-def hash_password(password: str) -> str:
+def hash_password(password: str, rounds: Optional[int] = None) -> str:
     """
     Função auxiliar para fazer hash da senha
     
+    Bloqueia a thread durante o cálculo; nas rotas use PasswordHasher
+    (password_hasher), que executa em um pool dedicado.
+    
     Args:
         password: Senha em texto plano
+        rounds: Fator de custo do bcrypt (padrão: BCRYPT_ROUNDS ou 12)
         
     Returns:
         Hash da senha
@@ -270,7 +304,7 @@ def hash_password(password: str) -> str:
     import bcrypt
     
     # Gerar salt e hash
-    salt = bcrypt.gensalt()
+    salt = bcrypt.gensalt(rounds=rounds or int(os.getenv("BCRYPT_ROUNDS", "12")))
     hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
     
     return hashed.decode('utf-8')
@@ -0,0 +1,74 @@
+"""
+Cache de perfis de usuário para /auth/me e /auth/profile
+
+Read-through: get_user_profile consulta o cache antes do banco e guarda o
+resultado; update_user_profile e delete_user invalidam a entrada do
+usuário. O cache é por processo, então a escrita feita em um worker não
+invalida os outros: o TTL limita por quanto tempo eles podem devolver um
+perfil desatualizado.
+"""
+
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+class ProfileCache:
+    """LRU limitado de perfis por user_id, com expiração por TTL"""
+
+    def __init__(self, max_size: Optional[int] = None, ttl: Optional[float] = None):
+        """
+        Args:
+            max_size: Máximo de perfis em cache (AUTH_PROFILE_CACHE_SIZE);
+                0 desativa o cache
+            ttl: Segundos que cada perfil permanece válido (AUTH_PROFILE_CACHE_TTL)
+        """
+        self.max_size = int(os.getenv("AUTH_PROFILE_CACHE_SIZE", "10000")) if max_size is None else max_size
+        self.ttl = float(os.getenv("AUTH_PROFILE_CACHE_TTL", "60")) if ttl is None else ttl
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, user_id: str) -> Optional[Dict[str, Any]]:
+        """Retorna uma cópia do perfil em cache, se ainda válido"""
+        key = str(user_id)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, profile = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return dict(profile)
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, user_id: str, profile: Dict[str, Any]) -> None:
+        if not self.max_size or self.ttl <= 0:
+            return
+        key = str(user_id)
+        self._entries[key] = (time.monotonic() + self.ttl, dict(profile))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        """Remove o perfil do usuário (chamado após alterá-lo ou excluí-lo)"""
+        if self._entries.pop(str(user_id), None) is not None:
+            self.invalidations += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = self.invalidations = 0
+
+    def stats(self) -> Dict[str, float]:
+        """Contadores de acertos, falhas e invalidações e ocupação atual"""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "invalidations": self.invalidations,
+        }
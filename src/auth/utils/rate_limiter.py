@@ -0,0 +1,164 @@
+"""
+Limitador de taxa em memória para os endpoints de autenticação
+
+Token bucket por chave (IP, email) guardado em shards com lock próprio:
+cada verificação é O(1) e toca apenas um shard. Buckets que já voltaram
+a ficar cheios equivalem a buckets inexistentes e são removidos pela
+compactação periódica, que mantém a memória proporcional às chaves
+ativas. O estado é por processo; com vários workers, cada um aplica o
+limite de forma independente.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+def parse_rate(spec: str) -> Tuple[int, float]:
+    """
+    Converte "N/S" (N requisições a cada S segundos) em (capacidade, segundos)
+
+    Raises:
+        ValueError: Se o formato for inválido
+    """
+    try:
+        capacity, period = spec.split("/", 1)
+        capacity, period = int(capacity), float(period)
+    except ValueError:
+        raise ValueError(f"Limite inválido '{spec}': use N/segundos, ex.: 10/60")
+    if capacity < 1 or period <= 0:
+        raise ValueError(f"Limite inválido '{spec}': N e segundos devem ser positivos")
+    return capacity, period
+
+
+class TokenBucketLimiter:
+    """Token bucket por chave com armazenamento particionado em shards"""
+
+    def __init__(self, capacity: int, period: float, shards: int = 16, compact_interval: float = 60.0):
+        """
+        Args:
+            capacity: Requisições permitidas em rajada
+            period: Segundos para recompor a capacidade inteira
+            shards: Número de partições do armazenamento
+            compact_interval: Segundos entre compactações
+        """
+        self.capacity = capacity
+        self.period = period
+        self.refill_rate = capacity / period
+        self.compact_interval = compact_interval
+        self._shards: List[Dict[str, List[float]]] = [{} for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+        self._next_compaction = time.monotonic() + compact_interval
+        self.allowed = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_spec(cls, spec: str, **kwargs) -> "TokenBucketLimiter":
+        capacity, period = parse_rate(spec)
+        return cls(capacity, period, **kwargs)
+
+    def hit(self, key: str) -> Optional[float]:
+        """
+        Consome um token da chave
+
+        Returns:
+            None se permitido, ou os segundos até haver um token disponível
+        """
+        now = time.monotonic()
+        if now >= self._next_compaction:
+            self.compact(now)
+
+        index = hash(key) % len(self._shards)
+        with self._locks[index]:
+            shard = self._shards[index]
+            bucket = shard.get(key)
+            if bucket is None:
+                tokens = float(self.capacity)
+            else:
+                tokens = min(self.capacity, bucket[0] + (now - bucket[1]) * self.refill_rate)
+            if tokens < 1:
+                shard[key] = [tokens, now]
+                self.rejected += 1
+                return (1 - tokens) / self.refill_rate
+            shard[key] = [tokens - 1, now]
+        self.allowed += 1
+        return None
+
+    def compact(self, now: Optional[float] = None) -> int:
+        """Remove buckets já recompostos; retorna quantos foram removidos"""
+        now = time.monotonic() if now is None else now
+        self._next_compaction = now + self.compact_interval
+        removed = 0
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                full = [key for key, (tokens, updated_at) in shard.items()
+                        if tokens + (now - updated_at) * self.refill_rate >= self.capacity]
+                for key in full:
+                    del shard[key]
+                removed += len(full)
+        return removed
+
+    def reset(self) -> None:
+        for shard, lock in zip(self._shards, self._locks):
+            with lock:
+                shard.clear()
+        self.allowed = self.rejected = 0
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "capacity": self.capacity,
+            "period_seconds": self.period,
+            "tracked_keys": sum(len(shard) for shard in self._shards),
+            "allowed": self.allowed,
+            "rejected": self.rejected,
+        }
+
+
+class AuthRateLimiter:
+    """
+    Limites dos endpoints de autenticação
+
+    Cada endpoint tem um bucket global (descarte de carga, 503) e buckets
+    por IP e por email (429).
+    """
+
+    def __init__(
+        self,
+        per_ip: Optional[str] = None,
+        per_email: Optional[str] = None,
+        global_limit: Optional[str] = None,
+    ):
+        self.per_ip = TokenBucketLimiter.from_spec(per_ip or os.getenv("AUTH_RATE_LIMIT_IP", "30/60"))
+        self.per_email = TokenBucketLimiter.from_spec(per_email or os.getenv("AUTH_RATE_LIMIT_EMAIL", "10/60"))
+        self.global_limit = TokenBucketLimiter.from_spec(global_limit or os.getenv("AUTH_RATE_LIMIT_GLOBAL", "200/1"))
+
+    def check(self, scope: str, ip: Optional[str], email: Optional[str]) -> Optional[Tuple[int, float]]:
+        """
+        Aplica os limites de um endpoint
+
+        Returns:
+            None se permitido, ou (status HTTP, segundos para nova tentativa)
+        """
+        retry_after = self.global_limit.hit(scope)
+        if retry_after is not None:
+            return 503, retry_after
+        if ip:
+            retry_after = self.per_ip.hit(f"{scope}:{ip}")
+            if retry_after is not None:
+                return 429, retry_after
+        if email:
+            retry_after = self.per_email.hit(f"{scope}:{email.strip().lower()}")
+            if retry_after is not None:
+                return 429, retry_after
+        return None
+
+    def reset(self) -> None:
+        for limiter in (self.per_ip, self.per_email, self.global_limit):
+            limiter.reset()
+
+    def stats(self) -> Dict[str, Dict[str, float]]:
+        return {
+            "ip": self.per_ip.stats(),
+            "email": self.per_email.stats(),
+            "global": self.global_limit.stats(),
+        }
@@ -0,0 +1,130 @@
+"""
+Conjunto em memória de identificadores de token revogados
+
+get_current_user consulta este conjunto a cada requisição, sem acessar o
+banco. A consulta passa primeiro por um filtro de Bloom: a grande maioria
+dos tokens nunca foi revogada e é descartada ali com alguns bits lidos.
+Os positivos (verdadeiros ou falsos) são confirmados no conjunto exato,
+que também guarda até quando cada entrada precisa ser lembrada; depois
+disso o token correspondente já expirou por conta própria e a entrada é
+podada.
+"""
+
+import hashlib
+import math
+import os
+import time
+from typing import Dict, Iterable, Optional, Tuple
+
+class BloomFilter:
+    """Filtro de Bloom sobre um bytearray, com hashing duplo (blake2b)"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """
+        Args:
+            capacity: Número de elementos previsto
+            error_rate: Taxa de falsos positivos desejada nessa capacidade
+        """
+        capacity = max(capacity, 1)
+        self.size = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hashes):
+            yield (first + i * second) % self.size
+
+    def add(self, key: str) -> None:
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class RevocationStore:
+    """Identificadores revogados (jti e sessões), com pré-filtro de Bloom"""
+
+    def __init__(self, capacity: Optional[int] = None, error_rate: float = 0.001):
+        """
+        Args:
+            capacity: Entradas previstas no filtro (AUTH_REVOCATION_CAPACITY);
+                acima disso o filtro é recriado com o dobro do tamanho
+            error_rate: Taxa de falsos positivos do filtro
+        """
+        self.capacity = int(os.getenv("AUTH_REVOCATION_CAPACITY", "100000")) if capacity is None else capacity
+        self.error_rate = error_rate
+        self._revoked: Dict[str, float] = {}
+        self._bloom = BloomFilter(self.capacity, error_rate)
+        self.checks = 0
+        self.bloom_hits = 0
+        self.revoked_hits = 0
+
+    def add(self, identifier, expires_at: float) -> None:
+        """
+        Marca o identificador como revogado até expires_at (timestamp UTC)
+        """
+        key = str(identifier)
+        if expires_at <= self._revoked.get(key, 0):
+            return
+        self._revoked[key] = expires_at
+        if len(self._revoked) > self.capacity:
+            self.capacity *= 2
+            self._rebuild_bloom()
+        else:
+            self._bloom.add(key)
+
+    def replace(self, entries: Iterable[Tuple[str, float]]) -> None:
+        """Substitui todo o conteúdo (reconstrução a partir do banco)"""
+        self._revoked = {}
+        for identifier, expires_at in entries:
+            key = str(identifier)
+            self._revoked[key] = max(expires_at, self._revoked.get(key, 0))
+        self.capacity = max(self.capacity, len(self._revoked))
+        self._rebuild_bloom()
+
+    def is_revoked(self, *identifiers) -> bool:
+        """True se algum dos identificadores estiver revogado"""
+        self.checks += 1
+        for identifier in identifiers:
+            if identifier is None:
+                continue
+            key = str(identifier)
+            if key in self._bloom:
+                self.bloom_hits += 1
+                if key in self._revoked:
+                    self.revoked_hits += 1
+                    return True
+        return False
+
+    def prune(self, now: Optional[float] = None) -> int:
+        """Remove entradas vencidas e recria o filtro; retorna quantas saíram"""
+        now = time.time() if now is None else now
+        expired = [key for key, expires_at in self._revoked.items() if expires_at <= now]
+        for key in expired:
+            del self._revoked[key]
+        if expired:
+            self._rebuild_bloom()
+        return len(expired)
+
+    def _rebuild_bloom(self) -> None:
+        self._bloom = BloomFilter(self.capacity, self.error_rate)
+        for key in self._revoked:
+            self._bloom.add(key)
+
+    def __len__(self) -> int:
+        return len(self._revoked)
+
+    def stats(self) -> Dict[str, int]:
+        """Tamanho e contadores de consultas; bloom_hits - revoked_hits são falsos positivos"""
+        return {
+            "size": len(self._revoked),
+            "capacity": self.capacity,
+            "checks": self.checks,
+            "bloom_hits": self.bloom_hits,
+            "revoked_hits": self.revoked_hits,
+        }
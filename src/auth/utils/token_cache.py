@@ -0,0 +1,77 @@
+"""
+Cache de tokens JWT já verificados
+
+Evita repetir a verificação HMAC e a construção do User a cada requisição
+de uma mesma sessão. As entradas são indexadas pelo SHA-256 do token (o
+token em si não fica em memória), expiram no exp do próprio token e o
+tamanho é limitado com descarte LRU.
+"""
+
+import hashlib
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+class VerifiedTokenCache:
+    """LRU limitado de tokens verificados, com expiração pelo exp do token"""
+
+    def __init__(self, max_size: Optional[int] = None):
+        """
+        Args:
+            max_size: Máximo de tokens em cache (AUTH_TOKEN_CACHE_SIZE);
+                0 desativa o cache
+        """
+        self.max_size = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000")) if max_size is None else max_size
+        self._entries: "OrderedDict[bytes, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[Any]:
+        """Retorna o valor associado ao token, se ainda não expirou"""
+        key = self._key(token)
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, value = entry
+            if expires_at > time.time():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return value
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def set(self, token: str, value: Any, expires_at: Optional[float]) -> None:
+        """
+        Guarda o valor até expires_at (timestamp UTC)
+
+        Tokens sem exp não são guardados: não haveria quando descartá-los.
+        """
+        if not self.max_size or not expires_at or expires_at <= time.time():
+            return
+        key = self._key(token)
+        self._entries[key] = (expires_at, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def discard(self, token: str) -> None:
+        """Remove o token do cache (ex.: ao revogá-lo)"""
+        self._entries.pop(self._key(token), None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        """Contadores de acertos e falhas e ocupação atual"""
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
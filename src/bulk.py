@@ -0,0 +1,152 @@
+"""
+Criação de transações em lote
+
+Valida todos os itens em uma passada, descarta os inválidos com erro por
+item e insere os válidos com um INSERT multi-linha ... RETURNING.
+"""
+import uuid
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from uuid import UUID
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from .database import Category, Transaction as TransactionModel
+from .models import BulkItemError, Currency, TransactionBulkResult, TransactionCreate
+from .rollup import record_created
+from .summary import check_user_currency, get_user_currency
+
+
+def _format_errors(error: ValidationError) -> List[str]:
+    return [
+        f"{'.'.join(str(part) for part in item['loc']) or 'item'}: {item['msg']}"
+        for item in error.errors()
+    ]
+
+
+def parse_transaction_items(raw_items: List[Any], user_currency: str) -> Tuple[List[Tuple[int, TransactionCreate]], List[BulkItemError]]:
+    """
+    Valida o formato dos itens brutos, sem acessar o banco
+
+    Itens sem moeda recebem a moeda do perfil; itens em outra moeda são
+    recusados (ver check_user_currency).
+
+    Returns:
+        (itens válidos com sua posição, erros por item)
+    """
+    valid: List[Tuple[int, TransactionCreate]] = []
+    errors: List[BulkItemError] = []
+
+    for index, raw in enumerate(raw_items):
+        try:
+            item = TransactionCreate.model_validate(raw)
+        except ValidationError as e:
+            errors.append(BulkItemError(index=index, errors=_format_errors(e)))
+            continue
+        if "currency" not in item.model_fields_set:
+            item = item.model_copy(update={"currency": Currency(user_currency)})
+        try:
+            check_user_currency(item.currency.value, user_currency)
+        except ValueError as e:
+            errors.append(BulkItemError(index=index, errors=[f"currency: {e}"]))
+            continue
+        valid.append((index, item))
+
+    return valid, errors
+
+
+def check_item_categories(
+    db: Session,
+    user_id: UUID,
+    valid: List[Tuple[int, TransactionCreate]],
+    errors: List[BulkItemError],
+) -> Tuple[List[Tuple[int, TransactionCreate]], List[BulkItemError]]:
+    """Recusa os itens cuja categoria não pertence ao usuário; erros saem ordenados pela posição"""
+    # Uma única consulta para todas as categorias referenciadas; uma FK
+    # inválida abortaria o INSERT do lote inteiro
+    errors = list(errors)
+    category_ids = {item.category_id for _, item in valid if item.category_id}
+    if category_ids:
+        existing = {
+            row[0]
+            for row in db.query(Category.id).filter(Category.id.in_(category_ids), Category.user_id == user_id).all()
+        }
+        missing = category_ids - existing
+        if missing:
+            still_valid = []
+            for index, item in valid:
+                if item.category_id in missing:
+                    errors.append(BulkItemError(index=index, errors=["category_id: Categoria não encontrada"]))
+                else:
+                    still_valid.append((index, item))
+            valid = still_valid
+
+    errors.sort(key=lambda error: error.index)
+    return valid, errors
+
+
+def validate_transaction_items(db: Session, user_id: UUID, raw_items: List[Any]) -> Tuple[List[Tuple[int, TransactionCreate]], List[BulkItemError]]:
+    """
+    Valida os itens brutos do lote; categorias precisam pertencer ao usuário
+
+    Returns:
+        (itens válidos com sua posição, erros por item)
+    """
+    valid, errors = parse_transaction_items(raw_items, get_user_currency(db, user_id))
+    return check_item_categories(db, user_id, valid, errors)
+
+
+def insert_transactions(
+    db: Session,
+    user_id: UUID,
+    transactions: List[TransactionCreate],
+    created_at: Optional[List[Optional[datetime]]] = None,
+) -> List[TransactionModel]:
+    """
+    Insere transações já validadas e atualiza o rollup, sem commit
+
+    O SQLAlchemy agrupa os parâmetros em INSERT ... VALUES (...), (...)
+    RETURNING, evitando um round trip por linha.
+
+    Args:
+        created_at: Datas de criação paralelas a transactions (ex.: data de
+            lançamento de um extrato); None usa o default do banco
+    """
+    if not transactions:
+        return []
+
+    rows = []
+    for position, item in enumerate(transactions):
+        row = {
+            "id": uuid.uuid4(),
+            "user_id": user_id,
+            "type": item.type.value,
+            "amount_cents": item.amount_cents,
+            "currency": item.currency.value,
+            "description": item.description,
+            "category_id": item.category_id,
+        }
+        if created_at and created_at[position] is not None:
+            row["created_at"] = created_at[position]
+        rows.append(row)
+    created = list(db.scalars(insert(TransactionModel).returning(TransactionModel), rows))
+    record_created(db, created)
+    return created
+
+
+def bulk_create_transactions(db: Session, user_id: UUID, raw_items: List[Any]) -> TransactionBulkResult:
+    """Valida, insere e faz commit de um lote de transações do usuário"""
+    valid, errors = validate_transaction_items(db, user_id, raw_items)
+
+    try:
+        created = insert_transactions(db, user_id, [item for _, item in valid])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    return TransactionBulkResult(
+        created=len(created),
+        ids=[transaction.id for transaction in created],
+        errors=errors,
+    )
@@ -1,9 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import date
 from typing import List, Optional
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from src.auth.dependencies import get_current_user
-from src.database_sqlalchemy import get_db
-from src.categories.models import CategoryCreate, CategoryUpdate, CategoryResponse, CategoryWithTransactionCount
+from src.database_sqlalchemy import get_async_db, get_async_read_db
+from src.categories.models import CategoryCreate, CategoryUpdate, CategoryResponse, CategoryWithStats, CategoryWithTransactionCount
 from src.categories.services import CategoryService
 from uuid import UUID
 from src.auth.models import User
@@ -14,22 +15,36 @@ router = APIRouter(prefix="/categories", tags=["categories"])
 async def get_categories(
     include_inactive: bool = Query(False, description="Include inactive categories"),
     category_type: Optional[str] = Query(None, description="Filter by category type (income or expense)"),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Lista todas as categorias do usuário"""
     service = CategoryService(db, current_user.id)
-    return service.get_categories(include_inactive=include_inactive, category_type=category_type)
+    return await service.get_categories(include_inactive=include_inactive, category_type=category_type)
+
+@router.get("/stats", response_model=List[CategoryWithStats])
+async def get_category_stats(
+    from_date: Optional[date] = Query(None, alias="from", description="Data inicial (inclusiva)"),
+    to_date: Optional[date] = Query(None, alias="to", description="Data final (inclusiva)"),
+    category_type: Optional[str] = Query(None, description="Filter by category type (income or expense)"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Contagem, total e participação percentual de cada categoria no período"""
+    if from_date and to_date and from_date > to_date:
+        raise HTTPException(status_code=422, detail="from deve ser anterior a to")
+    service = CategoryService(db, current_user.id)
+    return await service.get_category_stats(start_date=from_date, end_date=to_date, category_type=category_type)
 
 @router.get("/{category_id}", response_model=CategoryResponse)
 async def get_category(
     category_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_read_db),
     current_user: User = Depends(get_current_user)
 ):
     """Obtém uma categoria específica"""
     service = CategoryService(db, current_user.id)
-    category = service.get_category(category_id)
+    category = await service.get_category(category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Categoria não encontrada")
     return category
@@ -37,23 +52,23 @@ async def get_category(
 @router.post("/", response_model=CategoryResponse, status_code=201)
 async def create_category(
     category_data: CategoryCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Cria uma nova categoria"""
     service = CategoryService(db, current_user.id)
-    return service.create_category(category_data)
+    return await service.create_category(category_data)
 
 @router.put("/{category_id}", response_model=CategoryResponse)
 async def update_category(
     category_id: UUID,
     category_data: CategoryUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Atualiza uma categoria"""
     service = CategoryService(db, current_user.id)
-    category = service.update_category(category_id, category_data)
+    category = await service.update_category(category_id, category_data)
     if not category:
         raise HTTPException(status_code=404, detail="Categoria não encontrada")
     return category
@@ -61,12 +76,12 @@ async def update_category(
 @router.delete("/{category_id}")
 async def delete_category(
     category_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Deleta uma categoria (soft delete)"""
     service = CategoryService(db, current_user.id)
-    success = service.delete_category(category_id)
+    success = await service.delete_category(category_id)
     if not success:
         raise HTTPException(status_code=404, detail="Categoria não encontrada")
     return {"message": "Categoria deletada com sucesso"}
@@ -74,12 +89,12 @@ async def delete_category(
 @router.post("/{category_id}/restore")
 async def restore_category(
     category_id: UUID,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     current_user: User = Depends(get_current_user)
 ):
     """Restaura uma categoria deletada"""
     service = CategoryService(db, current_user.id)
-    category = service.restore_category(category_id)
+    category = await service.restore_category(category_id)
     if not category:
         raise HTTPException(status_code=404, detail="Categoria não encontrada")
     return category
\ No newline at end of file
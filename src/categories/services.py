@@ -1,63 +1,118 @@
 
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import and_, func, select
+from datetime import date, datetime, time, timedelta, timezone
 from typing import List, Optional
 from uuid import UUID
-from src.categories.models import CategoryCreate, CategoryUpdate, CategoryWithTransactionCount
+from src.categories.models import CategoryCreate, CategoryUpdate, CategoryWithStats, CategoryWithTransactionCount
 from src.database import Category, Transaction
+from src.money import from_cents
+
+# Projeção das colunas da categoria: as listagens não materializam objetos
+# ORM (nem os registram no identity map da sessão)
+CATEGORY_COLUMNS = tuple(Category.__table__.columns)
 
 class CategoryService:
-    def __init__(self, db: Session, user_id: UUID):
+    def __init__(self, db: AsyncSession, user_id: UUID):
         self.db = db
         self.user_id = user_id
     
-    def get_categories(self, include_inactive: bool = False, category_type: Optional[str] = None) -> List[CategoryWithTransactionCount]:
+    async def get_categories(self, include_inactive: bool = False, category_type: Optional[str] = None) -> List[CategoryWithTransactionCount]:
         """Lista categorias com contagem de transações"""
-        query = self.db.query(
-            Category,
+        query = select(
+            *CATEGORY_COLUMNS,
             func.count(Transaction.id).label('transaction_count')
-        ).outerjoin(Transaction, Category.id == Transaction.category_id)
+        ).outerjoin(
+            Transaction,
+            and_(Transaction.user_id == self.user_id, Category.id == Transaction.category_id)
+        )
         
         if not include_inactive:
-            query = query.filter(Category.is_active == True)
+            query = query.where(Category.is_active == True)
         
         # Filtrar por tipo se especificado
         if category_type:
-            query = query.filter(Category.type == category_type)
+            query = query.where(Category.type == category_type)
         
-        query = query.filter(Category.user_id == self.user_id)
+        query = query.where(Category.user_id == self.user_id)
         query = query.group_by(Category.id)
         query = query.order_by(Category.name)
         
-        results = query.all()
+        results = (await self.db.execute(query)).all()
+        
+        return [CategoryWithTransactionCount.model_validate(row) for row in results]
+    
+    async def get_category_stats(
+        self,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        category_type: Optional[str] = None,
+    ) -> List[CategoryWithStats]:
+        """
+        Estatísticas por categoria no período (datas inclusivas, em UTC)
+        
+        Contagem, soma e participação no total do mesmo tipo (receitas ou
+        despesas) saem de uma única query: o período entra na condição do
+        LEFT JOIN, para que categorias sem transações apareçam zeradas, e a
+        participação é uma window function sobre as somas agregadas.
+        """
+        join_condition = [Transaction.user_id == self.user_id, Category.id == Transaction.category_id]
+        if start_date:
+            join_condition.append(Transaction.created_at >= datetime.combine(start_date, time.min, timezone.utc))
+        if end_date:
+            join_condition.append(Transaction.created_at < datetime.combine(end_date + timedelta(days=1), time.min, timezone.utc))
+        
+        total_cents = func.coalesce(func.sum(Transaction.amount_cents), 0)
+        type_total = func.sum(func.sum(Transaction.amount_cents)).over(partition_by=Category.type)
+        query = select(
+            *CATEGORY_COLUMNS,
+            func.count(Transaction.id).label('transaction_count'),
+            total_cents.label('total_cents'),
+            func.coalesce(total_cents * 100.0 / func.nullif(type_total, 0), 0).label('percentage'),
+        ).outerjoin(
+            Transaction,
+            and_(*join_condition)
+        ).where(
+            Category.user_id == self.user_id,
+            Category.is_active == True
+        )
+        
+        if category_type:
+            query = query.where(Category.type == category_type)
+        
+        query = query.group_by(Category.id).order_by(Category.type, total_cents.desc(), Category.name)
         
-        categories = []
-        for category, transaction_count in results:
-            category_dict = category.__dict__.copy()
-            category_dict['transaction_count'] = transaction_count
-            categories.append(CategoryWithTransactionCount(**category_dict))
+        results = (await self.db.execute(query)).all()
         
-        return categories
+        stats = []
+        for row in results:
+            category = CategoryWithStats.model_validate(row)
+            category.total_amount = from_cents(row.total_cents)
+            category.percentage = round(category.percentage, 2)
+            stats.append(category)
+        return stats
     
-    def get_category(self, category_id: UUID) -> Optional[Category]:
+    async def get_category(self, category_id: UUID) -> Optional[Category]:
         """Obtém uma categoria específica"""
-        return self.db.query(Category).filter(
+        result = await self.db.execute(select(Category).where(
             and_(
                 Category.id == category_id,
                 Category.user_id == self.user_id,
                 Category.is_active == True
             )
-        ).first()
+        ))
+        return result.scalars().first()
     
-    def create_category(self, category_data: CategoryCreate) -> Category:
+    async def create_category(self, category_data: CategoryCreate) -> Category:
         """Cria uma nova categoria"""
         # Verificar se já existe categoria com mesmo nome
-        existing = self.db.query(Category).filter(
+        result = await self.db.execute(select(Category).where(
             and_(
                 Category.name == category_data.name,
                 Category.user_id == self.user_id
             )
-        ).first()
+        ))
+        existing = result.scalars().first()
         
         if existing:
             raise ValueError(f"Já existe uma categoria com o nome '{category_data.name}'")
@@ -68,26 +123,27 @@ class CategoryService:
         )
         
         self.db.add(category)
-        self.db.commit()
-        self.db.refresh(category)
+        await self.db.commit()
+        await self.db.refresh(category)
         
         return category
     
-    def update_category(self, category_id: UUID, category_data: CategoryUpdate) -> Optional[Category]:
+    async def update_category(self, category_id: UUID, category_data: CategoryUpdate) -> Optional[Category]:
         """Atualiza uma categoria"""
-        category = self.get_category(category_id)
+        category = await self.get_category(category_id)
         if not category:
             return None
         
         # Verificar se o novo nome já existe (se estiver sendo alterado)
         if category_data.name and category_data.name != category.name:
-            existing = self.db.query(Category).filter(
+            result = await self.db.execute(select(Category).where(
                 and_(
                     Category.name == category_data.name,
                     Category.user_id == self.user_id,
                     Category.id != category_id
                 )
-            ).first()
+            ))
+            existing = result.scalars().first()
             
             if existing:
                 raise ValueError(f"Já existe uma categoria com o nome '{category_data.name}'")
@@ -97,44 +153,48 @@ class CategoryService:
         for field, value in update_data.items():
             setattr(category, field, value)
         
-        self.db.commit()
-        self.db.refresh(category)
+        await self.db.commit()
+        await self.db.refresh(category)
         
         return category
     
-    def delete_category(self, category_id: UUID) -> bool:
+    async def delete_category(self, category_id: UUID) -> bool:
         """Soft delete de uma categoria"""
-        category = self.get_category(category_id)
+        category = await self.get_category(category_id)
         if not category:
             return False
         
         # Verificar se há transações usando esta categoria
-        transaction_count = self.db.query(Transaction).filter(
-            Transaction.category_id == category_id
-        ).count()
+        transaction_count = await self.db.scalar(
+            select(func.count()).select_from(Transaction).where(
+                Transaction.user_id == self.user_id,
+                Transaction.category_id == category_id
+            )
+        )
         
         if transaction_count > 0:
             raise ValueError(f"Não é possível deletar categoria com {transaction_count} transações")
         
         category.is_active = False
-        self.db.commit()
+        await self.db.commit()
         
         return True
     
-    def restore_category(self, category_id: UUID) -> Optional[Category]:
+    async def restore_category(self, category_id: UUID) -> Optional[Category]:
         """Restaura uma categoria deletada"""
-        category = self.db.query(Category).filter(
+        result = await self.db.execute(select(Category).where(
             and_(
                 Category.id == category_id,
                 Category.user_id == self.user_id
             )
-        ).first()
+        ))
+        category = result.scalars().first()
         
         if not category:
             return None
         
         category.is_active = True
-        self.db.commit()
-        self.db.refresh(category)
+        await self.db.commit()
+        await self.db.refresh(category)
         
         return category
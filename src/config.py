@@ -1,11 +1,13 @@
 import os
-from typing import Optional
-from supabase import create_client, Client
+from typing import TYPE_CHECKING, Optional
 from dotenv import load_dotenv
 
 # Carrega variáveis de ambiente do arquivo .env
 load_dotenv()
 
+if TYPE_CHECKING:
+    from supabase import Client
+
 class Settings:
     """Configurações da aplicação"""
     
@@ -19,6 +21,18 @@ class Settings:
     # Database
     DATABASE_URL: Optional[str] = os.getenv("DATABASE_URL")
     
+    # Pools de conexão (por engine e por worker)
+    DB_POOL_SIZE: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    DB_MAX_OVERFLOW: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    DB_POOL_TIMEOUT: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    DB_POOL_RECYCLE: int = int(os.getenv("DB_POOL_RECYCLE", "3600"))
+    DB_ECHO: bool = os.getenv("DB_ECHO", "false").lower() == "true"
+    
+    # Réplica de leitura (opcional) para as rotas GET
+    DATABASE_REPLICA_URL: Optional[str] = os.getenv("DATABASE_REPLICA_URL") or None
+    DB_REPLICA_MAX_LAG: float = float(os.getenv("DB_REPLICA_MAX_LAG", "5"))
+    DB_REPLICA_CHECK_INTERVAL: float = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "5"))
+    
     # API
     API_V1_STR: str = "/api/v1"
     PROJECT_NAME: str = "MyFinance"
@@ -26,6 +40,25 @@ class Settings:
     API_HOST: str = os.getenv("API_HOST", "0.0.0.0")
     DEBUG: bool = os.getenv("DEBUG", "True").lower() == "true"
     
+    # Paginação
+    TRANSACTIONS_PAGE_SIZE: int = int(os.getenv("TRANSACTIONS_PAGE_SIZE", "50"))
+    TRANSACTIONS_MAX_PAGE_SIZE: int = int(os.getenv("TRANSACTIONS_MAX_PAGE_SIZE", "500"))
+    
+    # Importação em lote
+    TRANSACTIONS_BULK_MAX_ITEMS: int = int(os.getenv("TRANSACTIONS_BULK_MAX_ITEMS", "5000"))
+    IMPORT_CHUNK_SIZE: int = int(os.getenv("IMPORT_CHUNK_SIZE", "1000"))
+    EXPORT_BATCH_SIZE: int = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+    
+    # Emails transacionais (outbox + dispatcher em segundo plano)
+    RESEND_API_KEY: str = os.getenv("RESEND_API_KEY", "")
+    RESEND_API_URL: str = os.getenv("RESEND_API_URL", "https://api.resend.com")
+    FRONTEND_URL: str = os.getenv("FRONTEND_URL", "http://localhost:5173")  # links dos emails
+    EMAIL_FROM: str = os.getenv("EMAIL_FROM", "MyFinance <onboarding@resend.dev>")
+    EMAIL_BATCH_SIZE: int = int(os.getenv("EMAIL_BATCH_SIZE", "50"))
+    EMAIL_DISPATCH_INTERVAL: float = float(os.getenv("EMAIL_DISPATCH_INTERVAL", "5"))
+    EMAIL_MAX_ATTEMPTS: int = int(os.getenv("EMAIL_MAX_ATTEMPTS", "8"))
+    EMAIL_RETRY_BASE_SECONDS: float = float(os.getenv("EMAIL_RETRY_BASE_SECONDS", "30"))
+    
     # CORS
     BACKEND_CORS_ORIGINS: list = [
         "http://localhost:3000",
@@ -38,6 +71,13 @@ class Settings:
     
     # Logs
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")  # json | text
+    # Amostragem de INFO/DEBUG por logger, ex.: "src.main=0.1" (1 a cada 10)
+    LOG_SAMPLING: str = os.getenv("LOG_SAMPLING", "")
+    
+    # Métricas internas (GET /internal/metrics exige o header X-Internal-Token;
+    # sem token configurado o endpoint fica desativado)
+    INTERNAL_METRICS_TOKEN: str = os.getenv("INTERNAL_METRICS_TOKEN", "")
     
     # Sentry
     SENTRY_DSN_BACKEND: str = os.getenv("SENTRY_DSN_BACKEND", "")
@@ -46,7 +86,7 @@ class Settings:
         self._supabase_client = None
     
     @property
-    def supabase_client(self) -> Client:
+    def supabase_client(self) -> "Client":
         """Retorna cliente do Supabase"""
         # Se já existe um cliente cached, retorna ele
         if self._supabase_client is not None:
@@ -60,7 +100,8 @@ class Settings:
                 f"para o ambiente '{self.ENVIRONMENT}'"
             )
         
-        # Cria e cache o cliente
+        # Cria e cache o cliente (o supabase é importado só aqui: é lento)
+        from supabase import create_client
         self._supabase_client = create_client(self.SUPABASE_URL, self.SUPABASE_ANON_KEY)
         return self._supabase_client
     
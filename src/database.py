@@ -3,10 +3,10 @@ Modelos SQLAlchemy para o banco de dados
 Baseados nos modelos Pydantic para integração com Alembic
 """
 from datetime import datetime
-from sqlalchemy import Column, String, Float, Text, DateTime, CheckConstraint, Index, ForeignKey, Boolean, Enum as SQLEnum
+from sqlalchemy import BigInteger, Column, String, Integer, Text, DateTime, CheckConstraint, Index, ForeignKey, Boolean, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from .custom_types import GUID as UUID
-from sqlalchemy.sql import func
+from sqlalchemy.sql import func, text
 from .database_sqlalchemy import Base
 import uuid
 from src.categories.models import CategoryType
@@ -29,31 +29,126 @@ class Category(Base):
     transactions = relationship("Transaction", back_populates="category")
 
 class Transaction(Base):
-    """Modelo SQLAlchemy para transações"""
+    """
+    Modelo SQLAlchemy para transações
+
+    No PostgreSQL a tabela é particionada por mês em created_at, com chave
+    primária (id, created_at); ver src/partitions.py. O mapeamento mantém
+    id como identidade, que continua único (UUID).
+    """
     __tablename__ = "transactions"
     
     id = Column(UUID, primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID, nullable=False)  # Dono da transação; todas as queries filtram por ele
     type = Column(String(10), nullable=False)
-    amount = Column(Float, nullable=False)
+    amount_cents = Column(BigInteger, nullable=False)  # Valor em centavos (ver src/money.py)
+    currency = Column(String(3), nullable=False, default="BRL", server_default="BRL")
     description = Column(Text, nullable=False)
     category_id = Column(UUID, ForeignKey("categories.id"), nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    created_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())  # Chave de partição
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     category = relationship("Category", back_populates="transactions")
 
     __table_args__ = (
         CheckConstraint("type IN ('income', 'expense')", name="check_transaction_type"),
-        CheckConstraint("amount > 0", name="check_amount_positive"),
+        CheckConstraint("amount_cents > 0", name="check_amount_cents_positive"),
+        CheckConstraint("currency IN ('BRL', 'USD', 'EUR', 'GBP')", name="check_transaction_currency"),
         CheckConstraint("length(description) >= 1", name="check_description_not_empty"),
         CheckConstraint("length(description) <= 500", name="check_description_length"),
-        Index("idx_transactions_type", "type"),
         Index("idx_transactions_created_at", "created_at"),
-        Index("idx_transactions_amount", "amount"),
+        Index("idx_transactions_user_created_at", user_id, created_at.desc()),
+        Index("idx_transactions_user_category", "user_id", "category_id"),
+    )
+    
+    def __repr__(self):
+        return f"<Transaction(id={self.id}, type={self.type}, amount_cents={self.amount_cents})>"
+
+class MonthlyTotal(Base):
+    """
+    Rollup mensal de transações por (usuário, mês, categoria, tipo)
+
+    Mantido incrementalmente pelos handlers de transação; pode haver mais
+    de uma linha por chave, por isso as leituras sempre usam SUM.
+    """
+    __tablename__ = "monthly_totals"
+    
+    id = Column(UUID, primary_key=True, default=uuid.uuid4)
+    user_id = Column(UUID, nullable=False)
+    month = Column(String(7), nullable=False)  # YYYY-MM no fuso do usuário
+    category_id = Column(UUID, ForeignKey("categories.id"), nullable=True)
+    type = Column(String(10), nullable=False)
+    total_cents = Column(BigInteger, nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    
+    __table_args__ = (
+        CheckConstraint("type IN ('income', 'expense')", name="check_monthly_total_type"),
+        Index("idx_monthly_totals_user_month", "user_id", "month"),
     )
     
     def __repr__(self):
-        return f"<Transaction(id={self.id}, type={self.type}, amount={self.amount})>"
+        return f"<MonthlyTotal(month={self.month}, type={self.type}, total_cents={self.total_cents})>"
+
+class EmailOutbox(Base):
+    """
+    Fila persistente de emails transacionais
+
+    As rotas apenas inserem a mensagem (na mesma transação da operação que
+    a originou); o EmailDispatcher envia em lotes, com novas tentativas.
+    """
+    __tablename__ = "email_outbox"
+    
+    id = Column(UUID, primary_key=True, default=uuid.uuid4)
+    to_email = Column(String(255), nullable=False)
+    subject = Column(String(255), nullable=False)
+    html = Column(Text, nullable=False)
+    status = Column(String(10), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+    
+    __table_args__ = (
+        CheckConstraint("status IN ('pending', 'sent', 'failed')", name="check_email_outbox_status"),
+        # Só as mensagens pendentes são consultadas pelo dispatcher
+        Index("idx_email_outbox_pending", "next_attempt_at", postgresql_where=text("status = 'pending'")),
+    )
+    
+    def __repr__(self):
+        return f"<EmailOutbox(id={self.id}, to_email={self.to_email}, status={self.status})>"
+
+class RefreshToken(Base):
+    """
+    Refresh tokens emitidos, guardados pelo hash SHA-256
+
+    Cada uso troca o token por um novo da mesma família (family_id, que é
+    também o sid dos access tokens da sessão). Reapresentar um token já
+    trocado revoga a família inteira.
+    """
+    __tablename__ = "refresh_tokens"
+
+    jti = Column(UUID, primary_key=True, default=uuid.uuid4)
+    family_id = Column(UUID, nullable=False)
+    user_id = Column(UUID, nullable=False)
+    token_hash = Column(String(64), nullable=False, unique=True)
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    revoked_at = Column(DateTime(timezone=True), nullable=True)
+    revoked_reason = Column(String(20), nullable=True)
+    replaced_by = Column(UUID, nullable=True)
+
+    __table_args__ = (
+        CheckConstraint("revoked_reason IN ('rotated', 'logout', 'reuse', 'deleted')", name="check_refresh_token_revoked_reason"),
+        Index("idx_refresh_tokens_family_id", "family_id"),
+        Index("idx_refresh_tokens_user_id", "user_id"),
+        # Reconstrução e sincronização do conjunto de revogados em memória
+        Index("idx_refresh_tokens_revoked_at", "revoked_at", postgresql_where=text("revoked_at IS NOT NULL")),
+    )
+
+    def __repr__(self):
+        return f"<RefreshToken(jti={self.jti}, user_id={self.user_id}, revoked_reason={self.revoked_reason})>"
 
 class UserProfile(Base):
     """Modelo SQLAlchemy para perfis de usuário"""
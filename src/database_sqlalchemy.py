@@ -2,14 +2,19 @@
 Configuração SQLAlchemy direta para Supabase
 Substitui o cliente Supabase por SQLAlchemy para operações de banco
 """
-from sqlalchemy import create_engine, text
+from typing import AsyncIterator, Dict, Optional
+from sqlalchemy import Select, create_engine, text
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.pool import StaticPool
 from .config import settings
+from .pool_metrics import InstrumentedAsyncAdaptedQueuePool, InstrumentedQueuePool, instrument_engine
 import logging
 import os
-from unittest.mock import Mock
+import time
 
 logger = logging.getLogger(__name__)
 
@@ -35,35 +40,203 @@ def get_database_url():
     
     return settings.DATABASE_URL
 
-# Engine SQLAlchemy
-engine = create_engine(
-    get_database_url(),
-    pool_size=5,           # Pool de conexões
-    max_overflow=10,       # Conexões extras permitidas
-    pool_pre_ping=True,    # Verifica conexão antes de usar
-    pool_recycle=3600,     # Recicla conexões a cada hora
-    echo=settings.DEBUG    # Log SQL em modo debug
+def get_async_database_url(database_url: str):
+    """Converte a URL do banco para o driver assíncrono (asyncpg / aiosqlite)"""
+    url = make_url(database_url)
+    backend = url.get_backend_name()
+    if backend == "postgresql":
+        query = dict(url.query)
+        # asyncpg não aceita sslmode; o dialeto traduz o parâmetro ssl
+        if "sslmode" in query:
+            query["ssl"] = query.pop("sslmode")
+        return url.set(drivername="postgresql+asyncpg", query=query)
+    if backend == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite")
+    return url
+
+DATABASE_URL = get_database_url()
+
+# Parâmetros dos pools (DB_POOL_*); cada worker abre até
+# DB_POOL_SIZE + DB_MAX_OVERFLOW conexões por engine
+POOL_OPTIONS = dict(
+    pool_size=settings.DB_POOL_SIZE,          # Conexões mantidas abertas
+    max_overflow=settings.DB_MAX_OVERFLOW,    # Conexões extras em picos
+    pool_timeout=settings.DB_POOL_TIMEOUT,    # Espera máxima por uma conexão livre
+    pool_recycle=settings.DB_POOL_RECYCLE,    # Recicla conexões mais antigas que isso
+    pool_pre_ping=True,                       # Verifica conexão antes de usar
+    echo=settings.DB_ECHO,                    # Log de todo SQL (independente de DEBUG)
 )
 
+# Engine SQLAlchemy
+engine = create_engine(DATABASE_URL, poolclass=InstrumentedQueuePool, **POOL_OPTIONS)
+
 # Sessão local
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Engine assíncrono para as rotas: as queries não bloqueiam o event loop
+async_engine = create_async_engine(
+    get_async_database_url(DATABASE_URL),
+    poolclass=InstrumentedAsyncAdaptedQueuePool,
+    **POOL_OPTIONS
+)
+
+# Telemetria dos pools, exposta em /internal/metrics
+pool_metrics = {
+    "sync": instrument_engine(engine, "sync"),
+    "async": instrument_engine(async_engine.sync_engine, "async"),
+}
+
+# expire_on_commit=False: atributos não são recarregados (com I/O implícito) após o commit
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+class RoutingSession(Session):
+    """
+    Sessão que lê da réplica e escreve no primário
+
+    Só SELECTs sem FOR UPDATE vão para a réplica. O primeiro comando que
+    vai ao primário (flush, DML, SQL textual, FOR UPDATE) fixa a sessão
+    nele: dali em diante a requisição lê o que acabou de escrever.
+    """
+    primary_engine: Engine = None
+    replica_engine: Engine = None
+
+    def get_bind(self, mapper=None, *, clause=None, **kw):
+        if (
+            not self.info.get("primary")
+            and not self._flushing
+            and isinstance(clause, Select)
+            and clause._for_update_arg is None
+        ):
+            return self.replica_engine
+        self.info["primary"] = True
+        return self.primary_engine
+
+def routing_sessionmaker(primary: AsyncEngine, replica: AsyncEngine) -> async_sessionmaker:
+    """Fábrica de AsyncSession com RoutingSession entre os dois engines"""
+    session_class = type("RoutingSession", (RoutingSession,), {
+        "primary_engine": primary.sync_engine,
+        "replica_engine": replica.sync_engine,
+    })
+    return async_sessionmaker(primary, sync_session_class=session_class, autoflush=False, expire_on_commit=False)
+
+class ReplicaMonitor:
+    """
+    Decide se as leituras podem ir para a réplica
+
+    O atraso de replicação é medido na própria réplica no máximo uma vez a
+    cada check_interval segundos; acima de max_lag, ou se a réplica não
+    responder, as leituras voltam ao primário até a próxima medição.
+    """
+
+    # Réplica em dia com o WAL recebido conta como atraso zero (sem escritas
+    # no primário, now() - pg_last_xact_replay_timestamp() só cresce)
+    LAG_QUERY = text(
+        "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+        "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) END"
+    )
+
+    def __init__(self, engine: AsyncEngine, max_lag: float, check_interval: float):
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.healthy = False
+        self.lag: Optional[float] = None
+        self._checked_at: Optional[float] = None
+        self._checking = False
+        self.replica_reads = 0
+        self.primary_fallbacks = 0
+        self.errors = 0
+
+    async def _measure(self) -> float:
+        async with self.engine.connect() as conn:
+            result = await conn.execute(self.LAG_QUERY)
+            return float(result.scalar() or 0)
+
+    async def _check(self) -> None:
+        self._checking = True
+        try:
+            self.lag = await self._measure()
+            self.healthy = self.lag <= self.max_lag
+            if not self.healthy:
+                logger.warning("Réplica atrasada %.1fs; leituras no primário", self.lag)
+        except Exception as e:
+            self.errors += 1
+            self.lag = None
+            self.healthy = False
+            logger.warning("Réplica indisponível; leituras no primário: %s", e)
+        finally:
+            self._checked_at = time.monotonic()
+            self._checking = False
+
+    async def use_replica(self) -> bool:
+        """True se a réplica estava em dia na última medição (refeita se vencida)"""
+        # Durante uma medição, as demais requisições usam o último resultado
+        if not self._checking and (
+            self._checked_at is None or time.monotonic() - self._checked_at >= self.check_interval
+        ):
+            await self._check()
+        if self.healthy:
+            self.replica_reads += 1
+        else:
+            self.primary_fallbacks += 1
+        return self.healthy
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "healthy": self.healthy,
+            "lag_seconds": self.lag,
+            "replica_reads": self.replica_reads,
+            "primary_fallbacks": self.primary_fallbacks,
+            "errors": self.errors,
+        }
+
+# Réplica de leitura opcional (DATABASE_REPLICA_URL); sem ela, tudo vai ao primário
+replica_async_engine = None
+ReplicaSessionLocal = None
+replica_monitor = None
+if settings.DATABASE_REPLICA_URL:
+    replica_async_engine = create_async_engine(
+        get_async_database_url(settings.DATABASE_REPLICA_URL),
+        poolclass=InstrumentedAsyncAdaptedQueuePool,
+        **POOL_OPTIONS
+    )
+    pool_metrics["replica"] = instrument_engine(replica_async_engine.sync_engine, "replica")
+    ReplicaSessionLocal = routing_sessionmaker(async_engine, replica_async_engine)
+    replica_monitor = ReplicaMonitor(
+        replica_async_engine, settings.DB_REPLICA_MAX_LAG, settings.DB_REPLICA_CHECK_INTERVAL
+    )
+
 # Base para modelos
 Base = declarative_base()
 
-# Engine para o banco de dados de teste em memória (SQLite)
-test_engine = create_engine(
-    "sqlite:///:memory:",
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
-TestSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=test_engine)
+# Sessões do banco de teste em memória (SQLite), criadas só no modo de
+# teste (TESTING=true): em produção nem o engine nem o aiosqlite são carregados
+_test_sessionmakers = None
+
+def get_test_sessionmakers():
+    """Retorna (sessionmaker, async_sessionmaker) do banco de teste em memória"""
+    global _test_sessionmakers
+    if _test_sessionmakers is None:
+        test_engine = create_engine(
+            "sqlite:///:memory:",
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+        test_async_engine = create_async_engine(
+            "sqlite+aiosqlite:///:memory:",
+            poolclass=StaticPool,
+        )
+        _test_sessionmakers = (
+            sessionmaker(autocommit=False, autoflush=False, bind=test_engine),
+            async_sessionmaker(test_async_engine, autoflush=False, expire_on_commit=False),
+        )
+    return _test_sessionmakers
 
 def get_db() -> Session:
     """Dependency para obter sessão do banco"""
     if os.getenv("TESTING") == "true":
         logger.info("Modo de teste detectado - usando banco de dados em memória")
-        db = TestSessionLocal()
+        db = get_test_sessionmakers()[0]()
         try:
             yield db
         finally:
@@ -76,6 +249,43 @@ def get_db() -> Session:
         finally:
             db.close()
 
+async def get_async_db() -> AsyncIterator[AsyncSession]:
+    """Dependency para obter sessão assíncrona do banco"""
+    if os.getenv("TESTING") == "true":
+        logger.info("Modo de teste detectado - usando banco de dados em memória")
+        session_factory = get_test_sessionmakers()[1]
+    else:
+        session_factory = AsyncSessionLocal
+    async with session_factory() as db:
+        yield db
+
+async def get_async_read_sessionmaker() -> async_sessionmaker:
+    """
+    Dependency que devolve a fábrica de sessões de leitura: da réplica, se
+    configurada e em dia
+
+    Para respostas em streaming, que abrem a sessão dentro do gerador: a
+    partir do FastAPI 0.106 as dependências com yield são encerradas antes
+    de o corpo da resposta ser enviado, e uma sessão de get_async_read_db
+    já estaria fechada.
+    """
+    if os.getenv("TESTING") == "true":
+        logger.info("Modo de teste detectado - usando banco de dados em memória")
+        return get_test_sessionmakers()[1]
+    if replica_monitor is not None and await replica_monitor.use_replica():
+        return ReplicaSessionLocal
+    return AsyncSessionLocal
+
+async def get_async_read_db() -> AsyncIterator[AsyncSession]:
+    """
+    Dependency para rotas de leitura: lê da réplica, se configurada e em dia
+
+    Escritas feitas pela mesma sessão continuam indo ao primário (RoutingSession).
+    """
+    session_factory = await get_async_read_sessionmaker()
+    async with session_factory() as db:
+        yield db
+
 def create_tables():
     """Cria todas as tabelas definidas nos modelos"""
     try:
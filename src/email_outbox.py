@@ -0,0 +1,305 @@
+"""
+Outbox de emails transacionais e dispatcher assíncrono
+
+As rotas apenas inserem a mensagem em email_outbox, na mesma transação
+da operação que a originou, e acordam o dispatcher. O dispatcher roda
+no event loop da aplicação: reivindica lotes de mensagens vencidas,
+envia cada lote em uma única chamada à API de batch do Resend usando um
+httpx.AsyncClient compartilhado (conexões keep-alive) e reagenda falhas
+com backoff exponencial. Um lote recusado por uma mensagem inválida é
+dividido até isolá-la; só ela falha.
+
+A entrega é "pelo menos uma vez": a mensagem reivindicada ganha um
+prazo (lease); se o processo cair durante o envio, ela volta a vencer e
+é reenviada.
+"""
+import asyncio
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import TYPE_CHECKING, List, NamedTuple, Optional, Tuple
+from uuid import UUID, uuid4
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from .config import settings
+from .database import EmailOutbox
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = logging.getLogger(__name__)
+
+# Tempo durante o qual uma mensagem reivindicada não é pega de novo
+CLAIM_LEASE = timedelta(minutes=5)
+
+# Intervalo máximo entre tentativas
+MAX_RETRY_DELAY = timedelta(hours=1)
+
+# Limite de mensagens por chamada de /emails/batch do Resend
+RESEND_BATCH_LIMIT = 100
+
+# Status com que o Resend recusa um lote por conteúdo inválido; o lote
+# inteiro é recusado, sem envio. Os demais erros (autenticação, 429, 5xx,
+# transporte) não dependem das mensagens e valem para o lote todo
+REJECTED_STATUSES = {400, 422}
+
+
+def enqueue_email(db: Session, to_email: str, subject: str, html: str) -> EmailOutbox:
+    """
+    Adiciona um email à outbox, sem commit
+
+    O commit fica com quem chama, junto com a operação que gerou o email;
+    depois dele, notify_dispatcher() antecipa o envio.
+    """
+    message = EmailOutbox(
+        id=uuid4(),
+        to_email=to_email,
+        subject=subject,
+        html=html,
+        status="pending",
+        attempts=0,
+        next_attempt_at=datetime.now(timezone.utc),
+    )
+    db.add(message)
+    return message
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Backoff exponencial a partir de EMAIL_RETRY_BASE_SECONDS, limitado a 1 hora"""
+    delay = timedelta(seconds=settings.EMAIL_RETRY_BASE_SECONDS * 2 ** max(attempts - 1, 0))
+    return min(delay, MAX_RETRY_DELAY)
+
+
+@dataclass
+class _ClaimedEmail:
+    id: UUID
+    to_email: str
+    subject: str
+    html: str
+    attempts: int
+
+
+class _Outcome(NamedTuple):
+    """Resultado do envio de uma mensagem"""
+    email: _ClaimedEmail
+    error: Optional[str] = None
+    # Recusada pela API: não adianta tentar de novo
+    rejected: bool = False
+
+
+class EmailDispatcher:
+    """Envia as mensagens pendentes da outbox em lotes, em segundo plano"""
+
+    def __init__(
+        self,
+        session_factory=None,
+        api_key: Optional[str] = None,
+        base_url: Optional[str] = None,
+        sender: Optional[str] = None,
+        batch_size: Optional[int] = None,
+        interval: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        transport: Optional["httpx.AsyncBaseTransport"] = None,
+    ):
+        """
+        Args:
+            session_factory: Fábrica de AsyncSession (padrão: AsyncSessionLocal)
+            api_key: Chave da API do Resend (RESEND_API_KEY)
+            base_url: URL da API (RESEND_API_URL); aponte para um stub local em testes
+            sender: Remetente (EMAIL_FROM)
+            batch_size: Mensagens por lote (EMAIL_BATCH_SIZE, até 100)
+            interval: Segundos entre verificações sem notificação (EMAIL_DISPATCH_INTERVAL)
+            max_attempts: Tentativas antes de marcar como failed (EMAIL_MAX_ATTEMPTS)
+            transport: Transporte httpx alternativo (ex.: ASGITransport nos testes)
+        """
+        if session_factory is None:
+            from .database_sqlalchemy import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+        self.session_factory = session_factory
+        self.api_key = api_key or settings.RESEND_API_KEY
+        self.base_url = base_url or settings.RESEND_API_URL
+        self.sender = sender or settings.EMAIL_FROM
+        self.batch_size = min(batch_size or settings.EMAIL_BATCH_SIZE, RESEND_BATCH_LIMIT)
+        self.interval = interval or settings.EMAIL_DISPATCH_INTERVAL
+        self.max_attempts = max_attempts or settings.EMAIL_MAX_ATTEMPTS
+        self._transport = transport
+        self._client: Optional["httpx.AsyncClient"] = None
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self.sent = 0
+        self.failed = 0
+
+    async def start(self) -> None:
+        """Cria o cliente HTTP compartilhado e inicia o loop de envio"""
+        # httpx só é carregado com o envio de emails configurado
+        import httpx
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            timeout=httpx.Timeout(10.0),
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=5),
+            transport=self._transport,
+        )
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Interrompe o loop após o lote em andamento e fecha o cliente HTTP"""
+        self._stopping = True
+        self._wakeup.set()
+        if self._task:
+            await self._task
+            self._task = None
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+
+    def wake(self) -> None:
+        """Antecipa a próxima verificação (chamado após enfileirar)"""
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                claimed = await self.dispatch_once()
+            except Exception as e:
+                logger.error("Erro no envio de emails da outbox: %s", e)
+                claimed = 0
+            # Lote cheio: provavelmente há mais mensagens vencidas
+            if claimed >= self.batch_size:
+                continue
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    async def dispatch_once(self) -> int:
+        """Reivindica, envia e registra um lote; retorna o tamanho do lote"""
+        async with self.session_factory() as db:
+            batch = await self._claim(db)
+        if not batch:
+            return 0
+
+        outcomes = await self._send(batch)
+
+        async with self.session_factory() as db:
+            await self._record(db, outcomes)
+        return len(batch)
+
+    async def _claim(self, db) -> List[_ClaimedEmail]:
+        now = datetime.now(timezone.utc)
+        # SKIP LOCKED: vários workers podem despachar sem pegar a mesma mensagem
+        statement = (
+            select(EmailOutbox)
+            .where(EmailOutbox.status == "pending", EmailOutbox.next_attempt_at <= now)
+            .order_by(EmailOutbox.next_attempt_at)
+            .limit(self.batch_size)
+            .with_for_update(skip_locked=True)
+        )
+        messages = (await db.scalars(statement)).all()
+        batch = []
+        for message in messages:
+            message.attempts += 1
+            message.next_attempt_at = now + CLAIM_LEASE
+            batch.append(_ClaimedEmail(message.id, message.to_email, message.subject, message.html, message.attempts))
+        await db.commit()
+        return batch
+
+    async def _post_batch(self, batch: List[_ClaimedEmail]) -> Optional[Tuple[str, bool]]:
+        """Uma chamada a /emails/batch; retorna (erro, lote recusado), se houver erro"""
+        import httpx
+        payload = [
+            {"from": self.sender, "to": [email.to_email], "subject": email.subject, "html": email.html}
+            for email in batch
+        ]
+        try:
+            response = await self._client.post("/emails/batch", json=payload)
+        except httpx.HTTPError as e:
+            return f"{type(e).__name__}: {e}", False
+        if response.status_code >= 300:
+            return f"HTTP {response.status_code}: {response.text[:500]}", response.status_code in REJECTED_STATUSES
+        return None
+
+    async def _send(self, batch: List[_ClaimedEmail]) -> List[_Outcome]:
+        """
+        Envia o lote e retorna o resultado de cada mensagem
+
+        Se o lote é recusado por conteúdo inválido, cada metade é reenviada
+        em separado até isolar as mensagens recusadas: as demais seguem, em
+        O(k log n) requisições para k mensagens inválidas.
+        """
+        failure = await self._post_batch(batch)
+        if failure is None:
+            return [_Outcome(email) for email in batch]
+        error, rejected = failure
+        if rejected and len(batch) > 1:
+            middle = len(batch) // 2
+            return await self._send(batch[:middle]) + await self._send(batch[middle:])
+        return [_Outcome(email, error, rejected) for email in batch]
+
+    async def _record(self, db, outcomes: List[_Outcome]) -> None:
+        now = datetime.now(timezone.utc)
+        sent = [outcome.email.id for outcome in outcomes if outcome.error is None]
+        if sent:
+            await db.execute(
+                update(EmailOutbox)
+                .where(EmailOutbox.id.in_(sent))
+                .values(status="sent", sent_at=now, last_error=None)
+            )
+            self.sent += len(sent)
+            logger.info("Outbox: %s emails enviados", len(sent))
+
+        for email, error, rejected in outcomes:
+            if error is None:
+                continue
+            values = {"last_error": error}
+            if rejected or email.attempts >= self.max_attempts:
+                values["status"] = "failed"
+                self.failed += 1
+            else:
+                values["next_attempt_at"] = now + retry_delay(email.attempts)
+            await db.execute(update(EmailOutbox).where(EmailOutbox.id == email.id).values(**values))
+            if rejected:
+                logger.warning("Outbox: email %s recusado pela API: %s", email.id, error)
+
+        retried = [outcome for outcome in outcomes if outcome.error is not None and not outcome.rejected]
+        if retried:
+            logger.warning("Outbox: falha ao enviar %s emails: %s", len(retried), retried[0].error)
+        await db.commit()
+
+    def stats(self) -> dict:
+        return {"running": self._task is not None, "sent": self.sent, "failed": self.failed}
+
+
+# Dispatcher do processo, iniciado no lifespan da aplicação
+_dispatcher: Optional[EmailDispatcher] = None
+
+
+async def start_email_dispatcher() -> Optional[EmailDispatcher]:
+    """Inicia o dispatcher, se o envio de emails estiver configurado"""
+    global _dispatcher
+    if not settings.RESEND_API_KEY:
+        logger.warning("RESEND_API_KEY não configurada - envio de emails desativado")
+        return None
+    _dispatcher = EmailDispatcher()
+    await _dispatcher.start()
+    return _dispatcher
+
+
+async def stop_email_dispatcher() -> None:
+    global _dispatcher
+    if _dispatcher is not None:
+        await _dispatcher.stop()
+        _dispatcher = None
+
+
+def notify_dispatcher() -> None:
+    """Acorda o dispatcher do processo, se estiver rodando"""
+    if _dispatcher is not None:
+        _dispatcher.wake()
+
+
+def dispatcher_stats() -> Optional[dict]:
+    return _dispatcher.stats() if _dispatcher is not None else None
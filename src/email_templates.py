@@ -0,0 +1,129 @@
+"""
+Templates dos emails transacionais
+
+Os templates são compilados uma única vez na importação (string.Template);
+cada envio apenas substitui os valores, escapados para HTML.
+"""
+from html import escape
+from string import Template
+from typing import Tuple
+from urllib.parse import urlencode
+
+WELCOME_SUBJECT = "Bem-vindo ao MyFinance! 🎉"
+RECOVERY_SUBJECT = "🔐 Recuperação de Senha - MyFinance"
+
+_WELCOME = Template("""\
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Bem-vindo ao MyFinance</title>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+        .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }
+        .button { display: inline-block; background: #667eea; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; margin: 20px 0; }
+        .footer { text-align: center; margin-top: 30px; color: #666; font-size: 14px; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🎉 Bem-vindo ao MyFinance!</h1>
+        </div>
+        <div class="content">
+            <h2>Olá, $full_name!</h2>
+            <p>Seu cadastro foi realizado com sucesso no MyFinance.</p>
+            <p>Você já pode acessar sua conta e começar a gerenciar suas finanças!</p>
+
+            <div style="text-align: center;">
+                <a href="$app_url" class="button">Acessar MyFinance</a>
+            </div>
+
+            <p><strong>Dicas para começar:</strong></p>
+            <ul>
+                <li>Configure suas categorias de gastos</li>
+                <li>Adicione suas primeiras transações</li>
+                <li>Visualize seus relatórios financeiros</li>
+            </ul>
+
+            <p>Se você tiver alguma dúvida, não hesite em entrar em contato conosco.</p>
+
+            <p>Atenciosamente,<br>Equipe MyFinance</p>
+        </div>
+        <div class="footer">
+            <p>Este é um email automático, não responda a esta mensagem.</p>
+            <p>© 2024 MyFinance. Todos os direitos reservados.</p>
+        </div>
+    </div>
+</body>
+</html>
+""")
+
+_RECOVERY = Template("""\
+<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Recuperação de Senha - MyFinance</title>
+    <style>
+        body { font-family: Arial, sans-serif; line-height: 1.6; color: #333; }
+        .container { max-width: 600px; margin: 0 auto; padding: 20px; }
+        .header { background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 30px; text-align: center; border-radius: 10px 10px 0 0; }
+        .content { background: #f9f9f9; padding: 30px; border-radius: 0 0 10px 10px; }
+        .button { display: inline-block; background: #667eea; color: white; padding: 12px 30px; text-decoration: none; border-radius: 5px; margin: 20px 0; }
+        .footer { text-align: center; margin-top: 30px; color: #666; font-size: 14px; }
+        .warning { background: #fff3cd; border: 1px solid #ffeaa7; padding: 15px; border-radius: 5px; margin: 20px 0; }
+    </style>
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1>🔐 Recuperação de Senha</h1>
+        </div>
+        <div class="content">
+            <h2>Olá, $full_name!</h2>
+            <p>Recebemos uma solicitação para redefinir sua senha no MyFinance.</p>
+
+            <div style="text-align: center;">
+                <a href="$reset_url" class="button">Redefinir Senha</a>
+            </div>
+
+            <div class="warning">
+                <strong>⚠️ Importante:</strong>
+                <ul>
+                    <li>Este link é válido por 24 horas</li>
+                    <li>Se você não solicitou esta recuperação, ignore este email</li>
+                    <li>Nunca compartilhe este link com outras pessoas</li>
+                </ul>
+            </div>
+
+            <p>Se o botão não funcionar, copie e cole este link no seu navegador:</p>
+            <p style="word-break: break-all; background: #f8f9fa; padding: 10px; border-radius: 5px; font-family: monospace; font-size: 12px;">
+                $reset_url
+            </p>
+
+            <p>Atenciosamente,<br>Equipe MyFinance</p>
+        </div>
+        <div class="footer">
+            <p>Este é um email automático, não responda a esta mensagem.</p>
+            <p>© 2024 MyFinance. Todos os direitos reservados.</p>
+        </div>
+    </div>
+</body>
+</html>
+""")
+
+
+def render_welcome_email(full_name: str, app_url: str) -> Tuple[str, str]:
+    """Retorna (assunto, HTML) do email de boas-vindas"""
+    html = _WELCOME.substitute(full_name=escape(full_name or ""), app_url=escape(app_url))
+    return WELCOME_SUBJECT, html
+
+
+def render_recovery_email(full_name: str, app_url: str, email: str, token: str) -> Tuple[str, str]:
+    """Retorna (assunto, HTML) do email de recuperação de senha"""
+    reset_url = f"{app_url}/auth/reset-password?{urlencode({'token': token, 'email': email})}"
+    html = _RECOVERY.substitute(full_name=escape(full_name or ""), reset_url=escape(reset_url))
+    return RECOVERY_SUBJECT, html
@@ -0,0 +1,92 @@
+"""
+Exportação de transações em streaming (CSV / NDJSON)
+
+As linhas são lidas com AsyncSession.stream e yield_per (cursor do lado
+do servidor no PostgreSQL) e serializadas em lotes à medida que chegam do
+banco, sem carregar o histórico inteiro nem popular o identity map da
+sessão.
+"""
+import csv
+import io
+import json
+from typing import AsyncIterator
+from uuid import UUID
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from .database import Category, Transaction as TransactionModel
+from .filters import apply_transaction_filters
+from .models import TransactionFilters
+from .money import from_cents
+
+EXPORT_FORMATS = {
+    "csv": "text/csv",
+    "ndjson": "application/x-ndjson",
+}
+
+EXPORT_COLUMNS = ("id", "created_at", "type", "amount", "currency", "description", "category_id", "category_name")
+# Posição de amount: a coluna do banco é amount_cents e sai convertida
+AMOUNT_POSITION = EXPORT_COLUMNS.index("amount")
+
+
+def _export_statement(user_id: UUID, filters: TransactionFilters):
+    """SELECT apenas das colunas exportadas do usuário, em ordem cronológica"""
+    statement = (
+        select(
+            TransactionModel.id,
+            TransactionModel.created_at,
+            TransactionModel.type,
+            TransactionModel.amount_cents,
+            TransactionModel.currency,
+            TransactionModel.description,
+            TransactionModel.category_id,
+            Category.name,
+        )
+        .outerjoin(Category, TransactionModel.category_id == Category.id)
+        .where(TransactionModel.user_id == user_id)
+        .order_by(TransactionModel.created_at, TransactionModel.id)
+    )
+    return apply_transaction_filters(statement, filters)
+
+
+def _serialize(value):
+    if value is None:
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, (int, float, str)):
+        return value
+    return str(value)
+
+
+async def iter_export(db: AsyncSession, user_id: UUID, filters: TransactionFilters, fmt: str, batch_size: int) -> AsyncIterator[str]:
+    """
+    Gera o conteúdo da exportação em pedaços de até batch_size linhas
+
+    O cabeçalho do CSV é emitido antes da consulta, para que a resposta
+    comece a ser enviada imediatamente.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Formato não suportado: {fmt}")
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer:
+        writer.writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue()
+
+    result = await db.stream(_export_statement(user_id, filters).execution_options(yield_per=batch_size))
+    try:
+        async for partition in result.partitions():
+            buffer.seek(0)
+            buffer.truncate()
+            for row in partition:
+                values = [_serialize(value) for value in row]
+                values[AMOUNT_POSITION] = from_cents(row[AMOUNT_POSITION])
+                if writer:
+                    writer.writerow(values)
+                else:
+                    buffer.write(json.dumps(dict(zip(EXPORT_COLUMNS, values)), ensure_ascii=False))
+                    buffer.write("\n")
+            yield buffer.getvalue()
+    finally:
+        await result.close()
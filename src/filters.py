@@ -0,0 +1,59 @@
+"""
+Filtros de transações compilados em predicados SQL
+
+Espelha os AdvancedFilters do frontend (período, categorias, faixa de
+valor e tipo) como query parameters da API.
+"""
+from datetime import datetime
+from typing import List, Optional
+from uuid import UUID
+from fastapi import HTTPException, Query
+from .models import TransactionFilters, TransactionType
+from .database import Transaction as TransactionModel
+from .money import to_cents
+
+
+def get_transaction_filters(
+    start_date: Optional[datetime] = Query(None, description="Data inicial (inclusiva)"),
+    end_date: Optional[datetime] = Query(None, description="Data final (inclusiva)"),
+    category_id: Optional[List[UUID]] = Query(None, description="Filtra por uma ou mais categorias"),
+    min_amount: Optional[float] = Query(None, ge=0, description="Valor mínimo"),
+    max_amount: Optional[float] = Query(None, ge=0, description="Valor máximo"),
+    type: Optional[TransactionType] = Query(None, description="Tipo da transação: income ou expense"),
+) -> TransactionFilters:
+    """Dependency que converte os query parameters em TransactionFilters"""
+    if start_date and end_date and start_date > end_date:
+        raise HTTPException(status_code=422, detail="start_date deve ser anterior a end_date")
+    if min_amount is not None and max_amount is not None and min_amount > max_amount:
+        raise HTTPException(status_code=422, detail="min_amount deve ser menor ou igual a max_amount")
+
+    return TransactionFilters(
+        start_date=start_date,
+        end_date=end_date,
+        category_ids=category_id or [],
+        min_amount=min_amount,
+        max_amount=max_amount,
+        type=type,
+    )
+
+
+def apply_transaction_filters(query, filters: TransactionFilters):
+    """
+    Aplica os filtros a uma query de transações
+
+    Cada filtro vira um predicado sargável; combinado com o filtro por
+    usuário, usa idx_transactions_user_created_at e idx_transactions_user_category.
+    """
+    if filters.type:
+        query = query.filter(TransactionModel.type == filters.type.value)
+    if filters.category_ids:
+        query = query.filter(TransactionModel.category_id.in_(filters.category_ids))
+    if filters.start_date:
+        query = query.filter(TransactionModel.created_at >= filters.start_date)
+    if filters.end_date:
+        query = query.filter(TransactionModel.created_at <= filters.end_date)
+    if filters.min_amount is not None:
+        query = query.filter(TransactionModel.amount_cents >= to_cents(filters.min_amount))
+    if filters.max_amount is not None:
+        query = query.filter(TransactionModel.amount_cents <= to_cents(filters.max_amount))
+    return query
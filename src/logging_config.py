@@ -0,0 +1,235 @@
+"""
+Logging estruturado e não bloqueante
+
+As rotas apenas enfileiram o LogRecord: um QueueHandler no logger raiz
+coloca o registro em uma fila em memória e um QueueListener, em thread
+própria, formata (JSON, uma linha por evento) e escreve na saída. A
+interpolação da mensagem também fica para a thread do listener: chame o
+logger com argumentos (logger.info("Transação criada: %s", id)), nunca
+com f-strings.
+
+Ainda na thread da requisição rodam apenas dois filtros baratos: o que
+anexa o request id da requisição corrente (contextvar preenchida pelo
+RequestIdMiddleware) e a amostragem por logger das linhas INFO/DEBUG
+mais frequentes (LOG_SAMPLING).
+"""
+import atexit
+import itertools
+import json
+import logging
+import queue
+import sys
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+# Request id da requisição em andamento ("-" fora de requisições)
+request_id_var: ContextVar[str] = ContextVar("request_id", default="-")
+
+REQUEST_ID_HEADER = "x-request-id"
+
+# Atributos padrão do LogRecord; os demais vieram de extra= e vão para o JSON
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "request_id"}
+
+
+def parse_sampling(spec: str) -> Dict[str, float]:
+    """
+    Converte "logger=taxa,..." (ex.: "src.main=0.1") em {logger: taxa}
+
+    Raises:
+        ValueError: Se o formato ou a taxa forem inválidos
+    """
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        try:
+            name, rate = item.split("=", 1)
+            rate = float(rate)
+        except ValueError:
+            raise ValueError(f"Amostragem inválida '{item}': use logger=taxa, ex.: src.main=0.1")
+        if not 0 < rate <= 1:
+            raise ValueError(f"Amostragem inválida '{item}': a taxa deve estar em (0, 1]")
+        rates[name.strip()] = rate
+    return rates
+
+
+class RequestIdFilter(logging.Filter):
+    """Anexa ao registro o request id da requisição corrente"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = request_id_var.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Mantém 1 a cada N registros INFO/DEBUG dos loggers configurados
+
+    A taxa de um logger vale para seus filhos ("src.auth" cobre
+    "src.auth.service"). WARNING ou acima sempre passam.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+        self._counters: Dict[str, "itertools.count"] = {}
+        self._intervals: Dict[str, int] = {}
+        self.dropped = 0
+
+    def _interval(self, name: str) -> int:
+        interval = self._intervals.get(name)
+        if interval is None:
+            interval = 1
+            # Prefixo mais específico configurado
+            for prefix in sorted(self.rates, key=len, reverse=True):
+                if name == prefix or name.startswith(prefix + "."):
+                    interval = max(1, round(1 / self.rates[prefix]))
+                    break
+            self._intervals[name] = interval
+            self._counters[name] = itertools.count()
+        return interval
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or not self.rates:
+            return True
+        interval = self._interval(record.name)
+        if interval == 1 or next(self._counters[record.name]) % interval == 0:
+            return True
+        self.dropped += 1
+        return False
+
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por registro, com os campos de extra= incluídos"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "request_id": getattr(record, "request_id", "-"),
+        }
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler que não formata na thread de quem loga
+
+    O QueueHandler padrão interpola a mensagem e formata a exceção em
+    prepare(), ainda na thread da requisição. Aqui o registro vai para a
+    fila como está; por isso os argumentos não devem ser alterados depois
+    de logados (passe valores, não objetos que a rota continue mudando).
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+_listener: Optional[QueueListener] = None
+_sampling: Optional[SamplingFilter] = None
+
+
+def setup_logging(level: str = "INFO", fmt: str = "json", sampling: str = "") -> Optional[QueueListener]:
+    """
+    Configura o logger raiz com fila e listener em segundo plano
+
+    Como logging.basicConfig, não faz nada se o logger raiz já tiver
+    handlers (configurados pelo servidor ou pelo pytest, por exemplo).
+
+    Args:
+        level: Nível do logger raiz (LOG_LEVEL)
+        fmt: "json" ou "text" (LOG_FORMAT)
+        sampling: Taxas por logger para INFO/DEBUG (LOG_SAMPLING)
+
+    Returns:
+        O QueueListener iniciado, ou None se nada foi configurado
+    """
+    global _listener, _sampling
+    root = logging.getLogger()
+    if root.handlers:
+        return None
+
+    output = logging.StreamHandler(sys.stderr)
+    if fmt == "json":
+        output.setFormatter(JsonFormatter())
+    else:
+        output.setFormatter(logging.Formatter(
+            "%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s"
+        ))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    handler = DeferredQueueHandler(log_queue)
+    handler.addFilter(RequestIdFilter())
+    _sampling = SamplingFilter(parse_sampling(sampling))
+    handler.addFilter(_sampling)
+
+    root.setLevel(getattr(logging, level.upper(), logging.INFO))
+    root.addHandler(handler)
+
+    _listener = QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    # Esvazia a fila ao encerrar o processo
+    atexit.register(stop_logging)
+    return _listener
+
+
+def stop_logging() -> None:
+    """Para o listener após escrever os registros pendentes"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def logging_stats() -> Dict[str, int]:
+    return {"sampled_out": _sampling.dropped if _sampling is not None else 0}
+
+
+class RequestIdMiddleware:
+    """
+    Middleware ASGI que define o request id de cada requisição HTTP
+
+    Reaproveita o header X-Request-ID recebido (ex.: do proxy) ou gera um
+    novo, disponibiliza em request_id_var para os logs e devolve no
+    header da resposta.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:128]
+                break
+        request_id = request_id or uuid.uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((REQUEST_ID_HEADER.encode("latin-1"), request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(token)
@@ -1,29 +1,45 @@
-from fastapi import FastAPI, status, HTTPException, Depends
-from typing import List
+from fastapi import FastAPI, status, HTTPException, Depends, Header, Query, Body, File, UploadFile
+from fastapi.responses import StreamingResponse
+from typing import Any, List, Optional
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import joinedload
+from sqlalchemy import select, text, tuple_
 from .config import settings
-from .models import TransactionCreate, Transaction, TransactionList, TransactionUpdate
-from .database_sqlalchemy import get_db, create_tables, test_connection
-from .database import Transaction as TransactionModel
+from .models import TransactionCreate, Transaction, TransactionList, TransactionUpdate, TransactionPage, TransactionFilters, TransactionSummary, TransactionBulkResult
+from .pagination import encode_cursor, decode_cursor, InvalidCursorError
+from .filters import get_transaction_filters, apply_transaction_filters
+from .database_sqlalchemy import get_async_db, get_async_read_db, get_async_read_sessionmaker, replica_monitor, pool_metrics
+from .database import Category, Transaction as TransactionModel
 from .auth import auth_router
+from .auth.dependencies import get_current_user, init_auth_service, close_auth_service, auth_rate_limiter, token_cache, profile_cache_stats
+from .auth.revocation import revocation_store, start_revocation_sync, stop_revocation_sync
+from .auth.models import User
+from .summary import summarize_from_rollup, get_user_timezone, get_user_currency, check_user_currency
+from .bulk import bulk_create_transactions
+from .export import EXPORT_FORMATS, iter_export
+from .statement_import import SUPPORTED_FORMATS, StatementParseError, detect_format, import_statement_async, iter_statement_rows
+from .rollup import record_created, record_updated, record_deleted, rollup_timezone, transaction_key
 from .categories import routes as category_router
+from .email_outbox import start_email_dispatcher, stop_email_dispatcher, dispatcher_stats
+from .logging_config import RequestIdMiddleware, logging_stats, setup_logging
+import codecs
+from contextlib import asynccontextmanager
+import io
+import json
+import secrets
 import uuid
 from datetime import datetime
 import logging
 import os
-import sentry_sdk
 
-# Configuração de logging
-logging.basicConfig(
-    level=getattr(logging, settings.LOG_LEVEL),
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-)
+# Configuração de logging: JSON, escrita por um listener em segundo plano
+setup_logging(settings.LOG_LEVEL, settings.LOG_FORMAT, settings.LOG_SAMPLING)
 logger = logging.getLogger(__name__)
 
-# Inicialização do Sentry
+# Inicialização do Sentry (importado só quando configurado)
 if settings.SENTRY_DSN_BACKEND:
+    import sentry_sdk
     logger.info("Inicializando Sentry para monitoramento de erros")
     sentry_sdk.init(
         dsn=settings.SENTRY_DSN_BACKEND,
@@ -34,13 +50,35 @@ if settings.SENTRY_DSN_BACKEND:
         profiles_sample_rate=1.0,
         environment=settings.ENVIRONMENT,
     )
-    logger.info(f"Sentry inicializado com sucesso no ambiente: {settings.ENVIRONMENT}")
+    logger.info("Sentry inicializado com sucesso no ambiente: %s", settings.ENVIRONMENT)
 else:
     logger.warning("Variável SENTRY_DSN_BACKEND não configurada. Monitoramento de erros desativado.")
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Ciclo de vida da aplicação: recursos compartilhados entre requisições
+    
+    O boot não testa a conexão nem cria tabelas: o schema é responsabilidade
+    das migrações do Alembic e as conexões são abertas sob demanda pelo pool.
+    """
+    try:
+        init_auth_service()
+    except Exception as e:
+        # Sem Supabase configurado, as rotas de autenticação falham por requisição
+        logger.warning("Serviço de autenticação não inicializado: %s", e)
+    await start_revocation_sync()
+    await start_email_dispatcher()
+    yield
+    await stop_email_dispatcher()
+    await stop_revocation_sync()
+    close_auth_service()
+    logger.info("Aplicação finalizada")
+
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    debug=settings.DEBUG
+    debug=settings.DEBUG,
+    lifespan=lifespan
 )
 
 # Permitir CORS para facilitar o desenvolvimento
@@ -52,6 +90,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request id por requisição (header X-Request-ID), anexado aos logs
+app.add_middleware(RequestIdMiddleware)
+
 # Incluir rotas de autenticação
 app.include_router(auth_router)
 app.include_router(category_router.router)
@@ -66,53 +107,85 @@ async def trigger_error():
         division_by_zero = 1 / 0
         return {"message": "Este código nunca será executado"}
     except Exception as e:
-        logger.error(f"Erro capturado: {str(e)}")
+        logger.error("Erro capturado: %s", e)
         # O Sentry capturará automaticamente esta exceção
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Erro de teste gerado com sucesso e enviado ao Sentry"
         )
 
-@app.on_event("startup")
-async def startup_event():
-    """Evento executado na inicialização da aplicação"""
+async def _load_transaction(db: AsyncSession, user_id, transaction_id, for_update: bool = False):
+    """
+    Busca uma transação do usuário com a categoria já carregada (sem lazy load na serialização)
+
+    Com for_update, a linha fica travada até o commit: quem vai alterá-la
+    calcula o delta do rollup a partir de um valor que nenhuma requisição
+    concorrente pode mudar no meio.
+    """
+    query = (
+        select(TransactionModel)
+        .options(joinedload(TransactionModel.category))
+        .where(TransactionModel.id == transaction_id, TransactionModel.user_id == user_id)
+        .execution_options(populate_existing=True)
+    )
+    if for_update:
+        # Só a transação: a categoria está no lado anulável do LEFT JOIN
+        query = query.with_for_update(of=TransactionModel)
+    result = await db.execute(query)
+    return result.scalars().first()
+
+async def _ensure_category_owner(db: AsyncSession, user_id, category_id) -> None:
+    """Garante que a categoria informada pertence ao usuário"""
+    if category_id is None:
+        return
+    owned = await db.scalar(
+        select(Category.id).where(Category.id == category_id, Category.user_id == user_id)
+    )
+    if owned is None:
+        raise HTTPException(status_code=400, detail="Categoria não encontrada")
+
+async def _ensure_user_currency(db: AsyncSession, user_id, currency: str) -> None:
+    """Garante que a moeda é a do perfil do usuário"""
     try:
-        # Pula a inicialização do banco se estiver em modo de teste
-        if os.getenv("TESTING") == "true":
-            logger.info("Modo de teste detectado - pulando inicialização do banco")
-            return
-            
-        # Testa conexão com banco
-        if test_connection():
-            logger.info("Conexão com banco estabelecida com sucesso")
-        else:
-            logger.error("Falha ao conectar com banco")
-        
-        # Cria tabelas se não existirem
-        create_tables()
-        logger.info("Aplicação inicializada com sucesso")
-    except Exception as e:
-        logger.error(f"Erro na inicialização: {e}")
-        raise
+        check_user_currency(currency, await db.run_sync(get_user_currency, user_id))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @app.post("/transactions/", status_code=status.HTTP_201_CREATED, response_model=Transaction)
-async def create_transaction(transaction: TransactionCreate, db: Session = Depends(get_db)):
+async def create_transaction(
+    transaction: TransactionCreate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
     try:
+        await _ensure_category_owner(db, current_user.id, transaction.category_id)
+        
+        # Sem moeda explícita, vale a do perfil
+        if "currency" in transaction.model_fields_set:
+            currency = transaction.currency.value
+            await _ensure_user_currency(db, current_user.id, currency)
+        else:
+            currency = await db.run_sync(get_user_currency, current_user.id)
+        
         # Cria instância do modelo SQLAlchemy
         db_transaction = TransactionModel(
             id=uuid.uuid4(),
+            user_id=current_user.id,
             type=transaction.type.value,
-            amount=transaction.amount,
+            amount_cents=transaction.amount_cents,
+            currency=currency,
             description=transaction.description,
             category_id=transaction.category_id
         )
         
-        # Adiciona e commita
+        # Adiciona e atualiza o rollup mensal na mesma transação
         db.add(db_transaction)
-        db.commit()
-        db.refresh(db_transaction)
+        await db.flush()
+        await db.run_sync(record_created, [db_transaction])
+        await db.commit()
+        db_transaction = await _load_transaction(db, current_user.id, db_transaction.id)
         
-        logger.info(f"Transação criada: {db_transaction.id}")
+        logger.info("Transação criada: %s", db_transaction.id)
         
         # Converte para modelo Pydantic
         return db_transaction
@@ -121,38 +194,201 @@ async def create_transaction(transaction: TransactionCreate, db: Session = Depen
         # Re-raise HTTPException para manter o status code correto
         raise
     except Exception as e:
-        db.rollback()
-        logger.error(f"Erro ao criar transação: {str(e)}")
+        await db.rollback()
+        logger.error("Erro ao criar transação: %s", e)
         raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
 
-@app.get("/transactions/", response_model=List[Transaction])
-async def list_transactions(db: Session = Depends(get_db)):
+@app.post("/transactions/bulk", status_code=status.HTTP_201_CREATED, response_model=TransactionBulkResult)
+async def create_transactions_bulk(
+    items: List[Any] = Body(..., description="Lista de TransactionCreate"),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    if len(items) > settings.TRANSACTIONS_BULK_MAX_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Lote excede o limite de {settings.TRANSACTIONS_BULK_MAX_ITEMS} itens"
+        )
+    
     try:
-        # Busca todas as transações ordenadas por data de criação
-        db_transactions = db.query(TransactionModel).options(joinedload(TransactionModel.category)).order_by(TransactionModel.created_at.desc()).all()
+        # Itens inválidos são reportados individualmente sem abortar o lote
+        result = await db.run_sync(bulk_create_transactions, current_user.id, items)
         
-        logger.info(f"Listadas {len(db_transactions)} transações")
+        logger.info("Lote processado: %s criadas, %s rejeitadas", result.created, len(result.errors))
         
-        # Converte para modelos Pydantic
-        return db_transactions
+        return result
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Erro ao criar transações em lote: %s", e)
+        raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
+
+@app.post("/transactions/import")
+async def import_transactions(
+    file: UploadFile = File(..., description="Extrato bancário CSV ou OFX"),
+    format: Optional[str] = Query(None, description="csv ou ofx (padrão: pela extensão do arquivo)"),
+    encoding: str = Query("utf-8", description="Codificação do arquivo (ex.: latin-1 para OFX 1.x)"),
+    chunk_size: int = Query(settings.IMPORT_CHUNK_SIZE, ge=1, le=settings.TRANSACTIONS_BULK_MAX_ITEMS),
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
+    statement_format = (format or detect_format(file.filename)).lower()
+    if statement_format not in SUPPORTED_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Formato não suportado: {statement_format}")
+    try:
+        codecs.lookup(encoding)
+    except LookupError:
+        raise HTTPException(status_code=400, detail=f"Codificação desconhecida: {encoding}")
+    
+    try:
+        # O arquivo é lido sob demanda (o upload já fica em disco); cada bloco
+        # é commitado antes do próximo ser lido
+        stream = io.TextIOWrapper(file.file, encoding=encoding, errors="replace", newline="")
+        progress = import_statement_async(db, current_user.id, iter_statement_rows(stream, statement_format), chunk_size)
+        # Processa o primeiro bloco antes de responder para que erros de
+        # formato (ex.: colunas ausentes) ainda retornem 400
+        first = await progress.__anext__()
+        
+    except StatementParseError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Erro ao importar extrato: %s", e)
+        raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
+    
+    async def events():
+        # Uma linha NDJSON de progresso por bloco; a última tem done=true
+        try:
+            yield first.model_dump_json() + "\n"
+            async for event in progress:
+                yield event.model_dump_json() + "\n"
+        except Exception as e:
+            logger.error("Erro ao importar extrato: %s", e)
+            yield json.dumps({"error": f"Erro interno: {str(e)}"}) + "\n"
+        else:
+            logger.info("Extrato importado: %s", file.filename)
+    
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+@app.get("/transactions/", response_model=TransactionPage)
+async def list_transactions(
+    limit: int = Query(settings.TRANSACTIONS_PAGE_SIZE, ge=1, le=settings.TRANSACTIONS_MAX_PAGE_SIZE, description="Itens por página"),
+    cursor: Optional[str] = Query(None, description="Cursor retornado em next_cursor pela página anterior"),
+    filters: TransactionFilters = Depends(get_transaction_filters),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    try:
+        # Paginação keyset sobre (created_at, id) dentro das transações do
+        # usuário: cada página é uma varredura de idx_transactions_user_created_at
+        # a partir da posição do cursor, sem OFFSET
+        query = (
+            select(TransactionModel)
+            .options(joinedload(TransactionModel.category))
+            .where(TransactionModel.user_id == current_user.id)
+        )
+        query = apply_transaction_filters(query, filters)
+        
+        if cursor:
+            try:
+                cursor_created_at, cursor_id = decode_cursor(cursor)
+            except InvalidCursorError as e:
+                raise HTTPException(status_code=400, detail=str(e))
+            query = query.filter(
+                tuple_(TransactionModel.created_at, TransactionModel.id) < tuple_(cursor_created_at, cursor_id)
+            )
+        
+        # Busca um item extra para saber se existe próxima página
+        result = await db.execute(query.order_by(
+            TransactionModel.created_at.desc(), TransactionModel.id.desc()
+        ).limit(limit + 1))
+        db_transactions = result.scalars().all()
+        
+        next_cursor = None
+        if len(db_transactions) > limit:
+            db_transactions = db_transactions[:limit]
+            last = db_transactions[-1]
+            next_cursor = encode_cursor(last.created_at, last.id)
+        
+        logger.info("Listadas %s transações", len(db_transactions))
+        
+        return TransactionPage(items=db_transactions, next_cursor=next_cursor, limit=limit)
         
     except HTTPException:
         # Re-raise HTTPException para manter o status code correto
         raise
     except Exception as e:
-        logger.error(f"Erro ao listar transações: {str(e)}")
+        logger.error("Erro ao listar transações: %s", e)
+        raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
+
+@app.get("/transactions/export")
+async def export_transactions(
+    format: str = Query("csv", description="csv ou ndjson"),
+    filters: TransactionFilters = Depends(get_transaction_filters),
+    session_factory: async_sessionmaker = Depends(get_async_read_sessionmaker),
+    current_user: User = Depends(get_current_user)
+):
+    if format not in EXPORT_FORMATS:
+        raise HTTPException(status_code=400, detail=f"Formato não suportado: {format}")
+    
+    async def content():
+        # Executado sob demanda pelo StreamingResponse, depois que o endpoint
+        # retornou: a sessão é aberta aqui e dura só o envio. Uma falha no meio
+        # da exportação interrompe a resposta em vez de entregar um arquivo truncado
+        try:
+            async with session_factory() as db:
+                async for chunk in iter_export(db, current_user.id, filters, format, settings.EXPORT_BATCH_SIZE):
+                    yield chunk
+        except Exception as e:
+            logger.error("Erro ao exportar transações: %s", e)
+            raise
+    
+    filename = f"transacoes-{datetime.now().strftime('%Y%m%d')}.{format}"
+    return StreamingResponse(
+        content(),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+@app.get("/transactions/summary", response_model=TransactionSummary)
+async def get_transactions_summary(
+    months: int = Query(12, ge=0, le=120, description="Quantidade de meses na série mensal"),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user)
+):
+    try:
+        # Saldo e totais mensais agregados no banco, com os meses
+        # delimitados no fuso horário do perfil do usuário
+        # (o rollup de cada usuário já está nesse fuso)
+        tz_name = await db.run_sync(get_user_timezone, current_user.id)
+        summary = await db.run_sync(summarize_from_rollup, current_user.id, tz_name, months)
+        
+        logger.info("Resumo calculado (%s meses)", len(summary.months))
+        
+        return summary
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error("Erro ao calcular resumo: %s", e)
         raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
 
 @app.get("/transactions/{transaction_id}", response_model=Transaction)
-async def get_transaction(transaction_id: str, db: Session = Depends(get_db)):
+async def get_transaction(
+    transaction_id: str,
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: User = Depends(get_current_user)
+):
     try:
-        # Busca transação por ID
-        db_transaction = db.query(TransactionModel).options(joinedload(TransactionModel.category)).filter(TransactionModel.id == transaction_id).first()
+        # Busca transação por ID (apenas do usuário)
+        db_transaction = await _load_transaction(db, current_user.id, transaction_id)
         
         if not db_transaction:
             raise HTTPException(status_code=404, detail="Transação não encontrada")
         
-        logger.info(f"Transação encontrada: {transaction_id}")
+        logger.info("Transação encontrada: %s", transaction_id)
         
         # Converte para modelo Pydantic
         return db_transaction
@@ -160,28 +396,46 @@ async def get_transaction(transaction_id: str, db: Session = Depends(get_db)):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Erro ao buscar transação: {str(e)}")
+        logger.error("Erro ao buscar transação: %s", e)
         raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
 
 @app.put("/transactions/{transaction_id}", response_model=Transaction)
-async def update_transaction(transaction_id: str, transaction: TransactionUpdate, db: Session = Depends(get_db)):
+async def update_transaction(
+    transaction_id: str,
+    transaction: TransactionUpdate,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
     try:
-        # Busca transação existente
-        db_transaction = db.query(TransactionModel).filter(TransactionModel.id == transaction_id).first()
+        # Busca e trava a transação existente (apenas do usuário)
+        db_transaction = await _load_transaction(db, current_user.id, transaction_id, for_update=True)
         
         if not db_transaction:
             raise HTTPException(status_code=404, detail="Transação não encontrada")
         
-        # Atualiza campos fornecidos
-        update_data = transaction.dict(exclude_unset=True)
+        old_key = transaction_key(db_transaction, await db.run_sync(rollup_timezone, current_user.id))
+        old_amount_cents = db_transaction.amount_cents
+        
+        # Atualiza campos fornecidos (amount vira amount_cents)
+        update_data = transaction.column_values()
+        if "category_id" in update_data:
+            await _ensure_category_owner(db, current_user.id, update_data["category_id"])
+        if update_data.get("currency") is not None:
+            await _ensure_user_currency(db, current_user.id, update_data["currency"])
         for key, value in update_data.items():
             setattr(db_transaction, key, value)
         
-        # Commita as mudanças
-        db.commit()
-        db.refresh(db_transaction)
+        # Move o valor entre chaves do rollup se valor, tipo ou categoria mudaram;
+        # o UPDATE em transactions vai antes, na mesma ordem de locks da reconstrução
+        if {"amount_cents", "type", "category_id"} & update_data.keys():
+            await db.flush()
+            await db.run_sync(record_updated, old_key, old_amount_cents, db_transaction)
         
-        logger.info(f"Transação atualizada: {transaction_id}")
+        # Commita as mudanças e recarrega (updated_at e categoria)
+        await db.commit()
+        db_transaction = await _load_transaction(db, current_user.id, transaction_id)
+        
+        logger.info("Transação atualizada: %s", transaction_id)
         
         # Converte para modelo Pydantic
         return db_transaction
@@ -189,32 +443,60 @@ async def update_transaction(transaction_id: str, transaction: TransactionUpdate
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        logger.error(f"Erro ao atualizar transação: {str(e)}")
+        await db.rollback()
+        logger.error("Erro ao atualizar transação: %s", e)
         raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
 
 @app.delete("/transactions/{transaction_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_transaction(transaction_id: str, db: Session = Depends(get_db)):
+async def delete_transaction(
+    transaction_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user)
+):
     try:
-        # Busca transação para deletar
-        db_transaction = db.query(TransactionModel).filter(TransactionModel.id == transaction_id).first()
+        # Busca e trava a transação para deletar (apenas do usuário)
+        db_transaction = await _load_transaction(db, current_user.id, transaction_id, for_update=True)
         
         if not db_transaction:
             raise HTTPException(status_code=404, detail="Transação não encontrada")
         
-        # Remove e commita
-        db.delete(db_transaction)
-        db.commit()
+        # Remove (o DELETE em transactions vai antes do rollup), desconta e commita
+        await db.delete(db_transaction)
+        await db.flush()
+        await db.run_sync(record_deleted, db_transaction)
+        await db.commit()
         
-        logger.info(f"Transação deletada: {transaction_id}")
+        logger.info("Transação deletada: %s", transaction_id)
         
     except HTTPException:
         raise
     except Exception as e:
-        db.rollback()
-        logger.error(f"Erro ao deletar transação: {str(e)}")
+        await db.rollback()
+        logger.error("Erro ao deletar transação: %s", e)
         raise HTTPException(status_code=500, detail=f"Erro interno: {str(e)}")
 
+def require_internal_token(x_internal_token: Optional[str] = Header(None)) -> None:
+    """Protege endpoints internos; sem INTERNAL_METRICS_TOKEN eles não existem"""
+    expected = settings.INTERNAL_METRICS_TOKEN
+    if not expected or not x_internal_token or not secrets.compare_digest(x_internal_token, expected):
+        raise HTTPException(status_code=404, detail="Not Found")
+
+@app.get("/internal/metrics", include_in_schema=False, dependencies=[Depends(require_internal_token)])
+def internal_metrics():
+    """Contadores em memória deste processo"""
+    return {
+        "auth": {
+            "rate_limit": auth_rate_limiter.stats(),
+            "token_cache": token_cache.stats(),
+            "profile_cache": profile_cache_stats(),
+            "revocation": revocation_store.stats(),
+        },
+        "email_dispatcher": dispatcher_stats(),
+        "logging": logging_stats(),
+        "db_pool": {name: metrics.stats() for name, metrics in pool_metrics.items()},
+        "db_replica": replica_monitor.stats() if replica_monitor is not None else None,
+    }
+
 @app.get("/health")
 def health_check():
     return {
@@ -2,16 +2,30 @@
 Modelos Pydantic para o banco de dados
 """
 from datetime import datetime
-from typing import Optional
-from pydantic import BaseModel, Field, ConfigDict
+from typing import Any, Dict, Optional
+from pydantic import BaseModel, Field, ConfigDict, field_validator, model_validator
 from enum import Enum
 from uuid import UUID
+from .money import from_cents, to_cents
 
 class TransactionType(str, Enum):
     """Tipos de transação"""
     INCOME = "income"
     EXPENSE = "expense"
 
+class Currency(str, Enum):
+    """Moedas aceitas nas transações"""
+    BRL = "BRL"
+    USD = "USD"
+    EUR = "EUR"
+    GBP = "GBP"
+
+def _validate_amount(value: Optional[float]) -> Optional[float]:
+    """O valor é guardado em centavos: precisa ser de pelo menos 0.01 após o arredondamento"""
+    if value is not None and to_cents(value) <= 0:
+        raise ValueError("O valor deve ser de pelo menos 0.01")
+    return value
+
 class Category(BaseModel):
     id: UUID
     name: str
@@ -24,21 +38,72 @@ class Category(BaseModel):
 class TransactionBase(BaseModel):
     """Modelo base para transações"""
     type: TransactionType = Field(..., description="Tipo da transação: income ou expense")
-    amount: float = Field(..., gt=0, description="Valor da transação (sempre positivo)")
+    amount: float = Field(..., gt=0, description="Valor da transação na unidade da moeda (sempre positivo)")
+    currency: Currency = Field(Currency.BRL, description="Moeda da transação")
     description: str = Field(..., min_length=1, max_length=500, description="Descrição da transação")
     category_id: Optional[UUID] = Field(None, description="ID da categoria")
 
+    _check_amount = field_validator("amount")(_validate_amount)
+
+    @property
+    def amount_cents(self) -> int:
+        """Valor em centavos, como gravado em transactions.amount_cents"""
+        return to_cents(self.amount)
+
 class TransactionCreate(TransactionBase):
     """Modelo para criação de transações"""
     pass
 
+class BulkItemError(BaseModel):
+    """Erros de validação de um item do lote"""
+    index: int = Field(..., description="Posição do item no lote (0-based)")
+    errors: list[str] = Field(..., description="Mensagens de erro do item")
+
+class TransactionBulkResult(BaseModel):
+    """Resultado da criação em lote"""
+    created: int = Field(..., description="Quantidade de transações criadas")
+    ids: list[UUID] = Field(default_factory=list, description="IDs criados, na ordem dos itens válidos")
+    errors: list[BulkItemError] = Field(default_factory=list, description="Itens rejeitados")
+
+class StatementImportProgress(BaseModel):
+    """Progresso da importação de extrato, emitido a cada bloco"""
+    chunk: int = Field(..., description="Número do bloco processado (1-based)")
+    rows_read: int = Field(..., description="Linhas lidas do extrato até agora")
+    created: int = Field(..., description="Transações criadas até agora")
+    rejected: int = Field(..., description="Linhas rejeitadas até agora")
+    errors: list[BulkItemError] = Field(default_factory=list, description="Erros deste bloco (index = linha do extrato)")
+    done: bool = Field(False, description="Indica o último evento da importação")
+
 class TransactionUpdate(BaseModel):
     """Modelo para atualização de transações"""
     type: Optional[TransactionType] = Field(None, description="Tipo da transação")
     amount: Optional[float] = Field(None, gt=0, description="Valor da transação")
+    currency: Optional[Currency] = Field(None, description="Moeda da transação")
     description: Optional[str] = Field(None, min_length=1, max_length=500, description="Descrição da transação")
     category_id: Optional[UUID] = Field(None, description="ID da categoria")
 
+    _check_amount = field_validator("amount")(_validate_amount)
+
+    def column_values(self) -> Dict[str, Any]:
+        """Campos enviados, com os nomes e valores das colunas (amount vira amount_cents)"""
+        values = self.model_dump(exclude_unset=True)
+        if "amount" in values:
+            amount = values.pop("amount")
+            values["amount_cents"] = None if amount is None else to_cents(amount)
+        for key in ("type", "currency"):
+            if isinstance(values.get(key), Enum):
+                values[key] = values[key].value
+        return values
+
+class TransactionFilters(BaseModel):
+    """Filtros de listagem equivalentes aos AdvancedFilters do frontend"""
+    start_date: Optional[datetime] = Field(None, description="Data inicial (inclusiva)")
+    end_date: Optional[datetime] = Field(None, description="Data final (inclusiva)")
+    category_ids: list[UUID] = Field(default_factory=list, description="IDs das categorias")
+    min_amount: Optional[float] = Field(None, ge=0, description="Valor mínimo (inclusivo)")
+    max_amount: Optional[float] = Field(None, ge=0, description="Valor máximo (inclusivo)")
+    type: Optional[TransactionType] = Field(None, description="Tipo da transação")
+
 class Transaction(TransactionBase):
     """Modelo completo de transação com campos do banco"""
     id: UUID = Field(..., description="ID único da transação")
@@ -46,6 +111,16 @@ class Transaction(TransactionBase):
     updated_at: datetime = Field(..., description="Data da última atualização")
     category: Optional[Category] = Field(None, description="Categoria da transação")
     
+    @model_validator(mode="before")
+    @classmethod
+    def _amount_from_cents(cls, data: Any) -> Any:
+        """Linhas do banco trazem amount_cents; a API expõe amount na unidade da moeda"""
+        if isinstance(data, dict) or not hasattr(data, "amount_cents"):
+            return data
+        values = {name: getattr(data, name) for name in cls.model_fields if name != "amount"}
+        values["amount"] = from_cents(data.amount_cents)
+        return values
+    
     model_config = ConfigDict(
         from_attributes=True,
         json_schema_extra={
@@ -53,6 +128,7 @@ class Transaction(TransactionBase):
                 "id": "123e4567-e89b-12d3-a456-426614174000",
                 "type": "income",
                 "amount": 1000.00,
+                "currency": "BRL",
                 "description": "Salário do mês",
                 "created_at": "2024-01-01T00:00:00Z",
                 "updated_at": "2024-01-01T00:00:00Z",
@@ -81,6 +157,7 @@ class TransactionList(BaseModel):
                         "id": "123e4567-e89b-12d3-a456-426614174000",
                         "type": "income",
                         "amount": 1000.00,
+                        "currency": "BRL",
                         "description": "Salário do mês",
                         "created_at": "2024-01-01T00:00:00Z",
                         "updated_at": "2024-01-01T00:00:00Z",
@@ -97,4 +174,29 @@ class TransactionList(BaseModel):
                 "per_page": 10
             }
         }
-    )
\ No newline at end of file
+    )
+
+class TransactionPage(BaseModel):
+    """Página de transações paginada por cursor (created_at, id)"""
+    items: list[Transaction] = Field(..., description="Transações da página atual")
+    next_cursor: Optional[str] = Field(None, description="Cursor opaco para a próxima página (null na última)")
+    limit: int = Field(..., description="Tamanho máximo da página")
+
+
+class MonthlySummary(BaseModel):
+    """Totais de um mês no fuso horário do usuário"""
+    month: str = Field(..., description="Mês no formato YYYY-MM")
+    income: float = Field(0.0, description="Total de receitas no mês")
+    expenses: float = Field(0.0, description="Total de despesas no mês")
+    balance: float = Field(0.0, description="Receitas menos despesas no mês")
+
+
+class TransactionSummary(BaseModel):
+    """Resumo agregado de saldo para o dashboard"""
+    current_balance: float = Field(..., description="Saldo acumulado de todas as transações")
+    monthly_income: float = Field(..., description="Receitas do mês corrente")
+    monthly_expenses: float = Field(..., description="Despesas do mês corrente")
+    previous_month_balance: float = Field(..., description="Saldo do mês anterior")
+    percentage_change: float = Field(..., description="Variação percentual em relação ao mês anterior")
+    timezone: str = Field(..., description="Fuso horário usado para delimitar os meses")
+    months: list[MonthlySummary] = Field(default_factory=list, description="Série mensal, do mais antigo ao mais recente")
@@ -0,0 +1,35 @@
+"""
+Valores monetários em centavos
+
+O banco guarda valores como BIGINT em centavos (transactions.amount_cents,
+monthly_totals.total_cents): somas e comparações são inteiras e exatas. A
+API continua recebendo e devolvendo valores decimais na unidade da moeda
+(12.34); a conversão acontece na fronteira dos modelos Pydantic.
+"""
+from decimal import ROUND_HALF_UP, Decimal
+from typing import Union
+
+# Moedas aceitas (as mesmas do perfil do usuário)
+CURRENCIES = ("BRL", "USD", "EUR", "GBP")
+DEFAULT_CURRENCY = "BRL"
+
+_CENT = Decimal(1)
+
+
+def to_cents(value: Union[float, int, str, Decimal]) -> int:
+    """
+    Converte um valor na unidade da moeda em centavos, arredondando half-up
+
+    Floats passam pela representação decimal mais curta (repr), de modo
+    que 0.1 + 0.2 vira 30 centavos, e não 30.000000000000004.
+    """
+    if isinstance(value, float):
+        value = repr(value)
+    return int((Decimal(value) * 100).quantize(_CENT, rounding=ROUND_HALF_UP))
+
+
+def from_cents(cents: Union[int, Decimal, None]) -> float:
+    """Converte centavos no valor decimal exposto pela API (None vira 0.0)"""
+    if cents is None:
+        return 0.0
+    return int(cents) / 100
@@ -0,0 +1,31 @@
+"""
+Paginação por cursor (keyset) para listagens
+
+O cursor é opaco para o cliente: codifica em base64 a posição
+(created_at, id) do último item da página anterior.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+from uuid import UUID
+
+
+class InvalidCursorError(ValueError):
+    """Cursor malformado ou adulterado"""
+
+
+def encode_cursor(created_at: datetime, item_id: UUID) -> str:
+    """Codifica a posição (created_at, id) em um cursor opaco"""
+    payload = json.dumps({"c": created_at.isoformat(), "i": str(item_id)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, UUID]:
+    """Decodifica um cursor gerado por encode_cursor"""
+    try:
+        padding = "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(cursor + padding).decode("utf-8"))
+        return datetime.fromisoformat(payload["c"]), UUID(payload["i"])
+    except Exception as e:
+        raise InvalidCursorError(f"Cursor inválido: {cursor}") from e
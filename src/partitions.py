@@ -0,0 +1,212 @@
+"""
+Partições mensais da tabela transactions (PostgreSQL)
+
+transactions é particionada por RANGE (created_at), com uma partição por
+mês em UTC (transactions_pAAAAMM) e uma partição DEFAULT que recebe linhas
+fora de qualquer mês já criado (por exemplo, extratos antigos importados).
+Os índices são declarados na tabela mãe e o PostgreSQL os cria em cada
+partição; consultas com faixa de created_at só leem os meses envolvidos.
+
+Este módulo cria as partições futuras, move para a partição certa o que
+caiu na DEFAULT, arquiva meses antigos com DETACH PARTITION e cria índices
+novos sem bloquear escritas.
+"""
+from datetime import date, datetime, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+PARENT_TABLE = "transactions"
+DEFAULT_PARTITION = "transactions_default"
+PARTITION_PREFIX = "transactions_p"
+ARCHIVED_SUFFIX = "_archived"
+
+# Meses à frente mantidos criados pelo job de manutenção
+DEFAULT_MONTHS_AHEAD = 3
+
+
+def month_start(value) -> date:
+    """Primeiro dia do mês de uma data ou datetime (datetimes são levados a UTC)"""
+    if isinstance(value, datetime):
+        if value.tzinfo is not None:
+            value = value.astimezone(timezone.utc)
+        value = value.date()
+    return value.replace(day=1)
+
+
+def add_months(month: date, count: int) -> date:
+    """Primeiro dia do mês count meses depois (ou antes, se negativo)"""
+    index = month.year * 12 + month.month - 1 + count
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def month_range(first: date, last: date) -> List[date]:
+    """Meses de first até last, inclusive"""
+    months = []
+    current = month_start(first)
+    while current <= month_start(last):
+        months.append(current)
+        current = add_months(current, 1)
+    return months
+
+
+def partition_name(month: date) -> str:
+    """Nome da partição de um mês (transactions_p202410)"""
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def archived_name(month: date) -> str:
+    """Nome da tabela de um mês desligado (transactions_p202410_archived)"""
+    return f"{partition_name(month)}{ARCHIVED_SUFFIX}"
+
+
+def parse_month(value: str) -> date:
+    """Converte 'AAAA-MM' no primeiro dia do mês"""
+    try:
+        return datetime.strptime(value, "%Y-%m").date()
+    except ValueError:
+        raise ValueError(f"Mês inválido: {value!r} (use AAAA-MM)")
+
+
+def partition_bounds(month: date) -> Tuple[datetime, datetime]:
+    """Limites [início, fim) da partição do mês, em UTC"""
+    start = datetime(month.year, month.month, 1, tzinfo=timezone.utc)
+    end_month = add_months(month, 1)
+    return start, datetime(end_month.year, end_month.month, 1, tzinfo=timezone.utc)
+
+
+def _create_sql(month: date) -> str:
+    start, end = partition_bounds(month)
+    return (
+        f'CREATE TABLE "{partition_name(month)}" PARTITION OF {PARENT_TABLE} '
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+    )
+
+
+def attached_partitions(connection: Connection) -> List[str]:
+    """Nomes das partições atualmente ligadas a transactions"""
+    rows = connection.execute(text("""
+        SELECT child.relname
+        FROM pg_inherits
+        JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+        JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+        WHERE parent.relname = :parent
+          AND parent.relnamespace = to_regnamespace(current_schema())
+        ORDER BY child.relname
+    """), {"parent": PARENT_TABLE})
+    return [row[0] for row in rows]
+
+
+def relation_exists(connection: Connection, name: str) -> bool:
+    """Se já existe tabela (ligada ou não) com esse nome no schema atual"""
+    return connection.execute(text("SELECT to_regclass(:name) IS NOT NULL"), {"name": f'"{name}"'}).scalar()
+
+
+def months_in_default(connection: Connection) -> List[date]:
+    """Meses com linhas na partição DEFAULT"""
+    rows = connection.execute(text(f"""
+        SELECT DISTINCT date_trunc('month', created_at AT TIME ZONE 'UTC')::date
+        FROM {DEFAULT_PARTITION}
+        ORDER BY 1
+    """))
+    return [row[0] for row in rows]
+
+
+def create_partition(connection: Connection, month: date) -> bool:
+    """
+    Cria a partição do mês, se ainda não existir
+
+    Se a DEFAULT já tiver linhas desse mês, o PostgreSQL recusaria a nova
+    partição; elas são retiradas da DEFAULT e reinseridas depois da criação,
+    na mesma transação. Retorna True se a partição foi criada.
+
+    Raises:
+        ValueError: Se já existe uma tabela avulsa com o nome da partição
+    """
+    name = partition_name(month)
+    if name in attached_partitions(connection):
+        return False
+    if relation_exists(connection, name):
+        raise ValueError(
+            f"Já existe a tabela {name}, que não está ligada a {PARENT_TABLE}; "
+            f"renomeie-a (ex.: {archived_name(month)}) ou remova-a antes de recriar a partição"
+        )
+
+    start, end = partition_bounds(month)
+    params = {"start": start, "end": end}
+    in_month = "created_at >= :start AND created_at < :end"
+    moved = connection.execute(
+        text(f"SELECT count(*) FROM {DEFAULT_PARTITION} WHERE {in_month}"), params
+    ).scalar()
+    if moved:
+        connection.execute(text(
+            f"CREATE TEMPORARY TABLE partition_move ON COMMIT DROP AS "
+            f"SELECT * FROM {DEFAULT_PARTITION} WHERE {in_month}"
+        ), params)
+        connection.execute(text(f"DELETE FROM {DEFAULT_PARTITION} WHERE {in_month}"), params)
+
+    connection.execute(text(_create_sql(month)))
+
+    if moved:
+        connection.execute(text(f"INSERT INTO {PARENT_TABLE} SELECT * FROM partition_move"))
+        connection.execute(text("DROP TABLE partition_move"))
+    return True
+
+
+def ensure_partitions(
+    connection: Connection,
+    months_ahead: int = DEFAULT_MONTHS_AHEAD,
+    today: Optional[date] = None,
+) -> List[str]:
+    """
+    Garante as partições do mês corrente e dos months_ahead seguintes, e
+    dos meses que tenham caído na DEFAULT. Retorna as partições criadas.
+    """
+    current = month_start(today or datetime.now(timezone.utc))
+    months: Iterable[date] = sorted(
+        set(month_range(current, add_months(current, months_ahead))) | set(months_in_default(connection))
+    )
+    return [partition_name(month) for month in months if create_partition(connection, month)]
+
+
+def create_index_concurrently(connection: Connection, name: str, columns: str) -> None:
+    """
+    Cria um índice em transactions sem bloquear escritas
+
+    O PostgreSQL não aceita CREATE INDEX CONCURRENTLY em tabela
+    particionada. O índice é criado só na tabela mãe (ON ONLY, inválido até
+    cobrir todas as partições); cada partição ganha o seu com CONCURRENTLY,
+    que é então ligado ao da mãe com ATTACH PARTITION. Precisa de uma
+    conexão em autocommit; pode ser repetido se for interrompido.
+    """
+    connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON ONLY {PARENT_TABLE} {columns}"))
+    for partition in attached_partitions(connection):
+        partition_index = f"{partition}_{name}"
+        connection.execute(text(f'CREATE INDEX CONCURRENTLY IF NOT EXISTS "{partition_index}" ON "{partition}" {columns}'))
+        connection.execute(text(f'ALTER INDEX {name} ATTACH PARTITION "{partition_index}"'))
+
+
+def detach_partition(connection: Connection, month: date) -> str:
+    """
+    Desliga a partição do mês de transactions para arquivamento
+
+    DETACH só altera o catálogo: as linhas continuam na tabela avulsa
+    transactions_pAAAAMM_archived, que pode ser exportada e removida depois
+    (DROP TABLE), em vez de um DELETE em massa. O sufixo libera o nome da
+    partição: se uma linha desse mês cair depois na DEFAULT, ensure_partitions
+    consegue recriá-la. O modo CONCURRENTLY não é usado porque o PostgreSQL
+    não o aceita com uma partição DEFAULT presente.
+
+    Returns:
+        Nome da tabela arquivada
+    """
+    name = partition_name(month)
+    archived = archived_name(month)
+    if name not in attached_partitions(connection):
+        raise ValueError(f"Partição {name} não está ligada a {PARENT_TABLE}")
+    if relation_exists(connection, archived):
+        raise ValueError(f"Já existe a tabela {archived}; arquive-a e remova-a antes de desligar o mês de novo")
+    connection.execute(text(f'ALTER TABLE {PARENT_TABLE} DETACH PARTITION "{name}"'))
+    connection.execute(text(f'ALTER TABLE "{name}" RENAME TO "{archived}"'))
+    return archived
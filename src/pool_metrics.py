@@ -0,0 +1,138 @@
+"""
+Telemetria dos pools de conexão do SQLAlchemy
+
+Os pools instrumentados medem quanto cada checkout esperou por uma
+conexão (inclui abrir uma conexão nova e o pre-ping) e contam os
+timeouts, que indicam pool esgotado. Os listeners de checkout/checkin
+acompanham as conexões em uso e o pico de uso, inclusive do overflow.
+Os números ficam em GET /internal/metrics, para dimensionar
+DB_POOL_SIZE / DB_MAX_OVERFLOW em cada deploy.
+"""
+import threading
+import time
+from typing import Dict
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+
+# Esperas acima disso contam como lentas
+SLOW_CHECKOUT_SECONDS = 0.1
+
+
+class PoolMetrics:
+    """Contadores de um pool, atualizados pelos pools e listeners abaixo"""
+
+    def __init__(self, name: str):
+        self.name = name
+        self._lock = threading.Lock()
+        self.pool = None
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.checkouts = 0
+            self.timeouts = 0
+            self.slow_checkouts = 0
+            self.wait_total = 0.0
+            self.wait_max = 0.0
+            self.in_use = 0
+            self.peak_in_use = 0
+            self.peak_overflow = 0
+            self.connections_opened = 0
+
+    def record_wait(self, seconds: float, overflow: int) -> None:
+        with self._lock:
+            self.checkouts += 1
+            self.wait_total += seconds
+            if seconds > self.wait_max:
+                self.wait_max = seconds
+            if seconds >= SLOW_CHECKOUT_SECONDS:
+                self.slow_checkouts += 1
+            if overflow > self.peak_overflow:
+                self.peak_overflow = overflow
+
+    def record_timeout(self) -> None:
+        with self._lock:
+            self.timeouts += 1
+
+    def on_connect(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.connections_opened += 1
+
+    def on_checkout(self, dbapi_connection, connection_record, connection_proxy) -> None:
+        with self._lock:
+            self.in_use += 1
+            if self.in_use > self.peak_in_use:
+                self.peak_in_use = self.in_use
+
+    def on_checkin(self, dbapi_connection, connection_record) -> None:
+        with self._lock:
+            self.in_use = max(self.in_use - 1, 0)
+
+    def stats(self) -> Dict[str, float]:
+        pool = self.pool
+        with self._lock:
+            checkouts = self.checkouts
+            return {
+                "pool_size": pool.size() if pool is not None else None,
+                "max_overflow": pool._max_overflow if pool is not None else None,
+                "in_use": self.in_use,
+                "idle": pool.checkedin() if pool is not None else None,
+                "overflow": max(pool.overflow(), 0) if pool is not None else None,
+                "peak_in_use": self.peak_in_use,
+                "peak_overflow": self.peak_overflow,
+                "checkouts": checkouts,
+                "timeouts": self.timeouts,
+                "slow_checkouts": self.slow_checkouts,
+                "wait_avg_ms": round(self.wait_total / checkouts * 1000, 3) if checkouts else 0.0,
+                "wait_max_ms": round(self.wait_max * 1000, 3),
+                "connections_opened": self.connections_opened,
+            }
+
+
+class _InstrumentedPoolMixin:
+    metrics: PoolMetrics = None
+
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            if self.metrics is not None:
+                self.metrics.record_timeout()
+            raise
+        if self.metrics is not None:
+            self.metrics.record_wait(time.perf_counter() - start, self.overflow())
+        return connection
+
+    def recreate(self):
+        # dispose() recria o pool: os contadores continuam os mesmos
+        pool = super().recreate()
+        pool.metrics = self.metrics
+        if self.metrics is not None:
+            self.metrics.pool = pool
+        return pool
+
+
+class InstrumentedQueuePool(_InstrumentedPoolMixin, QueuePool):
+    """QueuePool com medição do tempo de checkout"""
+
+
+class InstrumentedAsyncAdaptedQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool com medição do tempo de checkout"""
+
+
+def instrument_engine(engine: Engine, name: str) -> PoolMetrics:
+    """
+    Liga um PoolMetrics ao pool do engine (síncrono, ou o sync_engine de um AsyncEngine)
+
+    Os listeners ficam no engine e continuam valendo se o pool for recriado.
+    """
+    metrics = PoolMetrics(name)
+    metrics.pool = engine.pool
+    if isinstance(engine.pool, _InstrumentedPoolMixin):
+        engine.pool.metrics = metrics
+    event.listen(engine, "connect", metrics.on_connect)
+    event.listen(engine, "checkout", metrics.on_checkout)
+    event.listen(engine, "checkin", metrics.on_checkin)
+    return metrics
@@ -0,0 +1,136 @@
+"""
+Análise de planos de execução do PostgreSQL (EXPLAIN ... FORMAT JSON)
+
+Usado por scripts/explain_queries.py:
+- aponta varreduras sequenciais e ordenações acima de um limite de linhas;
+- reduz cada plano a uma forma estável (tipos de nó, tabelas e índices,
+  sem custos nem tempos), comparável com o baseline versionado;
+- coleta os índices usados, para listar os que nenhum plano aproveita.
+"""
+import difflib
+import re
+from typing import Dict, Iterator, List, NamedTuple, Set
+
+DEFAULT_ROW_THRESHOLD = 1000
+
+SCAN_NODES = ("Seq Scan",)
+SORT_NODES = ("Sort", "Incremental Sort")
+
+# transactions_p202410 -> transactions_p*: os meses existentes dependem da data do seed
+_PARTITION_MONTH = re.compile(r"_p\d{6}")
+
+
+class PlanIssue(NamedTuple):
+    """Nó do plano que processou mais linhas que o limite"""
+    node_type: str
+    target: str
+    rows: int
+
+    @property
+    def label(self) -> str:
+        """Descrição sem a contagem de linhas, estável entre execuções"""
+        return f"{self.node_type} em {self.target}"
+
+    def __str__(self) -> str:
+        return f"{self.label} ({self.rows} linhas)"
+
+
+def _normalize(name: str) -> str:
+    return _PARTITION_MONTH.sub("_p*", name)
+
+
+def iter_nodes(plan: dict) -> Iterator[dict]:
+    """Percorre o nó e todos os seus descendentes"""
+    yield plan
+    for child in plan.get("Plans", []):
+        yield from iter_nodes(child)
+
+
+def node_rows(node: dict) -> int:
+    """Linhas tratadas pelo nó em todas as execuções (inclui as descartadas pelo filtro)"""
+    rows = node.get("Actual Rows", 0) + node.get("Rows Removed by Filter", 0)
+    return int(rows * node.get("Actual Loops", 1))
+
+
+def find_issues(plan: dict, threshold: int = DEFAULT_ROW_THRESHOLD) -> List[PlanIssue]:
+    """Seq Scans e Sorts do plano acima de threshold linhas"""
+    issues = []
+    for node in iter_nodes(plan):
+        node_type = node["Node Type"]
+        if node_type in SCAN_NODES:
+            target = _normalize(node.get("Relation Name", "?"))
+        elif node_type in SORT_NODES:
+            target = ", ".join(node.get("Sort Key", []))
+        else:
+            continue
+        rows = node_rows(node)
+        if rows > threshold:
+            issues.append(PlanIssue(node_type, target, rows))
+    return issues
+
+
+def _describe(node: dict) -> str:
+    parts = [node["Node Type"]]
+    if "Join Type" in node and node["Join Type"] != "Inner":
+        parts.append(f"({node['Join Type']})")
+    if "Index Name" in node:
+        parts.append(f"using {_normalize(node['Index Name'])}")
+    if "Relation Name" in node:
+        parts.append(f"on {_normalize(node['Relation Name'])}")
+    if "Sort Key" in node:
+        parts.append(f"[{', '.join(node['Sort Key'])}]")
+    return " ".join(parts)
+
+
+def plan_shape(plan: dict, depth: int = 0) -> List[str]:
+    """
+    Forma do plano, uma linha por nó indentada pela profundidade
+
+    Filhos com a mesma forma (as partições de um Append, em geral)
+    aparecem uma única vez, para que a forma não mude a cada mês criado.
+    """
+    lines = ["  " * depth + _describe(plan)]
+    seen = []
+    for child in plan.get("Plans", []):
+        child_lines = plan_shape(child, depth + 1)
+        if child_lines not in seen:
+            seen.append(child_lines)
+            lines.extend(child_lines)
+    return lines
+
+
+def used_indexes(plan: dict) -> Set[str]:
+    """Índices lidos pelo plano (nomes reais, inclusive os das partições)"""
+    return {node["Index Name"] for node in iter_nodes(plan) if "Index Name" in node}
+
+
+def render(entries: List[dict]) -> List[str]:
+    """Linhas de texto de um cenário: a forma de cada SQL e os problemas apontados"""
+    lines = []
+    for position, entry in enumerate(entries, start=1):
+        lines.append(f"#{position}")
+        lines.extend(entry["plan"])
+        lines.extend(f"! {issue}" for issue in entry["issues"])
+    return lines
+
+
+def compare_to_baseline(baseline: Dict[str, List[dict]], current: Dict[str, List[dict]]) -> Dict[str, List[str]]:
+    """
+    Diferenças de cada cenário em relação ao baseline
+
+    Returns:
+        {cenário: linhas do diff}; cenários novos ou removidos também entram
+    """
+    changes = {}
+    for name in sorted(set(baseline) | set(current)):
+        if name not in baseline:
+            changes[name] = ["(cenário sem baseline)"]
+        elif name not in current:
+            changes[name] = ["(cenário do baseline não executado)"]
+        else:
+            diff = list(difflib.unified_diff(
+                render(baseline[name]), render(current[name]), "baseline", "atual", lineterm="",
+            ))
+            if diff:
+                changes[name] = diff
+    return changes
@@ -0,0 +1,292 @@
+"""
+Manutenção incremental do rollup mensal (monthly_totals)
+
+Os handlers de transação aplicam deltas na mesma sessão (e portanto na
+mesma transação de banco) em que alteram a tabela transactions, sempre
+depois do INSERT/UPDATE/DELETE em transactions já ter sido enviado ao
+banco: os locks são tomados na mesma ordem da reconstrução (transactions,
+depois monthly_totals). A reconstrução completa a partir de transactions
+corrige qualquer desvio. Valores em centavos (inteiros), então somas e
+comparações são exatas.
+
+Os meses de cada usuário são delimitados no fuso do seu perfil, o mesmo
+usado pelo resumo; quando o fuso muda, as linhas do usuário são
+reconstruídas na transação que altera o perfil.
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from uuid import UUID
+import logging
+import pytz
+from sqlalchemy import and_, func, insert, select, text, true, update
+from sqlalchemy.orm import Session
+from .database import MonthlyTotal, Transaction as TransactionModel, UserProfile
+from .summary import DEFAULT_TIMEZONE, get_user_timezone, month_trunc
+
+logger = logging.getLogger(__name__)
+
+class RollupKey(NamedTuple):
+    """Chave de agregação do rollup"""
+    user_id: UUID
+    month: str
+    category_id: Optional[UUID]
+    type: str
+
+
+def month_key(created_at: datetime, tz_name: str) -> str:
+    """Mês (YYYY-MM) de um timestamp no fuso informado; timestamps sem fuso são UTC"""
+    if created_at.tzinfo is None:
+        created_at = pytz.utc.localize(created_at)
+    return created_at.astimezone(pytz.timezone(tz_name)).strftime("%Y-%m")
+
+
+def rollup_timezone(db: Session, user_id: Optional[UUID]) -> str:
+    """
+    Fuso usado para delimitar os meses do rollup de um usuário
+
+    É o fuso do perfil. Quem vai aplicar deltas trava o perfil em modo
+    compartilhado (FOR SHARE) até o commit: uma troca de fuso concorrente
+    espera os deltas em andamento, e os deltas seguintes esperam a
+    reconstrução das linhas do usuário e já leem o fuso novo.
+    """
+    if db.get_bind().dialect.name == "postgresql":
+        db.execute(
+            select(UserProfile.id).where(UserProfile.user_id == user_id).with_for_update(read=True)
+        )
+    return get_user_timezone(db, user_id)
+
+
+def transaction_key(transaction, tz_name: str) -> RollupKey:
+    """Chave do rollup para uma transação"""
+    tx_type = getattr(transaction.type, "value", transaction.type)
+    return RollupKey(transaction.user_id, month_key(transaction.created_at, tz_name), transaction.category_id, tx_type)
+
+
+def _key_filter(key: RollupKey):
+    conditions = []
+    for column, value in (
+        (MonthlyTotal.user_id, key.user_id),
+        (MonthlyTotal.month, key.month),
+        (MonthlyTotal.category_id, key.category_id),
+        (MonthlyTotal.type, key.type),
+    ):
+        conditions.append(column.is_(None) if value is None else column == value)
+    return and_(*conditions)
+
+
+def apply_deltas(db: Session, deltas: Dict[RollupKey, Tuple[int, int]]) -> None:
+    """
+    Aplica deltas (centavos, quantidade) ao rollup sem fazer commit
+
+    Cada chave é um UPDATE atômico (total = total + delta) em uma única
+    linha; se ainda não existe linha para a chave, ela é inserida.
+    """
+    for key, (amount, count) in deltas.items():
+        if amount == 0 and count == 0:
+            continue
+        target = select(MonthlyTotal.id).where(_key_filter(key)).limit(1).scalar_subquery()
+        result = db.execute(
+            update(MonthlyTotal)
+            .where(MonthlyTotal.id == target)
+            .values(
+                total_cents=MonthlyTotal.total_cents + amount,
+                transaction_count=MonthlyTotal.transaction_count + count,
+            )
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount == 0:
+            db.add(MonthlyTotal(
+                user_id=key.user_id,
+                month=key.month,
+                category_id=key.category_id,
+                type=key.type,
+                total_cents=amount,
+                transaction_count=count,
+            ))
+            db.flush()
+
+
+def record_created(db: Session, transactions: List) -> None:
+    """Soma transações recém-inseridas (já gravadas, com created_at) ao rollup"""
+    deltas: Dict[RollupKey, Tuple[int, int]] = defaultdict(lambda: (0, 0))
+    timezones: Dict[Optional[UUID], str] = {}
+    for transaction in transactions:
+        if transaction.user_id not in timezones:
+            timezones[transaction.user_id] = rollup_timezone(db, transaction.user_id)
+        key = transaction_key(transaction, timezones[transaction.user_id])
+        amount, count = deltas[key]
+        deltas[key] = (amount + transaction.amount_cents, count + 1)
+    apply_deltas(db, deltas)
+
+
+def record_deleted(db: Session, transaction) -> None:
+    """Subtrai do rollup uma transação já removida (DELETE enviado ao banco)"""
+    key = transaction_key(transaction, rollup_timezone(db, transaction.user_id))
+    apply_deltas(db, {key: (-transaction.amount_cents, -1)})
+
+
+def record_updated(db: Session, old_key: RollupKey, old_amount_cents: int, transaction) -> None:
+    """
+    Move o valor de uma transação alterada entre chaves do rollup
+
+    Trata mudanças de valor, tipo e categoria; se a chave não mudou,
+    aplica apenas a diferença de valor.
+    """
+    new_key = transaction_key(transaction, rollup_timezone(db, transaction.user_id))
+    if new_key == old_key:
+        apply_deltas(db, {new_key: (transaction.amount_cents - old_amount_cents, 0)})
+    else:
+        apply_deltas(db, {old_key: (-old_amount_cents, -1), new_key: (transaction.amount_cents, 1)})
+
+
+def _timezone_filters(db: Session):
+    """
+    Pares (fuso, filtro de transactions) que cobrem todos os usuários
+
+    Uma agregação por fuso presente nos perfis; quem não tem perfil (ou
+    tem o fuso padrão) fica no grupo do fuso padrão.
+    """
+    other_timezones = [
+        tz_name for (tz_name,) in db.query(UserProfile.timezone).distinct()
+        if tz_name and tz_name != DEFAULT_TIMEZONE
+    ]
+    filters = [
+        (tz_name, TransactionModel.user_id.in_(
+            select(UserProfile.user_id).where(UserProfile.timezone == tz_name)
+        ))
+        for tz_name in other_timezones
+    ]
+    default_filter = true()
+    if other_timezones:
+        default_filter = TransactionModel.user_id.not_in(
+            select(UserProfile.user_id).where(UserProfile.timezone.in_(other_timezones))
+        )
+    filters.append((DEFAULT_TIMEZONE, default_filter))
+    return filters
+
+
+def _expected_totals(db: Session, user_id: Optional[UUID] = None) -> Dict[RollupKey, Tuple[int, int]]:
+    """Totais recalculados diretamente da tabela transactions (de todos ou de um usuário)"""
+    if user_id is None:
+        groups = _timezone_filters(db)
+    else:
+        groups = [(get_user_timezone(db, user_id), TransactionModel.user_id == user_id)]
+
+    expected: Dict[RollupKey, Tuple[int, int]] = {}
+    for tz_name, condition in groups:
+        month = month_trunc(TransactionModel.created_at, tz_name).label("month")
+        rows = (
+            db.query(
+                TransactionModel.user_id,
+                month,
+                TransactionModel.category_id,
+                TransactionModel.type,
+                func.sum(TransactionModel.amount_cents),
+                func.count(TransactionModel.id),
+            )
+            .filter(condition)
+            .group_by(TransactionModel.user_id, month, TransactionModel.category_id, TransactionModel.type)
+            .all()
+        )
+        for row_user_id, row_month, category_id, tx_type, total, count in rows:
+            expected[RollupKey(row_user_id, row_month, category_id, tx_type)] = (int(total or 0), int(count))
+    return expected
+
+
+def _insert_totals(db: Session, totals: Dict[RollupKey, Tuple[int, int]]) -> None:
+    if totals:
+        db.execute(insert(MonthlyTotal), [
+            {
+                "user_id": key.user_id,
+                "month": key.month,
+                "category_id": key.category_id,
+                "type": key.type,
+                "total_cents": amount,
+                "transaction_count": count,
+            }
+            for key, (amount, count) in totals.items()
+        ])
+
+
+def _current_totals(db: Session) -> Dict[RollupKey, Tuple[int, int]]:
+    """Totais atualmente registrados no rollup"""
+    rows = (
+        db.query(
+            MonthlyTotal.user_id,
+            MonthlyTotal.month,
+            MonthlyTotal.category_id,
+            MonthlyTotal.type,
+            func.sum(MonthlyTotal.total_cents),
+            func.sum(MonthlyTotal.transaction_count),
+        )
+        .group_by(MonthlyTotal.user_id, MonthlyTotal.month, MonthlyTotal.category_id, MonthlyTotal.type)
+        .all()
+    )
+    return {
+        RollupKey(user_id, row_month, category_id, tx_type): (int(total or 0), int(count or 0))
+        for user_id, row_month, category_id, tx_type, total, count in rows
+    }
+
+
+def verify_monthly_totals(db: Session) -> List[Tuple[RollupKey, Tuple[int, int], Tuple[int, int]]]:
+    """
+    Compara o rollup com os totais reais
+
+    Returns:
+        Lista de (chave, esperado, registrado) para cada chave divergente
+    """
+    expected = _expected_totals(db)
+    current = _current_totals(db)
+
+    drift = []
+    for key in set(expected) | set(current):
+        exp_total = expected.get(key, (0, 0))
+        cur_total = current.get(key, (0, 0))
+        if exp_total != cur_total:
+            drift.append((key, exp_total, cur_total))
+    return drift
+
+
+def rebuild_monthly_totals(db: Session) -> int:
+    """
+    Reconstrói o rollup do zero a partir de transactions e faz commit
+
+    No PostgreSQL, transactions fica em SHARE MODE até o commit, antes do
+    snapshot: escritas concorrentes (que aplicam deltas ao rollup na mesma
+    transação) esperam a reconstrução terminar, em vez de ter seus deltas
+    apagados pelo DELETE ou ausentes do snapshot. Leituras não são bloqueadas.
+
+    Returns:
+        Quantidade de linhas gravadas no rollup
+    """
+    try:
+        if db.get_bind().dialect.name == "postgresql":
+            db.execute(text("LOCK TABLE transactions IN SHARE MODE"))
+        expected = _expected_totals(db)
+        db.query(MonthlyTotal).delete(synchronize_session=False)
+        _insert_totals(db, expected)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    logger.info("Rollup mensal reconstruído com %s linhas", len(expected))
+    return len(expected)
+
+
+def rebuild_user_monthly_totals(db: Session, user_id: UUID) -> int:
+    """
+    Reconstrói as linhas do rollup de um usuário no fuso atual do perfil, sem commit
+
+    Chamada na transação que troca o fuso, depois do UPDATE do perfil: o
+    lock da linha do perfil faz os deltas concorrentes do usuário (que o
+    travam em FOR SHARE, ver rollup_timezone) esperarem o commit.
+
+    Returns:
+        Quantidade de linhas gravadas no rollup
+    """
+    expected = _expected_totals(db, user_id)
+    db.query(MonthlyTotal).filter(MonthlyTotal.user_id == user_id).delete(synchronize_session=False)
+    _insert_totals(db, expected)
+    logger.info("Rollup mensal do usuário reconstruído com %s linhas", len(expected))
+    return len(expected)
@@ -0,0 +1,396 @@
+"""
+Importação de extratos bancários (CSV e OFX) em streaming
+
+Os parsers são geradores: cada linha do extrato é lida sob demanda,
+mapeada para TransactionCreate e acumulada em blocos de tamanho fixo.
+Cada bloco é validado, inserido e commitado antes que o próximo seja
+lido, de modo que o uso de memória não depende do tamanho do arquivo.
+
+Na versão assíncrona, a leitura e a validação de cada bloco (que não
+acessam o banco) rodam em uma thread, fora do event loop.
+"""
+import asyncio
+import csv
+import re
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from itertools import chain, islice
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, NamedTuple, Optional, TextIO, Tuple
+from uuid import UUID
+import logging
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+from .bulk import check_item_categories, insert_transactions, parse_transaction_items
+from .models import BulkItemError, StatementImportProgress, TransactionCreate
+from .summary import get_user_currency
+
+logger = logging.getLogger(__name__)
+
+SUPPORTED_FORMATS = ("csv", "ofx")
+
+# Tamanho dos blocos lidos do arquivo OFX (que pode vir em uma única linha)
+OFX_READ_SIZE = 64 * 1024
+
+# Limite de descrição de TransactionCreate
+DESCRIPTION_MAX_LENGTH = 500
+
+CSV_COLUMNS = {
+    "date": ("date", "data", "data lançamento", "data lancamento"),
+    "description": ("description", "descrição", "descricao", "histórico", "historico", "memo"),
+    "amount": ("amount", "valor"),
+    "type": ("type", "tipo"),
+    "category_id": ("category_id", "categoria_id"),
+}
+
+TYPE_ALIASES = {
+    "income": "income", "receita": "income", "credito": "income", "crédito": "income", "credit": "income", "c": "income",
+    "expense": "expense", "despesa": "expense", "debito": "expense", "débito": "expense", "debit": "expense", "d": "expense",
+}
+
+CSV_DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%d %H:%M:%S", "%Y-%m-%dT%H:%M:%S", "%d/%m/%Y", "%d/%m/%Y %H:%M:%S")
+
+_OFX_DATE = re.compile(r"^(\d{8})(\d{6})?(?:\.\d+)?(?:\[([+-]?\d+(?:\.\d+)?)(?::[^\]]*)?\])?")
+
+_AMOUNT = re.compile(r"^([+-]?)(\d[\d.,]*)$")
+# Milhares bem agrupados: 1.234 / 12.345.678 (sem zero à esquerda)
+_THOUSANDS = {
+    ".": re.compile(r"[1-9]\d{0,2}(?:\.\d{3})+"),
+    ",": re.compile(r"[1-9]\d{0,2}(?:,\d{3})+"),
+}
+
+
+class StatementParseError(ValueError):
+    """Erro de formato em uma linha do extrato"""
+
+
+# (número da linha, dados brutos de TransactionCreate ou erro, data de lançamento)
+StatementRow = Tuple[int, Any, Optional[datetime]]
+
+
+def detect_format(filename: Optional[str]) -> str:
+    """Deduz o formato do extrato pela extensão do arquivo (padrão: csv)"""
+    if filename and filename.lower().endswith((".ofx", ".qfx")):
+        return "ofx"
+    return "csv"
+
+
+def parse_amount(value: str) -> Decimal:
+    """
+    Converte um valor monetário textual em Decimal
+
+    Aceita os formatos brasileiro (1.234,56) e americano (1,234.56), com
+    ou sem separador de milhar, sinal e "R$". Com os dois separadores, o
+    último é o decimal. Com um só, ele é de milhar quando agrupa blocos de
+    três dígitos (1.234 e 1,234 valem 1234) e decimal nos demais casos
+    (1234,5 e 0,500). Agrupamentos inconsistentes viram erro da linha.
+    """
+    match = _AMOUNT.match(value.replace("R$", "").replace(" ", "").replace("\xa0", ""))
+    if not match:
+        raise StatementParseError(f"amount: valor inválido '{value}'")
+    sign, number = match.groups()
+
+    separators = {char for char in number if char in ".,"}
+    if len(separators) == 2:
+        decimal_separator = "." if number.rfind(".") > number.rfind(",") else ","
+    elif len(separators) == 1:
+        separator = separators.pop()
+        decimal_separator = None if _THOUSANDS[separator].fullmatch(number) else separator
+    else:
+        decimal_separator = None
+
+    integer, fraction = number.rsplit(decimal_separator, 1) if decimal_separator else (number, "")
+    # A parte inteira só pode ter dígitos ou milhares agrupados pelo outro separador
+    grouped = any(pattern.fullmatch(integer) for separator, pattern in _THOUSANDS.items() if separator != decimal_separator)
+    if not (integer.isdigit() or grouped) or (fraction and not fraction.isdigit()):
+        raise StatementParseError(f"amount: valor inválido '{value}'")
+    return Decimal(f"{sign}{integer.replace('.', '').replace(',', '')}.{fraction or '0'}")
+
+
+def parse_csv_date(value: str) -> datetime:
+    """Converte datas ISO ou dd/mm/aaaa do CSV (interpretadas como UTC)"""
+    value = value.strip()
+    for fmt in CSV_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt).replace(tzinfo=timezone.utc)
+        except ValueError:
+            continue
+    raise StatementParseError(f"date: data inválida '{value}'")
+
+
+def parse_ofx_date(value: str) -> datetime:
+    """Converte DTPOSTED (AAAAMMDD[HHMMSS][.XXX][offset:TZ]) em datetime UTC"""
+    match = _OFX_DATE.match(value.strip())
+    if not match:
+        raise StatementParseError(f"date: data OFX inválida '{value}'")
+    day, time_part, offset = match.groups()
+    parsed = datetime.strptime(day + (time_part or "000000"), "%Y%m%d%H%M%S")
+    hours = float(offset) if offset else 0.0
+    return parsed.replace(tzinfo=timezone(timedelta(hours=hours))).astimezone(timezone.utc)
+
+
+def _transaction_data(amount: Decimal, description: str, tx_type: Optional[str], category_id: Optional[str]) -> Dict[str, Any]:
+    """Monta os dados brutos de TransactionCreate; sem tipo explícito, o sinal define receita/despesa"""
+    if tx_type is None:
+        tx_type = "expense" if amount < 0 else "income"
+    data: Dict[str, Any] = {
+        "type": tx_type,
+        "amount": float(abs(amount)),
+        "description": description.strip()[:DESCRIPTION_MAX_LENGTH],
+    }
+    if category_id:
+        data["category_id"] = category_id
+    return data
+
+
+def _resolve_columns(fieldnames: List[str]) -> Dict[str, str]:
+    normalized = {name.strip().lower(): name for name in fieldnames if name}
+    columns = {}
+    for field, aliases in CSV_COLUMNS.items():
+        for alias in aliases:
+            if alias in normalized:
+                columns[field] = normalized[alias]
+                break
+    missing = [field for field in ("amount", "description") if field not in columns]
+    if missing:
+        raise StatementParseError(f"Colunas obrigatórias ausentes no CSV: {', '.join(missing)}")
+    return columns
+
+
+def iter_csv_rows(lines: Iterable[str]) -> Iterator[StatementRow]:
+    """
+    Lê um extrato CSV linha a linha
+
+    O delimitador (, ou ;) é detectado pelo cabeçalho. Gera
+    (linha, dados de TransactionCreate ou StatementParseError, data).
+    """
+    lines = iter(lines)
+    header = next(lines, None)
+    if header is None:
+        return
+    delimiter = ";" if header.count(";") > header.count(",") else ","
+    reader = csv.DictReader(chain([header], lines), delimiter=delimiter)
+    columns = _resolve_columns(reader.fieldnames or [])
+
+    for row in reader:
+        line = reader.line_num
+        try:
+            raw_type = (row.get(columns["type"]) or "").strip().lower() if "type" in columns else ""
+            tx_type = TYPE_ALIASES.get(raw_type, raw_type) or None
+            raw_date = row.get(columns["date"]) if "date" in columns else None
+            posted_at = parse_csv_date(raw_date) if raw_date else None
+            data = _transaction_data(
+                parse_amount(row.get(columns["amount"]) or ""),
+                row.get(columns["description"]) or "",
+                tx_type,
+                (row.get(columns["category_id"]) or "").strip() if "category_id" in columns else None,
+            )
+            yield line, data, posted_at
+        except StatementParseError as e:
+            yield line, e, None
+
+
+def _iter_ofx_tags(stream: TextIO) -> Iterator[Tuple[str, str]]:
+    """
+    Tokeniza um OFX (SGML 1.x ou XML 2.x) em pares (tag, valor)
+
+    Lê o arquivo em blocos de tamanho fixo em vez de linhas, pois muitos
+    bancos exportam o OFX inteiro em uma única linha.
+    """
+    buffer = ""
+    while True:
+        block = stream.read(OFX_READ_SIZE)
+        buffer += block
+        parts = buffer.split("<")
+        # O último pedaço pode estar incompleto até o próximo bloco
+        buffer = parts.pop() if block else ""
+        for part in parts:
+            tag, sep, value = part.partition(">")
+            if sep:
+                yield tag.strip().upper(), value.strip()
+        if not block:
+            return
+
+
+def iter_ofx_rows(stream: TextIO) -> Iterator[StatementRow]:
+    """
+    Lê os lançamentos (STMTTRN) de um extrato OFX sob demanda
+
+    Gera (posição do lançamento, dados de TransactionCreate ou
+    StatementParseError, data de lançamento).
+    """
+    position = 0
+    current: Optional[Dict[str, str]] = None
+    for tag, value in _iter_ofx_tags(stream):
+        if tag == "STMTTRN":
+            current = {}
+        elif tag == "/STMTTRN" and current is not None:
+            position += 1
+            try:
+                if "TRNAMT" not in current:
+                    raise StatementParseError("amount: TRNAMT ausente")
+                posted_at = parse_ofx_date(current["DTPOSTED"]) if current.get("DTPOSTED") else None
+                data = _transaction_data(
+                    parse_amount(current["TRNAMT"]),
+                    current.get("NAME") or current.get("MEMO") or "",
+                    None,
+                    None,
+                )
+                yield position, data, posted_at
+            except StatementParseError as e:
+                yield position, e, None
+            current = None
+        elif current is not None and not tag.startswith("/"):
+            current[tag] = value
+
+
+def iter_statement_rows(stream: TextIO, fmt: str) -> Iterator[StatementRow]:
+    """Seleciona o parser do formato informado"""
+    if fmt == "ofx":
+        return iter_ofx_rows(stream)
+    if fmt == "csv":
+        return iter_csv_rows(stream)
+    raise StatementParseError(f"Formato não suportado: {fmt}")
+
+
+class _PreparedChunk(NamedTuple):
+    """Bloco lido e validado sem acessar o banco"""
+    size: int
+    # (linha do extrato, data de lançamento) de cada linha que chegou à validação
+    lines: List[Tuple[int, Optional[datetime]]]
+    # Itens válidos, com a posição em lines
+    valid: List[Tuple[int, TransactionCreate]]
+    errors: List[BulkItemError]
+
+
+def _prepare_chunk(chunk: List[StatementRow], user_currency: str) -> _PreparedChunk:
+    """Separa os erros de formato e valida os demais itens do bloco"""
+    errors = [
+        BulkItemError(index=line, errors=[str(data)])
+        for line, data, _ in chunk
+        if isinstance(data, StatementParseError)
+    ]
+    parsed = [(line, data, posted_at) for line, data, posted_at in chunk if not isinstance(data, StatementParseError)]
+
+    valid, item_errors = parse_transaction_items([data for _, data, _ in parsed], user_currency)
+    # Os índices da validação são posições no bloco; reporta a linha do extrato
+    errors.extend(BulkItemError(index=parsed[error.index][0], errors=error.errors) for error in item_errors)
+    return _PreparedChunk(len(chunk), [(line, posted_at) for line, _, posted_at in parsed], valid, errors)
+
+
+def _store_chunk(db: Session, user_id: UUID, prepared: _PreparedChunk) -> Tuple[int, List[BulkItemError]]:
+    """Confere as categorias, insere e commita um bloco; retorna (criadas, erros por linha)"""
+    valid, category_errors = check_item_categories(db, user_id, prepared.valid, [])
+    errors = prepared.errors + [
+        BulkItemError(index=prepared.lines[error.index][0], errors=error.errors) for error in category_errors
+    ]
+
+    try:
+        created = insert_transactions(
+            db,
+            user_id,
+            [item for _, item in valid],
+            [prepared.lines[index][1] for index, _ in valid],
+        )
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    errors.sort(key=lambda error: error.index)
+    return len(created), errors
+
+
+def _import_chunk(db: Session, user_id: UUID, chunk: List[StatementRow]) -> Tuple[int, List[BulkItemError]]:
+    """Valida, insere e commita um bloco; retorna (criadas, erros por linha)"""
+    return _store_chunk(db, user_id, _prepare_chunk(chunk, get_user_currency(db, user_id)))
+
+
+def _iter_chunks(rows: Iterable[StatementRow], chunk_size: int) -> Iterator[List[StatementRow]]:
+    if chunk_size < 1:
+        raise ValueError("chunk_size deve ser positivo")
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def _next_prepared_chunk(chunks: Iterator[List[StatementRow]], user_currency: str) -> Optional[_PreparedChunk]:
+    """Lê e valida o próximo bloco (None no fim do arquivo)"""
+    chunk = next(chunks, None)
+    return None if chunk is None else _prepare_chunk(chunk, user_currency)
+
+class _ImportTotals:
+    """Acumula os contadores da importação e monta os eventos de progresso"""
+
+    def __init__(self):
+        self.chunk = self.rows_read = self.created = self.rejected = 0
+
+    def add(self, rows: int, created: int, errors: List[BulkItemError]) -> StatementImportProgress:
+        self.chunk += 1
+        self.rows_read += rows
+        self.created += created
+        self.rejected += len(errors)
+        logger.info(
+            "Importação: bloco %s (%s linhas, %s criadas, %s rejeitadas)",
+            self.chunk, self.rows_read, self.created, self.rejected,
+        )
+        return self.progress(errors=errors)
+
+    def progress(self, errors: Optional[List[BulkItemError]] = None, done: bool = False) -> StatementImportProgress:
+        return StatementImportProgress(
+            chunk=self.chunk,
+            rows_read=self.rows_read,
+            created=self.created,
+            rejected=self.rejected,
+            errors=errors or [],
+            done=done,
+        )
+
+
+def import_statement(
+    db: Session,
+    user_id: UUID,
+    rows: Iterable[StatementRow],
+    chunk_size: int,
+) -> Iterator[StatementImportProgress]:
+    """
+    Importa as linhas do extrato para o usuário em blocos de chunk_size,
+    com commit por bloco
+
+    Gera um StatementImportProgress após cada bloco e um evento final
+    com done=True. Blocos já commitados permanecem se um bloco posterior
+    falhar.
+    """
+    totals = _ImportTotals()
+    for chunk in _iter_chunks(rows, chunk_size):
+        created, errors = _import_chunk(db, user_id, chunk)
+        yield totals.add(len(chunk), created, errors)
+    yield totals.progress(done=True)
+
+
+async def import_statement_async(
+    db: AsyncSession,
+    user_id: UUID,
+    rows: Iterable[StatementRow],
+    chunk_size: int,
+) -> AsyncIterator[StatementImportProgress]:
+    """
+    Versão de import_statement para AsyncSession
+
+    Ler e validar um bloco é CPU (e leitura do arquivo) sem banco: roda em
+    uma thread com asyncio.to_thread, deixando o event loop livre para as
+    outras requisições. Só a gravação do bloco roda via run_sync.
+    """
+    totals = _ImportTotals()
+    user_currency = await db.run_sync(get_user_currency, user_id)
+    chunks = _iter_chunks(rows, chunk_size)
+    while True:
+        prepared = await asyncio.to_thread(_next_prepared_chunk, chunks, user_currency)
+        if prepared is None:
+            break
+        created, errors = await db.run_sync(_store_chunk, user_id, prepared)
+        yield totals.add(prepared.size, created, errors)
+    yield totals.progress(done=True)
+
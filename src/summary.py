@@ -0,0 +1,180 @@
+"""
+Agregações de transações para o dashboard
+
+Saldo e totais mensais são calculados no banco com SUM ... GROUP BY
+(tipo, mês), com os meses delimitados no fuso horário do usuário. As
+somas são inteiras, em centavos, e só viram valores decimais nos modelos
+de resposta.
+
+Os agregados não separam moedas: todas as transações de um usuário são
+gravadas na moeda do seu perfil (ver check_user_currency) até que exista
+agregação por moeda.
+"""
+from datetime import datetime
+from typing import Dict, List
+import pytz
+from sqlalchemy import String, func, literal, literal_column
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.expression import FunctionElement
+from .database import MonthlyTotal, Transaction as TransactionModel, UserProfile
+from .models import MonthlySummary, TransactionSummary
+from .money import from_cents
+
+DEFAULT_TIMEZONE = "America/Sao_Paulo"
+DEFAULT_CURRENCY = "BRL"
+
+
+class month_trunc(FunctionElement):
+    """
+    Mês (YYYY-MM) de um timestamp no fuso horário informado
+
+    No PostgreSQL compila para date_trunc('month', col AT TIME ZONE tz).
+    Nos demais dialetos (SQLite dos testes) aplica o deslocamento atual
+    do fuso como modificador do strftime.
+    """
+    type = String()
+    name = "month_trunc"
+    inherit_cache = True
+
+    def __init__(self, column, tz_name: str):
+        if tz_name not in pytz.all_timezones_set:
+            raise ValueError(f"Fuso horário inválido: {tz_name}")
+        offset = datetime.now(pytz.timezone(tz_name)).utcoffset()
+        offset_modifier = f"{int(offset.total_seconds())} seconds"
+        # Fuso e deslocamento entram como literais SQL (e não bind params) para
+        # que a expressão do SELECT e do GROUP BY sejam textualmente idênticas
+        # e para que façam parte da chave do cache de compilação
+        super().__init__(
+            column,
+            literal_column(f"'{tz_name}'", String),
+            literal_column(f"'{offset_modifier}'", String),
+        )
+
+
+@compiles(month_trunc, "postgresql")
+def _month_trunc_postgresql(element, compiler, **kw):
+    column, tz_name, _ = list(element.clauses)
+    return "to_char(date_trunc('month', %s AT TIME ZONE %s), 'YYYY-MM')" % (
+        compiler.process(column, **kw),
+        compiler.process(tz_name, **kw),
+    )
+
+
+@compiles(month_trunc)
+def _month_trunc_default(element, compiler, **kw):
+    column, _, offset_modifier = list(element.clauses)
+    return compiler.process(func.strftime(literal("%Y-%m"), column, offset_modifier), **kw)
+
+
+def get_user_timezone(db: Session, user_id) -> str:
+    """Retorna o fuso horário do perfil do usuário (ou o padrão)"""
+    tz_name = db.query(UserProfile.timezone).filter(UserProfile.user_id == user_id).scalar()
+    if not tz_name or tz_name not in pytz.all_timezones_set:
+        return DEFAULT_TIMEZONE
+    return tz_name
+
+
+def get_user_currency(db: Session, user_id) -> str:
+    """Retorna a moeda do perfil do usuário (ou a padrão)"""
+    currency = db.query(UserProfile.currency).filter(UserProfile.user_id == user_id).scalar()
+    return currency or DEFAULT_CURRENCY
+
+
+def check_user_currency(currency: str, user_currency: str) -> None:
+    """
+    Recusa transações em moeda diferente da do perfil
+
+    Raises:
+        ValueError: Se as moedas diferem; somar centavos de moedas
+            diferentes daria totais sem sentido
+    """
+    if currency != user_currency:
+        raise ValueError(
+            f"Moeda {currency} diferente da moeda do perfil ({user_currency}); "
+            "totais em várias moedas ainda não são suportados"
+        )
+
+
+def _previous_month(month: str) -> str:
+    year, mon = (int(part) for part in month.split("-"))
+    if mon == 1:
+        return f"{year - 1}-12"
+    return f"{year}-{mon - 1:02d}"
+
+
+def build_summary(totals: Dict[str, Dict[str, int]], tz_name: str, months: int) -> TransactionSummary:
+    """
+    Monta o resumo a partir dos totais {mês: {tipo: soma em centavos}}
+
+    Mantém a mesma semântica que o frontend usava ao reduzir a lista.
+    """
+    current_month = datetime.now(pytz.timezone(tz_name)).strftime("%Y-%m")
+    previous_month = _previous_month(current_month)
+
+    series: List[MonthlySummary] = []
+    current_balance = 0
+    for month in sorted(totals):
+        income = totals[month].get("income", 0)
+        expenses = totals[month].get("expense", 0)
+        current_balance += income - expenses
+        series.append(MonthlySummary(
+            month=month,
+            income=from_cents(income),
+            expenses=from_cents(expenses),
+            balance=from_cents(income - expenses),
+        ))
+
+    current = totals.get(current_month, {})
+    previous = totals.get(previous_month, {})
+    previous_month_balance = previous.get("income", 0) - previous.get("expense", 0)
+
+    if previous_month_balance != 0:
+        percentage_change = (current_balance - previous_month_balance) / abs(previous_month_balance) * 100
+    elif current_balance > 0:
+        percentage_change = 100.0
+    else:
+        percentage_change = 0.0
+
+    return TransactionSummary(
+        current_balance=from_cents(current_balance),
+        monthly_income=from_cents(current.get("income", 0)),
+        monthly_expenses=from_cents(current.get("expense", 0)),
+        previous_month_balance=from_cents(previous_month_balance),
+        percentage_change=round(percentage_change, 2),
+        timezone=tz_name,
+        months=series[-months:] if months else [],
+    )
+
+
+def summarize_from_rollup(db: Session, user_id, tz_name: str, months: int = 12) -> TransactionSummary:
+    """Lê os totais (mês, tipo) do usuário no rollup monthly_totals, sem varrer transactions"""
+    rows = (
+        db.query(MonthlyTotal.month, MonthlyTotal.type, func.sum(MonthlyTotal.total_cents))
+        .filter(MonthlyTotal.user_id == user_id)
+        .group_by(MonthlyTotal.month, MonthlyTotal.type)
+        .all()
+    )
+
+    totals: Dict[str, Dict[str, int]] = {}
+    for row_month, row_type, total in rows:
+        totals.setdefault(row_month, {})[row_type] = int(total or 0)
+
+    return build_summary(totals, tz_name, months)
+
+
+def summarize_transactions(db: Session, user_id, tz_name: str, months: int = 12) -> TransactionSummary:
+    """Executa a agregação (tipo, mês) sobre as transações do usuário em uma única query"""
+    month = month_trunc(TransactionModel.created_at, tz_name).label("month")
+    rows = (
+        db.query(month, TransactionModel.type, func.sum(TransactionModel.amount_cents))
+        .filter(TransactionModel.user_id == user_id)
+        .group_by(month, TransactionModel.type)
+        .all()
+    )
+
+    totals: Dict[str, Dict[str, int]] = {}
+    for row_month, row_type, total in rows:
+        totals.setdefault(row_month, {})[row_type] = int(total or 0)
+
+    return build_summary(totals, tz_name, months)
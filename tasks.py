@@ -106,6 +106,96 @@ def check_pending_migrations(c):
     # Verifica migrações pendentes
     c.run("uv run python scripts/check_pending_migrations.py", warn=True)
 
+@task
+def rebuild_monthly_totals(c, verify=False):
+    """Reconstrói o rollup monthly_totals a partir das transações (--verify apenas verifica)."""
+    if verify:
+        print("🔍 Verificando rollup mensal...")
+        c.run("uv run python scripts/rebuild_monthly_totals.py --verify", warn=True)
+    else:
+        print("🔄 Reconstruindo rollup mensal...")
+        c.run("uv run python scripts/rebuild_monthly_totals.py")
+
+@task
+def partitions(c, months_ahead=3, detach=None, list=False):
+    """Cria as partições mensais futuras de transactions (--detach AAAA-MM arquiva um mês)."""
+    cmd = f"uv run python scripts/manage_partitions.py --months-ahead {months_ahead}"
+    if list:
+        cmd += " --list"
+    elif detach:
+        print(f"📦 Desligando partição de {detach}...")
+        cmd += f" --detach {detach}"
+    else:
+        print("🗓️  Criando partições mensais de transactions...")
+    c.run(cmd)
+
+@task
+def import_statement(c, path, user_id, format=None, encoding="utf-8", chunk_size=None):
+    """Importa um extrato bancário CSV/OFX do usuário em blocos (--format csv|ofx, --chunk-size N)."""
+    print(f"📥 Importando extrato {path}...")
+    cmd = f'uv run python scripts/import_statement.py "{path}" --user-id {user_id} --encoding {encoding}'
+    if format:
+        cmd += f" --format {format}"
+    if chunk_size:
+        cmd += f" --chunk-size {chunk_size}"
+    c.run(cmd)
+
+@task
+def benchmark_db(c, requests=200, concurrency=10, sqlite=False):
+    """Compara throughput de requisições concorrentes com Session síncrona vs AsyncSession (--sqlite usa banco temporário)."""
+    print("⏱️  Executando benchmark da camada de banco...")
+    cmd = f"uv run python scripts/benchmark_async_db.py --requests {requests} --concurrency {concurrency}"
+    if sqlite:
+        cmd += " --sqlite"
+    c.run(cmd)
+
+@task
+def explain_queries(c, seed=False, revision=None, threshold=1000, show_plans=False, update_baseline=False):
+    """Roda EXPLAIN ANALYZE das consultas da API em um PostgreSQL local e compara com o baseline (--seed gera os dados)."""
+    print("🔍 Analisando planos de consulta...")
+    cmd = f"uv run python scripts/explain_queries.py --threshold {threshold}"
+    if seed:
+        cmd += " --seed"
+    if revision:
+        cmd += f" --revision {revision}"
+    if show_plans:
+        cmd += " --show-plans"
+    if update_baseline:
+        cmd += " --update-baseline"
+    c.run(cmd)
+
+@task
+def build_breached_passwords(c, source, output="data/breached_passwords.sha1", plain=False):
+    """Gera o arquivo ordenado de senhas vazadas a partir de uma lista HIBP (SHA1:contagem) ou texto puro (--plain)."""
+    print(f"🔐 Gerando {output} a partir de {source}...")
+    cmd = f'uv run python scripts/build_breached_passwords.py "{source}" --output "{output}"'
+    if plain:
+        cmd += " --plain"
+    c.run(cmd)
+
+@task
+def benchmark_password_validator(c, iterations=20000):
+    """Mede o tempo por validação de senha, com e sem lista de senhas vazadas."""
+    print("⏱️  Executando benchmark do validador de senhas...")
+    c.run(f"uv run python scripts/benchmark_password_validator.py --iterations {iterations}")
+
+@task
+def profile_startup(c, runs=5, top=15, server=True):
+    """Mede o cold start: tempo de import, tempo até a primeira resposta e pacotes mais lentos."""
+    print("⏱️  Medindo a inicialização do backend...")
+    cmd = f"uv run python scripts/profile_startup.py --runs {runs} --top {top}"
+    if not server:
+        cmd += " --no-server"
+    c.run(cmd)
+
+@task
+def email_stub(c, port=8025, fail_with=0):
+    """Sobe um stub local da API do Resend (use RESEND_API_URL=http://localhost:PORT)."""
+    cmd = f"uv run python scripts/resend_stub.py --port {port}"
+    if fail_with:
+        cmd += f" --fail-with {fail_with}"
+    c.run(cmd)
+
 @task
 def initialize_production_database(c):
     """Inicializa o banco de dados em produção."""
@@ -1,39 +1,62 @@
 
+import os
+import tempfile
 import pytest
 from fastapi.testclient import TestClient
 from unittest.mock import patch, AsyncMock
 from src.main import app
-from src.database_sqlalchemy import get_db, Base
+from src.database_sqlalchemy import get_db, get_async_db, get_async_read_db, get_async_read_sessionmaker, Base
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 from src.auth.models import User
 from src.auth.dependencies import get_current_user
 from uuid import uuid4
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# Arquivo SQLite compartilhado entre a sessão síncrona dos testes (db_session)
+# e a sessão assíncrona (aiosqlite) usada pelas rotas
+TEST_DATABASE_PATH = os.path.join(tempfile.mkdtemp(), "test.db")
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{TEST_DATABASE_PATH}"
+ASYNC_SQLALCHEMY_DATABASE_URL = f"sqlite+aiosqlite:///{TEST_DATABASE_PATH}"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# NullPool: cada TestClient roda em um event loop próprio e conexões
+# aiosqlite não podem ser reaproveitadas entre loops
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+TestingAsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
 @pytest.fixture(scope="session", autouse=True)
 def setup_database():
-    with patch('src.main.create_tables'):
+    # Sem acesso ao banco configurado da aplicação no startup
+    with patch('src.main.start_revocation_sync', new_callable=AsyncMock):
         Base.metadata.create_all(bind=engine)
         yield
         Base.metadata.drop_all(bind=engine)
+        engine.dispose()
+        os.remove(TEST_DATABASE_PATH)
+
+@pytest.fixture(autouse=True)
+def reset_auth_rate_limiter():
+    """Cada teste começa com os limites de autenticação zerados"""
+    from src.auth.dependencies import auth_rate_limiter
+    auth_rate_limiter.reset()
+    yield
 
 @pytest.fixture(scope="function")
 def db_session():
     """Create a new database session for a test."""
-    connection = engine.connect()
-    transaction = connection.begin()
-    session = TestingSessionLocal(bind=connection)
+    session = TestingSessionLocal()
     yield session
     session.close()
-    transaction.rollback()
-    connection.close()
+    # As rotas commitam por outra conexão; limpa as tabelas ao fim do teste
+    with engine.begin() as connection:
+        for table in reversed(Base.metadata.sorted_tables):
+            connection.execute(table.delete())
 
 @pytest.fixture(scope="function")
 def test_client(db_session):
@@ -45,7 +68,14 @@ def test_client(db_session):
         finally:
             db_session.close()
 
+    async def override_get_async_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
+    app.dependency_overrides[get_async_read_sessionmaker] = lambda: TestingAsyncSessionLocal
     with TestClient(app) as test_client:
         yield test_client
 
@@ -8,7 +8,7 @@ from src.categories.models import CategoryResponse, CategoryWithTransactionCount
 
 class TestCategoriesEndpoints:
 
-    @patch('src.categories.routes.CategoryService')
+    @patch('src.categories.routes.CategoryService', autospec=True)
     def test_create_category_success(self, MockCategoryService, authenticated_client: tuple):
         # Arrange
         client, user_id = authenticated_client
@@ -42,7 +42,7 @@ class TestCategoriesEndpoints:
         assert response.status_code == 201
         mock_service.create_category.assert_called_once()
 
-    @patch('src.categories.routes.CategoryService')
+    @patch('src.categories.routes.CategoryService', autospec=True)
     def test_get_categories_success(self, MockCategoryService, authenticated_client: tuple):
         # Arrange
         client, user_id = authenticated_client
@@ -89,7 +89,7 @@ class TestCategoriesEndpoints:
         # Assert
         assert response.status_code == 200
 
-    @patch('src.categories.routes.CategoryService')
+    @patch('src.categories.routes.CategoryService', autospec=True)
     def test_get_category_success(self, MockCategoryService, authenticated_client: tuple):
         # Arrange
         client, user_id = authenticated_client
@@ -116,7 +116,7 @@ class TestCategoriesEndpoints:
         # Assert
         assert response.status_code == 200
 
-    @patch('src.categories.routes.CategoryService')
+    @patch('src.categories.routes.CategoryService', autospec=True)
     def test_update_category_success(self, MockCategoryService, authenticated_client: tuple):
         # Arrange
         client, user_id = authenticated_client
@@ -144,7 +144,7 @@ class TestCategoriesEndpoints:
         # Assert
         assert response.status_code == 200
 
-    @patch('src.categories.routes.CategoryService')
+    @patch('src.categories.routes.CategoryService', autospec=True)
     def test_delete_category_success(self, MockCategoryService, authenticated_client: tuple):
         # Arrange
         client, user_id = authenticated_client
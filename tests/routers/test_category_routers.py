@@ -7,7 +7,7 @@ from src.categories.models import CategoryCreate, CategoryUpdate, CategoryType
 
 class TestCategoryEndpoints:
 
-    @patch('src.categories.routes.CategoryService')
+    @patch('src.categories.routes.CategoryService', autospec=True)
     def test_create_category_endpoint_success(self, MockCategoryService, authenticated_client: tuple):
         # Arrange
         client, user_id = authenticated_client
@@ -72,7 +72,7 @@ class TestCategoryEndpoints:
         # Assert
         assert response.status_code == 422
 
-    @patch('src.categories.routes.CategoryService')
+    @patch('src.categories.routes.CategoryService', autospec=True)
     def test_get_categories_endpoint_success(self, MockCategoryService, authenticated_client: tuple):
         # Arrange
         client, user_id = authenticated_client
@@ -114,7 +114,7 @@ class TestCategoryEndpoints:
         mock_service.get_categories.assert_called_once_with(include_inactive=False, category_type=None)
 
 
-    @patch('src.categories.routes.CategoryService')
+    @patch('src.categories.routes.CategoryService', autospec=True)
     def test_update_category_endpoint_success(self, MockCategoryService, authenticated_client: tuple):
         # Arrange
         client, user_id = authenticated_client
@@ -164,7 +164,7 @@ class TestCategoryEndpoints:
         # Pass category_id as UUID object
         mock_service.update_category.assert_called_once_with(category_id, expected_update_data)
 
-    @patch('src.categories.routes.CategoryService')
+    @patch('src.categories.routes.CategoryService', autospec=True)
     def test_delete_category_endpoint_success(self, MockCategoryService, authenticated_client: tuple):
         # Arrange
         client, user_id = authenticated_client
@@ -1,18 +1,33 @@
 import pytest
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 from uuid import uuid4
 from src.categories.services import CategoryService
 from src.categories.models import CategoryCreate, CategoryUpdate, CategoryType, Category
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime
 
+def _result(first=None, rows=None):
+    """Resultado de AsyncSession.execute com scalars().first() e all() configurados"""
+    result = MagicMock()
+    result.scalars.return_value.first.return_value = first
+    result.all.return_value = rows or []
+    return result
+
+def _row(**fields):
+    """Linha da projeção de colunas de categoria"""
+    defaults = dict(id=uuid4(), description=None, icon='category', color='#1976d2', is_default=False, is_active=True, created_at=datetime.now(), updated_at=datetime.now())
+    return SimpleNamespace(**{**defaults, **fields})
+
 class TestCategoryService:
 
     @pytest.fixture
     def mock_db_session(self):
-        return MagicMock(spec=Session)
+        # Com spec de AsyncSession, execute/commit/refresh viram AsyncMock
+        return MagicMock(spec=AsyncSession)
 
-    def test_create_category_success(self, mock_db_session):
+    @pytest.mark.asyncio
+    async def test_create_category_success(self, mock_db_session):
         # Arrange
         user_id = uuid4()
         category_service = CategoryService(mock_db_session, user_id)
@@ -23,19 +38,20 @@ class TestCategoryService:
             color="#FF6B6B",
             type=CategoryType.EXPENSE
         )
-        mock_db_session.query.return_value.filter.return_value.first.return_value = None
+        mock_db_session.execute.return_value = _result(first=None)
 
         # Act
-        result = category_service.create_category(category_data)
+        result = await category_service.create_category(category_data)
 
         # Assert
         assert result.name == 'Alimentação'
         assert result.type == CategoryType.EXPENSE
         mock_db_session.add.assert_called_once()
-        mock_db_session.commit.assert_called_once()
-        mock_db_session.refresh.assert_called_once()
+        mock_db_session.commit.assert_awaited_once()
+        mock_db_session.refresh.assert_awaited_once()
 
-    def test_create_category_duplicate_name(self, mock_db_session):
+    @pytest.mark.asyncio
+    async def test_create_category_duplicate_name(self, mock_db_session):
         # Arrange
         user_id = uuid4()
         category_service = CategoryService(mock_db_session, user_id)
@@ -43,36 +59,31 @@ class TestCategoryService:
             name="Alimentação",
             type=CategoryType.EXPENSE
         )
-        mock_db_session.query.return_value.filter.return_value.first.return_value = Category(id=uuid4(), name="Alimentação", user_id=user_id, type=CategoryType.EXPENSE, is_default=False, is_active=True, created_at=datetime.now(), updated_at=datetime.now())
+        mock_db_session.execute.return_value = _result(first=Category(id=uuid4(), name="Alimentação", user_id=user_id, type=CategoryType.EXPENSE, is_default=False, is_active=True, created_at=datetime.now(), updated_at=datetime.now()))
 
         # Act & Assert
         with pytest.raises(ValueError) as exc_info:
-            category_service.create_category(category_data)
+            await category_service.create_category(category_data)
 
         assert "Já existe uma categoria com o nome 'Alimentação'" in str(exc_info.value)
 
-    def test_get_categories(self, mock_db_session):
+    @pytest.mark.asyncio
+    async def test_get_categories(self, mock_db_session):
         # Arrange
         user_id = uuid4()
         category_service = CategoryService(mock_db_session, user_id)
         
         # Mock das categorias e contagem de transações
         mock_results = [
-            (Category(id=uuid4(), name='Alimentação', type='expense', user_id=user_id, is_default=False, is_active=True, created_at=datetime.now(), updated_at=datetime.now()), 5),
-            (Category(id=uuid4(), name='Salário', type='income', user_id=user_id, is_default=False, is_active=True, created_at=datetime.now(), updated_at=datetime.now()), 10)
+            _row(name='Alimentação', type='expense', user_id=user_id, transaction_count=5),
+            _row(name='Salário', type='income', user_id=user_id, transaction_count=10)
         ]
 
-        # Configuração do mock para a cadeia de chamadas
-        mock_query = mock_db_session.query.return_value
-        mock_outerjoin = mock_query.outerjoin.return_value
-        mock_filter_active = mock_outerjoin.filter.return_value
-        mock_filter_user = mock_filter_active.filter.return_value
-        mock_group_by = mock_filter_user.group_by.return_value
-        mock_order_by = mock_group_by.order_by.return_value
-        mock_order_by.all.return_value = mock_results
+        # Configuração do mock para o resultado da query
+        mock_db_session.execute.return_value = _result(rows=mock_results)
 
         # Act
-        result = category_service.get_categories()
+        result = await category_service.get_categories()
 
         # Assert
         assert len(result) == 2
@@ -81,7 +92,8 @@ class TestCategoryService:
         assert result[1].name == 'Salário'
         assert result[1].transaction_count == 10
 
-    def test_update_category_success(self, mock_db_session):
+    @pytest.mark.asyncio
+    async def test_update_category_success(self, mock_db_session):
         # Arrange
         user_id = uuid4()
         category_id = uuid4()
@@ -91,46 +103,48 @@ class TestCategoryService:
         
         # Configurar o mock para a chamada de `first()`
         # A primeira chamada a `first()` é em `get_category`, a segunda é na verificação de nome existente.
-        mock_db_session.query.return_value.filter.return_value.first.side_effect = [
-            mock_category,
-            None
+        mock_db_session.execute.side_effect = [
+            _result(first=mock_category),
+            _result(first=None)
         ]
 
         # Act
-        result = category_service.update_category(category_id, update_data)
+        result = await category_service.update_category(category_id, update_data)
 
         # Assert
         assert result.name == 'Nova Alimentação'
-        mock_db_session.commit.assert_called_once()
-        mock_db_session.refresh.assert_called_once()
+        mock_db_session.commit.assert_awaited_once()
+        mock_db_session.refresh.assert_awaited_once()
 
-    def test_delete_category_success(self, mock_db_session):
+    @pytest.mark.asyncio
+    async def test_delete_category_success(self, mock_db_session):
         # Arrange
         user_id = uuid4()
         category_id = uuid4()
         category_service = CategoryService(mock_db_session, user_id)
         mock_category = Category(id=category_id, name="Alimentação", user_id=user_id, type=CategoryType.EXPENSE, is_default=False, is_active=True, created_at=datetime.now(), updated_at=datetime.now())
-        mock_db_session.query.return_value.filter.return_value.first.return_value = mock_category
-        mock_db_session.query.return_value.filter.return_value.count.return_value = 0
+        mock_db_session.execute.return_value = _result(first=mock_category)
+        mock_db_session.scalar.return_value = 0
 
         # Act
-        result = category_service.delete_category(category_id)
+        result = await category_service.delete_category(category_id)
 
         # Assert
         assert result is True
-        mock_db_session.commit.assert_called_once()
+        mock_db_session.commit.assert_awaited_once()
 
-    def test_restore_category_success(self, mock_db_session):
+    @pytest.mark.asyncio
+    async def test_restore_category_success(self, mock_db_session):
         # Arrange
         user_id = uuid4()
         category_id = uuid4()
         category_service = CategoryService(mock_db_session, user_id)
         mock_category = Category(id=category_id, name="Alimentação", user_id=user_id, type=CategoryType.EXPENSE, is_default=False, is_active=False, created_at=datetime.now(), updated_at=datetime.now())
-        mock_db_session.query.return_value.filter.return_value.first.return_value = mock_category
+        mock_db_session.execute.return_value = _result(first=mock_category)
 
         # Act
-        result = category_service.restore_category(category_id)
+        result = await category_service.restore_category(category_id)
 
         # Assert
         assert result.is_active is True
-        mock_db_session.commit.assert_called_once()
\ No newline at end of file
+        mock_db_session.commit.assert_awaited_once()
\ No newline at end of file
@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, Mock, patch
 from fastapi import HTTPException
 from src.auth.service import AuthService
 from src.auth.models import UserRegister, UserLogin, UserProfile, UserProfileUpdate
@@ -53,6 +53,33 @@ class TestAuthService:
         mock_db.commit.assert_called_once()
         mock_db.close.assert_called_once()
     
+    @pytest.mark.asyncio
+    @patch('src.auth.service.notify_dispatcher')
+    @patch('src.auth.service.settings.RESEND_API_KEY', 'resend-key')
+    @patch('src.auth.service.SessionLocal')
+    async def test_register_user_enqueues_welcome_email(self, mock_session_local, mock_notify, auth_service, mock_supabase):
+        """O email de boas-vindas entra na outbox na mesma transação do perfil"""
+        from src.database import EmailOutbox, UserProfile as UserProfileModel
+        user_data = UserRegister(
+            email="test@example.com",
+            password="SecurePass123!",
+            full_name="Test User"
+        )
+        mock_supabase.auth.sign_up.return_value = Mock(user=Mock(id='550e8400-e29b-41d4-a716-446655440000'))
+        mock_db = Mock()
+        mock_session_local.return_value = mock_db
+        
+        # Act
+        await auth_service.register_user(user_data)
+        
+        # Assert
+        added = [call.args[0] for call in mock_db.add.call_args_list]
+        assert [type(item) for item in added] == [UserProfileModel, EmailOutbox]
+        assert added[1].to_email == "test@example.com"
+        assert "Test User" in added[1].html
+        mock_db.commit.assert_called_once()
+        mock_notify.assert_called_once()
+    
     @pytest.mark.asyncio
     @patch('src.auth.service.SessionLocal')
     async def test_register_user_email_exists(self, mock_session_local, auth_service, mock_supabase):
@@ -134,8 +161,12 @@ class TestAuthService:
         # Assert
         assert 'access_token' in result
         assert result['access_token'] is not None
+        assert result['refresh_token'] is not None
         assert result['user']['id'] == '550e8400-e29b-41d4-a716-446655440000'
-        mock_db.close.assert_called_once()
+        # Uma sessão para buscar o perfil, outra para registrar o refresh token
+        assert mock_db.close.call_count == 2
+        mock_db.add.assert_called_once()
+        mock_db.commit.assert_called_once()
     
     @pytest.mark.asyncio
     @patch('src.auth.service.SessionLocal')
@@ -167,16 +198,21 @@ class TestAuthService:
 
     
     @pytest.mark.asyncio
-    async def test_logout_user_success(self, auth_service, mock_supabase):
+    @patch('src.auth.service.SessionLocal')
+    async def test_logout_user_success(self, mock_session_local, auth_service, mock_supabase):
         """Testa logout de usuário com sucesso"""
         # Arrange
         user_id = "550e8400-e29b-41d4-a716-446655440000"
+        mock_db = Mock()
+        mock_session_local.return_value = mock_db
+        mock_db.query.return_value.filter.return_value.all.return_value = []
         
         # Act
         result = await auth_service.logout_user(user_id)
         
         # Assert
         assert result['message'] == 'Logout realizado com sucesso'
+        mock_db.commit.assert_called_once()
     
     @pytest.mark.asyncio
     @patch('src.auth.service.SessionLocal')
@@ -254,4 +290,57 @@ class TestAuthService:
         assert result['timezone'] == 'America/New_York'
         assert result['currency'] == 'USD'
         mock_db.commit.assert_called_once()
-        mock_db.close.assert_called_once() 
\ No newline at end of file
+        mock_db.close.assert_called_once() 
+    
+    @pytest.mark.asyncio
+    @patch('src.auth.service.SessionLocal')
+    async def test_profile_is_cached_until_updated(self, mock_session_local, auth_service, mock_supabase):
+        """Testa que o perfil vem do cache até ser alterado"""
+        user_id = "550e8400-e29b-41d4-a716-446655440000"
+        mock_db = Mock()
+        mock_session_local.return_value = mock_db
+        mock_profile = Mock(user_id=user_id, email='test@example.com', full_name='Test User')
+        mock_db.query.return_value.filter.return_value.first.return_value = mock_profile
+        mock_db.query.return_value.filter.return_value.all.return_value = []
+        
+        first = await auth_service.get_user_profile(user_id)
+        first['full_name'] = 'Alterado pelo chamador'
+        second = await auth_service.get_user_profile(user_id)
+        assert second['full_name'] == 'Test User'
+        assert mock_session_local.call_count == 1
+        
+        mock_profile.full_name = 'Updated Name'
+        await auth_service.update_user_profile(user_id, UserProfileUpdate(full_name='Updated Name'))
+        assert (await auth_service.get_user_profile(user_id))['full_name'] == 'Updated Name'
+        assert mock_session_local.call_count == 2  # a atualização já repõe o cache
+        
+        await auth_service.delete_user(user_id)
+        mock_db.query.return_value.filter.return_value.first.return_value = None
+        with pytest.raises(HTTPException) as exc_info:
+            await auth_service.get_user_profile(user_id)
+        assert exc_info.value.status_code == 404
+        assert auth_service.profile_cache.stats()["invalidations"] == 2
+
+class TestAuthServiceLifecycle:
+    @patch('src.auth.dependencies._auth_service', None)
+    @patch('src.auth.service.create_client')
+    def test_auth_service_is_shared_and_closed_on_shutdown(self, mock_create_client):
+        """O lifespan cria um único AuthService e fecha o cliente HTTP no shutdown"""
+        from fastapi.testclient import TestClient
+        from src.main import app
+        from src.auth.dependencies import get_auth_service_instance
+
+        with TestClient(app):
+            service = get_auth_service_instance()
+            assert get_auth_service_instance() is service
+            # O cliente do Supabase só é criado no primeiro uso
+            mock_create_client.assert_not_called()
+            assert service.supabase is service.supabase
+            mock_create_client.assert_called_once()
+            options = mock_create_client.call_args.args[2]
+            assert options.auto_refresh_token is False
+            assert options.persist_session is False
+
+        service.supabase.auth.close.assert_called_once()
+        # Após o shutdown uma nova instância é criada sob demanda
+        assert get_auth_service_instance() is not service
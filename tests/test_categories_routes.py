@@ -1,7 +1,7 @@
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from src.database import UserProfile
-from uuid import uuid4
+from uuid import UUID, uuid4
 from unittest.mock import patch
 from src.auth.models import User
 
@@ -213,3 +213,44 @@ class TestCategoriesRoutes:
         # Verify that the category is active again
         response = client.get(f"/categories/{category_id}")
         assert response.status_code == 200
+
+    def test_get_category_stats(self, authenticated_client, db_session: Session):
+        """Testa contagem, total e participação por categoria no período"""
+        from datetime import datetime
+        from src.database import Transaction
+
+        # Arrange
+        client, user_id = authenticated_client
+        food_id = client.post("/categories/", json={"name": "Alimentação", "icon": "restaurant", "color": "#FF5733", "type": "expense"}).json()["id"]
+        home_id = client.post("/categories/", json={"name": "Moradia", "icon": "home", "color": "#000000", "type": "expense"}).json()["id"]
+        client.post("/categories/", json={"name": "Lazer", "icon": "movie", "color": "#00FF00", "type": "expense"})
+        salary_id = client.post("/categories/", json={"name": "Salário", "icon": "work", "color": "#00FF00", "type": "income"}).json()["id"]
+
+        for category_id, tx_type, amount, created_at in (
+            (food_id, "expense", 100.0, datetime(2024, 1, 5)),
+            (food_id, "expense", 50.0, datetime(2024, 1, 31, 23, 0)),
+            (home_id, "expense", 450.0, datetime(2024, 1, 10)),
+            (salary_id, "income", 3000.0, datetime(2024, 1, 1)),
+            (food_id, "expense", 999.0, datetime(2024, 2, 1)),  # fora do período
+        ):
+            db_session.add(Transaction(id=uuid4(), user_id=user_id, category_id=UUID(category_id), type=tx_type, amount_cents=int(amount * 100), description="[TEST]", created_at=created_at))
+        # Transação de outro usuário na mesma categoria não entra nas estatísticas
+        db_session.add(Transaction(id=uuid4(), user_id=uuid4(), category_id=UUID(food_id), type="expense", amount_cents=77700, description="[TEST]", created_at=datetime(2024, 1, 6)))
+        db_session.commit()
+
+        # Act
+        response = client.get("/categories/stats", params={"from": "2024-01-01", "to": "2024-01-31"})
+
+        # Assert
+        assert response.status_code == 200
+        stats = {item["name"]: item for item in response.json()}
+        assert stats["Alimentação"]["transaction_count"] == 2
+        assert stats["Alimentação"]["total_amount"] == 150.0
+        assert stats["Alimentação"]["percentage"] == 25.0
+        assert stats["Moradia"]["percentage"] == 75.0
+        assert stats["Lazer"]["transaction_count"] == 0
+        assert stats["Lazer"]["percentage"] == 0.0
+        assert stats["Salário"]["percentage"] == 100.0
+
+        response = client.get("/categories/stats", params={"from": "2024-02-01", "to": "2024-01-01"})
+        assert response.status_code == 422
@@ -0,0 +1,119 @@
+import asyncio
+from datetime import datetime, timedelta
+import httpx
+import pytest
+from scripts.resend_stub import create_app
+from src.database import EmailOutbox
+from src.email_outbox import EmailDispatcher, enqueue_email
+from src.email_templates import render_recovery_email, render_welcome_email
+from tests.conftest import TestingAsyncSessionLocal
+
+
+def _dispatcher(stub, **kwargs):
+    return EmailDispatcher(
+        session_factory=TestingAsyncSessionLocal,
+        api_key="test-key",
+        base_url="http://resend.test",
+        sender="MyFinance <test@myfinance.dev>",
+        transport=httpx.ASGITransport(app=stub),
+        **kwargs,
+    )
+
+
+async def _wait_for(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condição não atingida"
+        await asyncio.sleep(0.02)
+
+
+def _statuses(db_session):
+    db_session.expire_all()
+    return {message.to_email: message for message in db_session.query(EmailOutbox).all()}
+
+
+def test_templates_escape_values():
+    subject, html = render_welcome_email("<script>alert(1)</script>", "http://localhost:5173")
+    assert subject.startswith("Bem-vindo")
+    assert "<script>" not in html
+    assert "&lt;script&gt;" in html
+
+    _, html = render_recovery_email("Ana", "http://app", "ana+teste@example.com", "tok")
+    assert "http://app/auth/reset-password?token=tok&amp;email=ana%2Bteste%40example.com" in html
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_sends_pending_emails_in_one_batch(db_session):
+    for index in range(3):
+        enqueue_email(db_session, f"user{index}@example.com", "Assunto", "<p>oi</p>")
+    db_session.commit()
+
+    stub = create_app()
+    dispatcher = _dispatcher(stub, interval=60)
+    await dispatcher.start()
+    try:
+        await _wait_for(lambda: len(stub.state.emails) == 3)
+        await _wait_for(lambda: dispatcher.sent == 3)
+    finally:
+        await dispatcher.stop()
+
+    assert stub.state.requests == 1
+    assert stub.state.emails[0]["from"] == "MyFinance <test@myfinance.dev>"
+    messages = _statuses(db_session)
+    assert {message.status for message in messages.values()} == {"sent"}
+    assert all(message.sent_at is not None for message in messages.values())
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_retries_with_backoff_then_fails(db_session):
+    enqueue_email(db_session, "user@example.com", "Assunto", "<p>oi</p>")
+    db_session.commit()
+
+    stub = create_app(fail_with=500)
+    dispatcher = _dispatcher(stub, interval=60, max_attempts=2)
+    await dispatcher.start()
+    try:
+        await _wait_for(lambda: _statuses(db_session)["user@example.com"].last_error is not None)
+        message = _statuses(db_session)["user@example.com"]
+        assert message.status == "pending"
+        assert message.attempts == 1
+        assert message.next_attempt_at > datetime.utcnow() + timedelta(seconds=10)
+
+        # Vence a próxima tentativa e acorda o dispatcher
+        message.next_attempt_at = datetime.utcnow() - timedelta(seconds=1)
+        db_session.commit()
+        dispatcher.wake()
+        await _wait_for(lambda: _statuses(db_session)["user@example.com"].status == "failed")
+    finally:
+        await dispatcher.stop()
+
+    message = _statuses(db_session)["user@example.com"]
+    assert message.attempts == 2
+    assert "HTTP 500" in message.last_error
+    assert stub.state.requests == 2
+    assert dispatcher.failed == 1
+
+
+@pytest.mark.asyncio
+async def test_dispatcher_isolates_the_rejected_message_in_a_batch(db_session):
+    for address in ("a@example.com", "b@example.com", "invalido@example", "c@example.com"):
+        enqueue_email(db_session, address, "Assunto", "<p>oi</p>")
+    db_session.commit()
+
+    stub = create_app(reject={"invalido@example"})
+    dispatcher = _dispatcher(stub, interval=60)
+    await dispatcher.start()
+    try:
+        await _wait_for(lambda: dispatcher.sent == 3 and dispatcher.failed == 1)
+    finally:
+        await dispatcher.stop()
+
+    # Lote inteiro recusado, depois metades, até isolar a mensagem inválida
+    assert stub.state.requests == 5
+    assert sorted(email["to"][0] for email in stub.state.emails) == ["a@example.com", "b@example.com", "c@example.com"]
+    messages = _statuses(db_session)
+    rejected = messages.pop("invalido@example")
+    assert rejected.status == "failed"
+    assert rejected.attempts == 1
+    assert "HTTP 422" in rejected.last_error
+    assert {message.status for message in messages.values()} == {"sent"}
@@ -0,0 +1,77 @@
+import json
+import logging
+import queue
+import pytest
+from src.logging_config import (
+    DeferredQueueHandler,
+    JsonFormatter,
+    RequestIdFilter,
+    SamplingFilter,
+    parse_sampling,
+    request_id_var,
+)
+
+
+def make_record(name="src.main", level=logging.INFO, msg="Transação criada: %s", args=("abc",)):
+    return logging.LogRecord(name, level, __file__, 1, msg, args, None)
+
+
+def test_parse_sampling():
+    assert parse_sampling("src.main=0.1, src.auth=0.5") == {"src.main": 0.1, "src.auth": 0.5}
+    assert parse_sampling("") == {}
+    with pytest.raises(ValueError):
+        parse_sampling("src.main")
+    with pytest.raises(ValueError):
+        parse_sampling("src.main=2")
+
+
+def test_sampling_keeps_one_in_n_info_records_per_logger():
+    sampling = SamplingFilter({"src": 0.5, "src.auth": 0.25})
+
+    kept_main = [sampling.filter(make_record("src.main")) for _ in range(8)]
+    kept_auth = [sampling.filter(make_record("src.auth.service")) for _ in range(8)]
+    warnings = [sampling.filter(make_record("src.main", logging.WARNING)) for _ in range(3)]
+    other = sampling.filter(make_record("httpx"))
+
+    assert kept_main.count(True) == 4
+    assert kept_auth.count(True) == 2
+    assert all(warnings)
+    assert other
+    assert sampling.dropped == 10
+
+
+def test_records_are_formatted_as_json_with_request_id_and_extras():
+    record = make_record()
+    record.user_id = "u1"
+    token = request_id_var.set("req-1")
+    try:
+        RequestIdFilter().filter(record)
+    finally:
+        request_id_var.reset(token)
+
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "Transação criada: abc"
+    assert entry["request_id"] == "req-1"
+    assert entry["user_id"] == "u1"
+    assert entry["level"] == "INFO"
+
+
+def test_queue_handler_defers_message_interpolation():
+    log_queue = queue.SimpleQueue()
+    handler = DeferredQueueHandler(log_queue)
+    record = make_record()
+
+    handler.handle(record)
+
+    queued = log_queue.get_nowait()
+    assert queued.msg == "Transação criada: %s"
+    assert queued.args == ("abc",)
+    assert not hasattr(queued, "message")
+
+
+def test_request_id_header_is_propagated(test_client):
+    response = test_client.get("/health", headers={"X-Request-ID": "abc-123"})
+    assert response.headers["x-request-id"] == "abc-123"
+
+    generated = test_client.get("/health").headers["x-request-id"]
+    assert len(generated) == 32
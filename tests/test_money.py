@@ -0,0 +1,29 @@
+from decimal import Decimal
+import pytest
+from pydantic import ValidationError
+from src.models import TransactionCreate, TransactionUpdate
+from src.money import from_cents, to_cents
+
+
+def test_to_cents_uses_the_shortest_decimal_representation():
+    assert to_cents(0.1 + 0.2) == 30
+    assert to_cents(19.99) == 1999
+    assert to_cents(1.005) == 101  # half-up sobre o decimal, não sobre o binário
+    assert to_cents("1234.5") == 123450
+    assert to_cents(Decimal("0.015")) == 2
+
+
+def test_from_cents_round_trips():
+    for cents in (1, 30, 1999, 123456789):
+        assert to_cents(from_cents(cents)) == cents
+    assert from_cents(None) == 0.0
+
+
+def test_models_convert_amount_to_cents():
+    transaction = TransactionCreate(type="expense", amount=12.34, description="Mercado")
+    assert transaction.amount_cents == 1234
+    assert transaction.currency.value == "BRL"
+
+    assert TransactionUpdate(amount=0.5, currency="USD").column_values() == {"amount_cents": 50, "currency": "USD"}
+    with pytest.raises(ValidationError):
+        TransactionCreate(type="expense", amount=0.001, description="Abaixo de um centavo")
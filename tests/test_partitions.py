@@ -0,0 +1,86 @@
+from datetime import date, datetime, timedelta, timezone
+import os
+import pytest
+from src.partitions import (
+    add_months,
+    archived_name,
+    attached_partitions,
+    create_partition,
+    detach_partition,
+    ensure_partitions,
+    month_range,
+    month_start,
+    parse_month,
+    partition_bounds,
+    partition_name,
+    relation_exists,
+)
+
+# Banco PostgreSQL já migrado (ex.: o do plano de queries); os testes que o
+# usam rodam numa transação desfeita no fim
+POSTGRES_TEST_DATABASE_URL = os.getenv("POSTGRES_TEST_DATABASE_URL")
+
+
+def test_month_helpers_cross_year_boundaries():
+    assert add_months(date(2024, 11, 1), 3) == date(2025, 2, 1)
+    assert add_months(date(2024, 1, 1), -1) == date(2023, 12, 1)
+    assert month_range(date(2024, 11, 15), date(2025, 1, 2)) == [
+        date(2024, 11, 1), date(2024, 12, 1), date(2025, 1, 1),
+    ]
+
+
+def test_month_start_uses_utc():
+    # 31/01 23h em São Paulo já é fevereiro em UTC, como os limites das partições
+    late_january = datetime(2024, 1, 31, 23, 0, tzinfo=timezone(timedelta(hours=-3)))
+    assert month_start(late_january) == date(2024, 2, 1)
+
+
+def test_partition_name_and_bounds():
+    month = parse_month("2024-12")
+    assert partition_name(month) == "transactions_p202412"
+    assert partition_bounds(month) == (
+        datetime(2024, 12, 1, tzinfo=timezone.utc),
+        datetime(2025, 1, 1, tzinfo=timezone.utc),
+    )
+    with pytest.raises(ValueError):
+        parse_month("2024-13")
+
+
+@pytest.fixture
+def pg_connection():
+    if not POSTGRES_TEST_DATABASE_URL:
+        pytest.skip("POSTGRES_TEST_DATABASE_URL não configurado")
+    from sqlalchemy import create_engine
+
+    engine = create_engine(POSTGRES_TEST_DATABASE_URL)
+    connection = engine.connect()
+    transaction = connection.begin()
+    try:
+        yield connection
+    finally:
+        transaction.rollback()
+        connection.close()
+        engine.dispose()
+
+
+def test_detached_month_can_be_recreated(pg_connection):
+    from sqlalchemy import text
+
+    month = date(2001, 1, 1)
+    assert create_partition(pg_connection, month)
+
+    assert detach_partition(pg_connection, month) == archived_name(month)
+    assert partition_name(month) not in attached_partitions(pg_connection)
+
+    # Uma linha do mês arquivado cai na DEFAULT; a manutenção recria a partição
+    pg_connection.execute(text("""
+        INSERT INTO transactions (id, user_id, type, amount_cents, currency, description, created_at)
+        VALUES (gen_random_uuid(), gen_random_uuid(), 'expense', 100, 'BRL', '[TEST] arquivado', '2001-01-15')
+    """))
+    assert partition_name(month) in ensure_partitions(pg_connection, months_ahead=0)
+    assert relation_exists(pg_connection, archived_name(month))
+    assert pg_connection.execute(text(f"SELECT count(*) FROM {partition_name(month)}")).scalar() == 1
+
+    # O arquivo anterior ainda existe: desligar o mês de novo é recusado
+    with pytest.raises(ValueError):
+        detach_partition(pg_connection, month)
@@ -0,0 +1,61 @@
+import asyncio
+import threading
+import pytest
+from fastapi import HTTPException
+from src.auth.utils.password_hasher import PasswordHasher
+
+
+@pytest.fixture
+def hasher():
+    hasher = PasswordHasher(workers=1, max_pending=1, rounds=4)
+    yield hasher
+    hasher.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_hash_and_verify_use_configured_rounds(hasher):
+    """O hash usa o fator de custo configurado e é verificado no pool"""
+    hashed = await hasher.hash("SecurePass123!")
+
+    assert hashed.startswith("$2b$04$")
+    assert await hasher.verify("SecurePass123!", hashed) is True
+    assert await hasher.verify("OutraSenha123!", hashed) is False
+
+
+@pytest.mark.asyncio
+async def test_full_queue_returns_503(hasher):
+    """Com todas as vagas ocupadas, novas operações são recusadas com 503"""
+    release = threading.Event()
+    busy = asyncio.ensure_future(hasher._run(release.wait))
+    await asyncio.sleep(0)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await hasher.hash("SecurePass123!")
+    assert exc_info.value.status_code == 503
+    assert exc_info.value.headers["Retry-After"] == "1"
+
+    release.set()
+    await busy
+    # A vaga é liberada quando a thread termina
+    assert (await hasher.hash("SecurePass123!")).startswith("$2b$04$")
+
+
+@pytest.mark.asyncio
+async def test_hashing_does_not_block_event_loop():
+    """Enquanto o bcrypt roda, o event loop continua atendendo outras corrotinas"""
+    slow = PasswordHasher(workers=1, max_pending=1, rounds=12)
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            ticks += 1
+            await asyncio.sleep(0.001)
+
+    task = asyncio.ensure_future(ticker())
+    try:
+        await slow.hash("SecurePass123!")
+    finally:
+        task.cancel()
+        slow.shutdown()
+    assert ticks > 10
@@ -0,0 +1,67 @@
+import hashlib
+import pytest
+from scripts.build_breached_passwords import build
+from src.auth.utils.breached_passwords import BreachedPasswordList
+from src.auth.utils.password_validator import PasswordValidator
+
+
+@pytest.fixture
+def breached_file(tmp_path):
+    source = tmp_path / "pwned.txt"
+    hibp = hashlib.sha1(b"Vazada#2024xyz").hexdigest().upper()
+    source.write_text(f"{hibp}:1523\nOutra$Senha77\n{hibp}:1\n\n", encoding="utf-8")
+    output = tmp_path / "breached.sha1"
+    assert build([str(source)], str(output), chunk_size=1) == (3, 2)
+    return output
+
+
+def test_strong_password_is_valid():
+    result = PasswordValidator().validate("Tr0ub4dor&3-Horse!")
+    assert result.is_valid
+    assert result.errors == []
+    assert result.score == 100
+
+
+@pytest.mark.parametrize("password,error", [
+    ("abc", "A senha deve ter um mínimo de 8 caracteres"),
+    ("Qw!9" + "x" * 125, "A senha deve ter no máximo 128 caracteres"),
+    ("qwerty!9zz", "A senha deve conter pelo menos uma letra maiúscula"),
+    ("QWERTY!9ZZ", "A senha deve conter pelo menos uma letra minúscula"),
+    ("Qwerty!zzp", "A senha deve conter pelo menos um número"),
+    ("Qwerty9zzp", "A senha deve conter pelo menos um caractere especial"),
+    ("Password123", "A senha é muito comum"),
+    ("Maria!9xyq", "A senha não deve conter informações pessoais"),
+    ("Ab!123qw", "A senha não deve conter sequências de caracteres"),
+    ("Qw!9zzzkp", "A senha não deve conter muitos caracteres repetidos"),
+    ("Aa!1Aa!1", "A senha deve ter boa variedade de caracteres"),
+])
+def test_each_rule_reports_its_error(password, error):
+    assert error in PasswordValidator().validate(password).errors
+
+
+def test_sequences_are_tolerated_in_long_passwords():
+    result = PasswordValidator().validate("Wk!abcq7Rt")
+    assert "A senha não deve conter sequências de caracteres" not in result.errors
+
+
+def test_breached_list_lookup(breached_file):
+    breached = BreachedPasswordList(str(breached_file))
+    try:
+        assert len(breached) == 2
+        assert "Vazada#2024xyz" in breached
+        assert "Outra$Senha77" in breached
+        assert "Nunca#Vazou42" not in breached
+
+        validator = PasswordValidator(breached)
+        result = validator.validate("Vazada#2024xyz")
+        assert result.errors == ["A senha aparece em vazamentos de dados conhecidos"]
+        assert validator.validate("Nunca#Vazou42q").is_valid
+    finally:
+        breached.close()
+
+
+def test_breached_list_rejects_truncated_file(tmp_path):
+    path = tmp_path / "broken.sha1"
+    path.write_bytes(b"\x00" * 21)
+    with pytest.raises(ValueError):
+        BreachedPasswordList(str(path))
@@ -0,0 +1,64 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+from src.pool_metrics import InstrumentedQueuePool, instrument_engine
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=1,
+        pool_timeout=0.05,
+    )
+    yield engine
+    engine.dispose()
+
+
+def test_checkouts_in_use_and_overflow_are_recorded(engine):
+    metrics = instrument_engine(engine, "test")
+
+    first = engine.connect()
+    second = engine.connect()
+    first.execute(text("SELECT 1"))
+    stats = metrics.stats()
+    assert stats["in_use"] == 2
+    assert stats["overflow"] == 1
+    assert stats["peak_overflow"] == 1
+
+    first.close()
+    second.close()
+    stats = metrics.stats()
+    assert stats["checkouts"] == 2
+    assert stats["in_use"] == 0
+    assert stats["peak_in_use"] == 2
+    assert stats["connections_opened"] == 2
+    assert stats["wait_max_ms"] >= stats["wait_avg_ms"] > 0
+
+
+def test_exhausted_pool_counts_timeouts(engine):
+    metrics = instrument_engine(engine, "test")
+
+    connections = [engine.connect(), engine.connect()]
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    for connection in connections:
+        connection.close()
+
+    stats = metrics.stats()
+    assert stats["timeouts"] == 1
+    assert stats["checkouts"] == 2
+
+
+def test_metrics_survive_dispose(engine):
+    metrics = instrument_engine(engine, "test")
+    with engine.connect():
+        pass
+    engine.dispose()
+    with engine.connect():
+        pass
+
+    assert engine.pool.metrics is metrics
+    assert metrics.pool is engine.pool
+    assert metrics.stats()["checkouts"] == 2
@@ -0,0 +1,46 @@
+import time
+from unittest.mock import patch
+from src.auth.utils.profile_cache import ProfileCache
+
+USER_ID = "97eeaf25-6faf-43f8-97e0-5391a3bff4aa"
+
+
+def test_entries_expire_after_ttl():
+    cache = ProfileCache(max_size=10, ttl=30)
+    cache.set(USER_ID, {"full_name": "Ana"})
+
+    assert cache.get(USER_ID) == {"full_name": "Ana"}
+    with patch("src.auth.utils.profile_cache.time.monotonic", return_value=time.monotonic() + 31):
+        assert cache.get(USER_ID) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_profile_is_evicted():
+    cache = ProfileCache(max_size=2, ttl=60)
+    cache.set("a", {"n": 1})
+    cache.set("b", {"n": 2})
+    cache.get("a")
+    cache.set("c", {"n": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert cache.get("c") == {"n": 3}
+
+
+def test_invalidate_and_stats():
+    cache = ProfileCache(max_size=10, ttl=60)
+    cache.set(USER_ID, {"full_name": "Ana"})
+    cache.invalidate(USER_ID)
+    cache.invalidate(USER_ID)  # já removido: não conta de novo
+
+    assert cache.get(USER_ID) is None
+    assert cache.stats() == {
+        "size": 0, "max_size": 10, "ttl_seconds": 60,
+        "hits": 0, "misses": 1, "invalidations": 1,
+    }
+
+
+def test_zero_size_disables_cache():
+    cache = ProfileCache(max_size=0, ttl=60)
+    cache.set(USER_ID, {"full_name": "Ana"})
+    assert cache.get(USER_ID) is None
@@ -0,0 +1,76 @@
+from src.query_plans import PlanIssue, compare_to_baseline, find_issues, plan_shape, used_indexes
+
+
+def _partition_scan(month):
+    return {
+        "Node Type": "Index Scan",
+        "Index Name": f"transactions_p{month}_user_id_created_at_idx",
+        "Relation Name": f"transactions_p{month}",
+        "Actual Rows": 20,
+        "Actual Loops": 1,
+    }
+
+
+PLAN = {
+    "Node Type": "Sort",
+    "Sort Key": ["categories.name"],
+    "Actual Rows": 1500,
+    "Actual Loops": 1,
+    "Plans": [{
+        "Node Type": "Hash Join",
+        "Join Type": "Right",
+        "Actual Rows": 1500,
+        "Actual Loops": 1,
+        "Plans": [
+            {
+                "Node Type": "Append",
+                "Actual Rows": 40,
+                "Actual Loops": 1,
+                "Plans": [_partition_scan("202409"), _partition_scan("202410")],
+            },
+            {
+                "Node Type": "Seq Scan",
+                "Relation Name": "categories",
+                "Actual Rows": 10,
+                "Rows Removed by Filter": 2000,
+                "Actual Loops": 1,
+            },
+        ],
+    }],
+}
+
+
+def test_find_issues_counts_rows_read_including_filtered():
+    issues = find_issues(PLAN, threshold=1000)
+    assert issues == [
+        PlanIssue("Sort", "categories.name", 1500),
+        PlanIssue("Seq Scan", "categories", 2010),
+    ]
+    assert issues[1].label == "Seq Scan em categories"
+    assert find_issues(PLAN, threshold=5000) == []
+
+
+def test_plan_shape_collapses_partitions_with_the_same_plan():
+    assert plan_shape(PLAN) == [
+        "Sort [categories.name]",
+        "  Hash Join (Right)",
+        "    Append",
+        "      Index Scan using transactions_p*_user_id_created_at_idx on transactions_p*",
+        "    Seq Scan on categories",
+    ]
+    assert used_indexes(PLAN) == {
+        "transactions_p202409_user_id_created_at_idx",
+        "transactions_p202410_user_id_created_at_idx",
+    }
+
+
+def test_compare_to_baseline_reports_changed_new_and_missing_scenarios():
+    entry = {"plan": plan_shape(PLAN), "issues": ["Seq Scan em categories"]}
+    regressed = {"plan": entry["plan"], "issues": entry["issues"] + ["Sort em categories.name"]}
+    baseline = {"categories.stats": [entry], "categories.get": [entry]}
+    current = {"categories.stats": [regressed], "transactions.list": [entry]}
+
+    changes = compare_to_baseline(baseline, current)
+    assert set(changes) == {"categories.stats", "categories.get", "transactions.list"}
+    assert "+! Sort em categories.name" in changes["categories.stats"]
+    assert compare_to_baseline(baseline, baseline) == {}
@@ -0,0 +1,86 @@
+from unittest.mock import AsyncMock, MagicMock, patch
+import pytest
+from fastapi.testclient import TestClient
+from src.main import app
+from src.auth.dependencies import auth_rate_limiter, get_auth_service
+from src.auth.utils.rate_limiter import AuthRateLimiter, TokenBucketLimiter, parse_rate
+
+client = TestClient(app)
+
+
+@pytest.fixture
+def mock_auth_service():
+    service = MagicMock()
+    service.login_user = AsyncMock(return_value={"access_token": "token-123", "token_type": "bearer"})
+    app.dependency_overrides[get_auth_service] = lambda: service
+    yield service
+    app.dependency_overrides.pop(get_auth_service)
+
+
+def test_parse_rate():
+    assert parse_rate("10/60") == (10, 60.0)
+    with pytest.raises(ValueError):
+        parse_rate("10 por minuto")
+    with pytest.raises(ValueError):
+        parse_rate("0/60")
+
+
+def test_bucket_refills_over_time():
+    limiter = TokenBucketLimiter(capacity=2, period=10)
+    with patch("src.auth.utils.rate_limiter.time.monotonic", return_value=1000.0):
+        assert limiter.hit("ip") is None
+        assert limiter.hit("ip") is None
+        assert limiter.hit("ip") == pytest.approx(5.0)
+        # Chaves diferentes têm buckets independentes
+        assert limiter.hit("outro-ip") is None
+    with patch("src.auth.utils.rate_limiter.time.monotonic", return_value=1005.0):
+        assert limiter.hit("ip") is None
+    assert limiter.stats()["allowed"] == 4
+    assert limiter.stats()["rejected"] == 1
+
+
+def test_compaction_drops_refilled_buckets():
+    limiter = TokenBucketLimiter(capacity=2, period=10, shards=4)
+    with patch("src.auth.utils.rate_limiter.time.monotonic", return_value=1000.0):
+        for key in ("a", "b", "c"):
+            limiter.hit(key)
+        limiter.hit("a")
+    assert limiter.stats()["tracked_keys"] == 3
+
+    # Após 5 s, "b" e "c" já recompuseram o bucket; "a" ainda não
+    assert limiter.compact(now=1005.0) == 2
+    assert limiter.stats()["tracked_keys"] == 1
+
+
+def test_global_limit_sheds_load_with_503():
+    limiter = AuthRateLimiter(per_ip="100/60", per_email="100/60", global_limit="2/60")
+    assert limiter.check("login", "1.1.1.1", "a@example.com") is None
+    assert limiter.check("login", "2.2.2.2", "b@example.com") is None
+    status_code, _ = limiter.check("login", "3.3.3.3", "c@example.com")
+    assert status_code == 503
+
+
+def test_login_is_limited_per_email(mock_auth_service):
+    capacity = auth_rate_limiter.per_email.capacity
+    login_data = {"email": "Vitima@Example.com", "password": "wrongpassword"}
+
+    for _ in range(capacity):
+        assert client.post("/auth/login", json=login_data).status_code == 200
+    # A mesma conta com outra capitalização conta no mesmo bucket
+    response = client.post("/auth/login", json={**login_data, "email": "vitima@example.com"})
+
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) >= 1
+    assert mock_auth_service.login_user.await_count == capacity
+    # Outra conta continua podendo entrar
+    assert client.post("/auth/login", json={**login_data, "email": "outra@example.com"}).status_code == 200
+
+
+def test_internal_metrics_requires_token():
+    assert client.get("/internal/metrics").status_code == 404
+    with patch("src.main.settings.INTERNAL_METRICS_TOKEN", "segredo"):
+        assert client.get("/internal/metrics", headers={"X-Internal-Token": "errado"}).status_code == 404
+        response = client.get("/internal/metrics", headers={"X-Internal-Token": "segredo"})
+    assert response.status_code == 200
+    assert set(response.json()["auth"]) == {"rate_limit", "token_cache", "profile_cache", "revocation"}
+    assert set(response.json()["db_pool"]) == {"sync", "async"}
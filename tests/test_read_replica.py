@@ -0,0 +1,70 @@
+import pytest
+from unittest.mock import AsyncMock, patch
+from sqlalchemy import Column, Integer, MetaData, String, Table, create_engine, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import NullPool
+from src.database_sqlalchemy import ReplicaMonitor, routing_sessionmaker
+
+metadata = MetaData()
+notes = Table("notes", metadata, Column("id", Integer, primary_key=True), Column("origin", String(10)))
+
+
+@pytest.fixture
+def engines(tmp_path):
+    """Primário e réplica em arquivos SQLite distintos, identificáveis pelo conteúdo"""
+    created = []
+    for name in ("primary", "replica"):
+        path = tmp_path / f"{name}.db"
+        sync_engine = create_engine(f"sqlite:///{path}")
+        metadata.create_all(sync_engine)
+        with sync_engine.begin() as conn:
+            conn.execute(notes.insert().values(id=1, origin=name))
+        sync_engine.dispose()
+        created.append(create_async_engine(f"sqlite+aiosqlite:///{path}", poolclass=NullPool))
+    return created
+
+
+async def _origin(session):
+    return (await session.execute(select(notes.c.origin).where(notes.c.id == 1))).scalar()
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_replica_until_the_session_writes(engines):
+    primary, replica = engines
+    session_factory = routing_sessionmaker(primary, replica)
+
+    async with session_factory() as session:
+        assert await _origin(session) == "replica"
+        await session.execute(notes.insert().values(id=2, origin="new"))
+        # Leitura depois da escrita: primário, que já vê a linha nova
+        assert await _origin(session) == "primary"
+        assert (await session.execute(select(notes.c.origin).where(notes.c.id == 2))).scalar() == "new"
+        await session.commit()
+
+    async with session_factory() as session:
+        assert await _origin(session) == "replica"
+        assert (await session.execute(select(notes.c.id).with_for_update())).first() is not None
+        assert await _origin(session) == "primary"
+
+
+@pytest.mark.asyncio
+async def test_monitor_falls_back_to_primary_when_lagging_or_down(engines):
+    monitor = ReplicaMonitor(engines[1], max_lag=5, check_interval=60)
+
+    with patch.object(monitor, "_measure", AsyncMock(return_value=1.5)):
+        assert await monitor.use_replica() is True
+    # Resultado reaproveitado dentro do intervalo
+    with patch.object(monitor, "_measure", AsyncMock(return_value=30.0)) as measure:
+        assert await monitor.use_replica() is True
+        measure.assert_not_awaited()
+        monitor._checked_at -= 60
+        assert await monitor.use_replica() is False
+    monitor._checked_at -= 60
+    with patch.object(monitor, "_measure", AsyncMock(side_effect=ConnectionError("sem rota"))):
+        assert await monitor.use_replica() is False
+
+    stats = monitor.stats()
+    assert stats["replica_reads"] == 2
+    assert stats["primary_fallbacks"] == 2
+    assert stats["errors"] == 1
+    assert stats["lag_seconds"] is None
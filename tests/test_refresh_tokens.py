@@ -0,0 +1,121 @@
+import time
+from unittest.mock import Mock, patch
+from uuid import uuid4
+import pytest
+from fastapi import HTTPException
+from src.auth import dependencies
+from src.auth.models import RefreshTokenRequest
+from src.auth.revocation import load_revocations, revocation_store
+from src.auth.service import AuthService
+from src.auth.utils.revocation_store import BloomFilter, RevocationStore
+from src.database import RefreshToken
+from tests.conftest import TestingAsyncSessionLocal, TestingSessionLocal
+
+USER_ID = "97eeaf25-6faf-43f8-97e0-5391a3bff4aa"
+
+
+@pytest.fixture(autouse=True)
+def empty_revocations():
+    revocation_store.replace([])
+    dependencies.token_cache.clear()
+    yield
+    revocation_store.replace([])
+    dependencies.token_cache.clear()
+
+
+@pytest.fixture
+def auth_service(db_session):
+    with patch('src.auth.service.SessionLocal', TestingSessionLocal):
+        yield AuthService(supabase=Mock())
+
+
+def start_session(auth_service):
+    db = TestingSessionLocal()
+    tokens, _ = auth_service._issue_tokens(db, USER_ID, "test@example.com", "Test User")
+    db.commit()
+    db.close()
+    return tokens
+
+
+def refresh(auth_service, token):
+    return auth_service.refresh_token(RefreshTokenRequest(refresh_token=token))
+
+
+@pytest.mark.asyncio
+async def test_refresh_rotates_token_and_reuse_revokes_session(auth_service, db_session):
+    first = start_session(auth_service)
+    second = await refresh(auth_service, first["refresh_token"])
+
+    assert second["refresh_token"] != first["refresh_token"]
+    user = dependencies._authenticate(second["access_token"])
+    assert str(user.id) == USER_ID
+    # Os access tokens anteriores da sessão continuam válidos até expirar
+    assert dependencies._authenticate(first["access_token"]).session_id == user.session_id
+
+    rows = db_session.query(RefreshToken).order_by(RefreshToken.created_at).all()
+    assert [row.revoked_reason for row in rows] == ["rotated", None]
+    assert rows[0].replaced_by == rows[1].jti
+    assert first["refresh_token"] not in {row.token_hash for row in rows}
+
+    # Reuso do token já trocado: a sessão inteira é revogada
+    with pytest.raises(HTTPException) as exc_info:
+        await refresh(auth_service, first["refresh_token"])
+    assert exc_info.value.status_code == 401
+    with pytest.raises(HTTPException):
+        await refresh(auth_service, second["refresh_token"])
+    with pytest.raises(ValueError):
+        dependencies._authenticate(second["access_token"])
+
+
+@pytest.mark.asyncio
+async def test_logout_revokes_session_and_store_is_rebuilt_from_database(auth_service):
+    tokens = start_session(auth_service)
+    other_session = start_session(auth_service)
+    user = dependencies._authenticate(tokens["access_token"])  # fica no token_cache
+
+    await auth_service.logout_user(user.id, user.session_id)
+
+    with pytest.raises(ValueError):
+        dependencies._authenticate(tokens["access_token"])
+    dependencies._authenticate(other_session["access_token"])
+
+    # Outro worker / reinício: o conjunto é reconstruído a partir do banco
+    revocation_store.replace([])
+    dependencies._authenticate(tokens["access_token"])
+    assert await load_revocations(TestingAsyncSessionLocal) == 1
+    with pytest.raises(ValueError):
+        dependencies._authenticate(tokens["access_token"])
+
+
+@pytest.mark.asyncio
+async def test_refresh_token_is_not_an_access_token(auth_service):
+    tokens = start_session(auth_service)
+    with pytest.raises(ValueError):
+        dependencies._authenticate(tokens["refresh_token"])
+    with pytest.raises(HTTPException):
+        await refresh(auth_service, tokens["access_token"])
+
+
+def test_bloom_filter_has_no_false_negatives():
+    bloom = BloomFilter(1000, error_rate=0.01)
+    keys = [str(uuid4()) for _ in range(1000)]
+    for key in keys:
+        bloom.add(key)
+    assert all(key in bloom for key in keys)
+    false_positives = sum(str(uuid4()) in bloom for _ in range(10000))
+    assert false_positives < 300
+
+
+def test_revocation_store_prunes_expired_and_grows():
+    store = RevocationStore(capacity=2)
+    now = time.time()
+    store.add("a", now - 1)
+    store.add("b", now + 60)
+    store.add("c", now + 60)
+
+    assert store.capacity == 4
+    assert store.is_revoked("x", "a")
+    assert store.prune(now) == 1
+    assert not store.is_revoked("a")
+    assert store.is_revoked(None, "c")
+    assert store.stats()["size"] == 2
@@ -0,0 +1,64 @@
+import time
+from datetime import timedelta
+from unittest.mock import patch
+import pytest
+from src.auth import dependencies
+from src.auth.utils.jwt_handler import JWTHandler
+from src.auth.utils.token_cache import VerifiedTokenCache
+
+USER_ID = "97eeaf25-6faf-43f8-97e0-5391a3bff4aa"
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    dependencies.token_cache.clear()
+    yield
+    dependencies.token_cache.clear()
+
+
+def test_entries_expire_at_token_exp():
+    cache = VerifiedTokenCache(max_size=10)
+    cache.set("a", "user-a", time.time() + 60)
+    cache.set("b", "user-b", time.time() - 1)  # já expirado: não é guardado
+    cache.set("c", "user-c", None)  # sem exp: não é guardado
+
+    assert cache.get("a") == "user-a"
+    assert cache.get("b") is None
+    assert cache.get("c") is None
+    assert cache.stats() == {"size": 1, "max_size": 10, "hits": 1, "misses": 2}
+
+    with patch("src.auth.utils.token_cache.time.time", return_value=time.time() + 120):
+        assert cache.get("a") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = VerifiedTokenCache(max_size=2)
+    expires_at = time.time() + 60
+    cache.set("a", 1, expires_at)
+    cache.set("b", 2, expires_at)
+    cache.get("a")
+    cache.set("c", 3, expires_at)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_repeated_token_skips_verification():
+    token = JWTHandler().create_token({"user_id": USER_ID, "email": "test@example.com"}, timedelta(minutes=5))
+
+    with patch.object(JWTHandler, "verify_token", autospec=True, side_effect=JWTHandler.verify_token) as verify:
+        first = dependencies._authenticate(token)
+        second = dependencies._authenticate(token)
+
+    assert verify.call_count == 1
+    assert second is first
+    assert str(first.id) == USER_ID
+    assert dependencies.token_cache.stats()["hits"] == 1
+
+
+def test_invalid_token_is_not_cached():
+    with pytest.raises(Exception):
+        dependencies._authenticate("invalid-token")
+    assert dependencies.token_cache.stats()["size"] == 0
@@ -1,11 +1,14 @@
 
 import pytest
 from fastapi.testclient import TestClient
+from src.money import from_cents, to_cents
+from src.rollup import rebuild_monthly_totals, verify_monthly_totals
 
 
-def test_create_transaction_success_mocked(test_client: TestClient):
+def test_create_transaction_success_mocked(authenticated_client):
     """Testa criação bem-sucedida de transação com mock"""
-    response = test_client.post("/transactions/", json={
+    client, _ = authenticated_client
+    response = client.post("/transactions/", json={
         "type": "income",
         "amount": 100.0,
         "description": "[TEST] Mocked success transaction - should not save to DB"
@@ -14,8 +17,636 @@ def test_create_transaction_success_mocked(test_client: TestClient):
     assert response.status_code == 201
 
 
-def test_list_transactions_success_mocked(test_client: TestClient):
+def test_list_transactions_success_mocked(authenticated_client):
     """Testa listagem bem-sucedida de transações com mock"""
+    client, _ = authenticated_client
+    response = client.get("/transactions/")
+
+    assert response.status_code == 200
+
+
+def _seed_transactions(db_session, count, user_id):
+    """Insere transações do usuário com created_at distintos e crescentes"""
+    from datetime import datetime, timedelta
+    from uuid import uuid4
+    from src.database import Transaction as TransactionModel
+
+    base = datetime(2024, 1, 1, 12, 0, 0)
+    for i in range(count):
+        db_session.add(TransactionModel(
+            id=uuid4(),
+            user_id=user_id,
+            type="income" if i % 2 == 0 else "expense",
+            amount_cents=(10 + i) * 100,
+            description=f"[TEST] Transação {i}",
+            created_at=base + timedelta(minutes=i),
+        ))
+    db_session.commit()
+
+
+def test_list_transactions_paginates_with_cursor(authenticated_client, db_session):
+    """Testa que a listagem percorre todas as transações por cursor sem repetir itens"""
+    client, user_id = authenticated_client
+    _seed_transactions(db_session, 5, user_id)
+
+    first = client.get("/transactions/", params={"limit": 2})
+    assert first.status_code == 200
+    body = first.json()
+    assert [t["description"] for t in body["items"]] == ["[TEST] Transação 4", "[TEST] Transação 3"]
+    assert body["limit"] == 2
+    assert body["next_cursor"]
+
+    seen = [t["id"] for t in body["items"]]
+    cursor = body["next_cursor"]
+    while cursor:
+        page = client.get("/transactions/", params={"limit": 2, "cursor": cursor}).json()
+        seen.extend(t["id"] for t in page["items"])
+        cursor = page["next_cursor"]
+
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+
+def test_list_transactions_last_page_has_no_cursor(authenticated_client, db_session):
+    """Testa que a última página não retorna next_cursor"""
+    client, user_id = authenticated_client
+    _seed_transactions(db_session, 3, user_id)
+
+    response = client.get("/transactions/", params={"limit": 3})
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 3
+    assert response.json()["next_cursor"] is None
+
+
+def test_list_transactions_invalid_cursor(authenticated_client):
+    """Testa que um cursor malformado retorna 400"""
+    client, _ = authenticated_client
+    response = client.get("/transactions/", params={"cursor": "nao-e-um-cursor"})
+
+    assert response.status_code == 400
+
+
+def test_list_transactions_limit_above_max(authenticated_client):
+    """Testa que o tamanho de página é limitado"""
+    client, _ = authenticated_client
+    response = client.get("/transactions/", params={"limit": 100000})
+
+    assert response.status_code == 422
+
+
+def test_list_transactions_filters_by_type_and_amount(authenticated_client, db_session):
+    """Testa filtros de tipo e faixa de valor aplicados no servidor"""
+    client, user_id = authenticated_client
+    _seed_transactions(db_session, 6, user_id)
+
+    response = client.get("/transactions/", params={"type": "income", "min_amount": 11, "max_amount": 14})
+
+    assert response.status_code == 200
+    descriptions = [t["description"] for t in response.json()["items"]]
+    assert descriptions == ["[TEST] Transação 4", "[TEST] Transação 2"]
+
+
+def test_list_transactions_filters_by_date_range(authenticated_client, db_session):
+    """Testa filtro por período inclusivo"""
+    client, user_id = authenticated_client
+    _seed_transactions(db_session, 5, user_id)
+
+    response = client.get("/transactions/", params={
+        "start_date": "2024-01-01T12:01:00",
+        "end_date": "2024-01-01T12:03:00",
+    })
+
+    assert response.status_code == 200
+    descriptions = [t["description"] for t in response.json()["items"]]
+    assert descriptions == ["[TEST] Transação 3", "[TEST] Transação 2", "[TEST] Transação 1"]
+
+
+def test_list_transactions_filters_by_categories(authenticated_client, db_session):
+    """Testa filtro por múltiplas categorias"""
+    from uuid import uuid4
+    from src.database import Category, Transaction as TransactionModel
+
+    client, user_id = authenticated_client
+    categories = [Category(id=uuid4(), user_id=user_id, name=f"Cat {i}", type="expense") for i in range(3)]
+    db_session.add_all(categories)
+    db_session.flush()
+    for category in categories:
+        db_session.add(TransactionModel(id=uuid4(), user_id=user_id, type="expense", amount_cents=100, description=category.name, category_id=category.id))
+    db_session.commit()
+
+    response = client.get(f"/transactions/?category_id={categories[0].id}&category_id={categories[2].id}")
+
+    assert response.status_code == 200
+    assert sorted(t["description"] for t in response.json()["items"]) == ["Cat 0", "Cat 2"]
+
+
+def test_list_transactions_invalid_amount_range(authenticated_client):
+    """Testa que uma faixa de valor invertida é rejeitada"""
+    client, _ = authenticated_client
+    response = client.get("/transactions/", params={"min_amount": 50, "max_amount": 10})
+
+    assert response.status_code == 422
+
+
+def _local_to_utc(local_dt, tz_name="America/Sao_Paulo"):
+    """Converte um horário local do fuso informado para UTC sem tzinfo"""
+    import pytz
+
+    return pytz.timezone(tz_name).localize(local_dt).astimezone(pytz.utc).replace(tzinfo=None)
+
+
+def test_transactions_summary_aggregates_by_month(authenticated_client, db_session):
+    """Testa saldo, totais do mês e variação calculados no banco"""
+    from datetime import datetime, timedelta
+    from uuid import uuid4
+    import pytz
+    from src.database import Transaction as TransactionModel
+
+    client, user_id = authenticated_client
+    now_local = datetime.now(pytz.timezone("America/Sao_Paulo")).replace(tzinfo=None)
+    month_start = now_local.replace(day=1, hour=12, minute=0, second=0, microsecond=0)
+    previous_month_day = month_start - timedelta(days=10)
+
+    rows = [
+        ("income", 1000.0, month_start),
+        ("expense", 250.0, month_start),
+        ("income", 500.0, previous_month_day),
+        ("expense", 100.0, previous_month_day),
+    ]
+    for tx_type, amount, local_dt in rows:
+        db_session.add(TransactionModel(
+            id=uuid4(), user_id=user_id, type=tx_type, amount_cents=to_cents(amount), description="[TEST] resumo",
+            created_at=_local_to_utc(local_dt),
+        ))
+    db_session.commit()
+    # Transações inseridas direto no banco não passam pelos handlers
+    rebuild_monthly_totals(db_session)
+
+    response = client.get("/transactions/summary")
+
+    assert response.status_code == 200
+    body = response.json()
+    assert body["timezone"] == "America/Sao_Paulo"
+    assert body["current_balance"] == 1150.0
+    assert body["monthly_income"] == 1000.0
+    assert body["monthly_expenses"] == 250.0
+    assert body["previous_month_balance"] == 400.0
+    assert body["percentage_change"] == 187.5
+    assert [m["month"] for m in body["months"]] == [
+        previous_month_day.strftime("%Y-%m"), month_start.strftime("%Y-%m")
+    ]
+
+
+def test_transactions_summary_empty(authenticated_client):
+    """Testa resumo sem transações"""
+    client, _ = authenticated_client
+
+    response = client.get("/transactions/summary")
+
+    assert response.status_code == 200
+    assert response.json()["current_balance"] == 0.0
+    assert response.json()["months"] == []
+
+
+def test_transactions_require_authentication(test_client: TestClient):
+    """Testa que a listagem de transações exige autenticação"""
     response = test_client.get("/transactions/")
 
+    assert response.status_code == 401
+
+
+def test_transactions_are_scoped_by_user(authenticated_client, db_session):
+    """Testa que transações de outro usuário não são listadas nem acessíveis"""
+    from uuid import uuid4
+    from src.database import Category, Transaction as TransactionModel
+
+    client, user_id = authenticated_client
+    other_user_id = uuid4()
+    other_category = Category(id=uuid4(), user_id=other_user_id, name="Outro", type="expense")
+    db_session.add(other_category)
+    db_session.commit()
+    other_category_id = other_category.id
+    _seed_transactions(db_session, 2, user_id)
+    _seed_transactions(db_session, 3, other_user_id)
+    rebuild_monthly_totals(db_session)
+
+    listed = client.get("/transactions/").json()["items"]
+    assert len(listed) == 2
+
+    other_id = str(db_session.query(TransactionModel.id).filter(TransactionModel.user_id == other_user_id).first()[0])
+    assert client.get(f"/transactions/{other_id}").status_code == 404
+    assert client.put(f"/transactions/{other_id}", json={"amount": 1.0}).status_code == 404
+    assert client.delete(f"/transactions/{other_id}").status_code == 404
+
+    summary = client.get("/transactions/summary").json()
+    assert sum(month["income"] + month["expenses"] for month in summary["months"]) == 10.0 + 11.0
+
+    response = client.post("/transactions/", json={
+        "type": "expense", "amount": 5.0, "description": "[TEST] categoria alheia", "category_id": str(other_category_id)
+    })
+    assert response.status_code == 400
+
+
+def test_transactions_summary_requires_authentication(test_client: TestClient):
+    """Testa que o resumo exige autenticação"""
+    response = test_client.get("/transactions/summary")
+
+    assert response.status_code == 401
+
+
+def _rollup_totals(db_session):
+    """Totais do rollup por (tipo, categoria)"""
+    from src.database import MonthlyTotal
+
+    totals = {}
+    for row in db_session.query(MonthlyTotal).all():
+        key = (row.type, row.category_id)
+        cents, count = totals.get(key, (0, 0))
+        totals[key] = (cents + row.total_cents, count + row.transaction_count)
+    return {key: (from_cents(cents), count) for key, (cents, count) in totals.items() if (cents, count) != (0, 0)}
+
+
+def test_rollup_tracks_create_update_delete(authenticated_client, db_session):
+    """Testa que o rollup acompanha criação, alteração e remoção"""
+    client, _ = authenticated_client
+    created = client.post("/transactions/", json={"type": "income", "amount": 100.0, "description": "[TEST] a"}).json()
+    client.post("/transactions/", json={"type": "income", "amount": 50.0, "description": "[TEST] b"})
+    assert _rollup_totals(db_session) == {("income", None): (150.0, 2)}
+
+    client.put(f"/transactions/{created['id']}", json={"amount": 80.0})
+    assert _rollup_totals(db_session) == {("income", None): (130.0, 2)}
+
+    client.put(f"/transactions/{created['id']}", json={"type": "expense"})
+    assert _rollup_totals(db_session) == {("income", None): (50.0, 1), ("expense", None): (80.0, 1)}
+
+    client.delete(f"/transactions/{created['id']}")
+    assert _rollup_totals(db_session) == {("income", None): (50.0, 1)}
+    assert verify_monthly_totals(db_session) == []
+
+
+def test_rollup_moves_amount_between_categories(authenticated_client, db_session):
+    """Testa que trocar a categoria move o valor entre chaves do rollup"""
+    from uuid import uuid4
+    from src.database import Category
+
+    client, user_id = authenticated_client
+    food = Category(id=uuid4(), user_id=user_id, name="Comida", type="expense")
+    rent = Category(id=uuid4(), user_id=user_id, name="Aluguel", type="expense")
+    food_id, rent_id = food.id, rent.id
+    db_session.add_all([food, rent])
+    db_session.commit()
+
+    created = client.post("/transactions/", json={
+        "type": "expense", "amount": 30.0, "description": "[TEST] mercado", "category_id": str(food_id)
+    }).json()
+    client.put(f"/transactions/{created['id']}", json={"category_id": str(rent_id), "amount": 40.0})
+
+    assert _rollup_totals(db_session) == {("expense", rent_id): (40.0, 1)}
+    assert verify_monthly_totals(db_session) == []
+
+
+def test_rebuild_monthly_totals_fixes_drift(authenticated_client, db_session):
+    """Testa que a reconstrução corrige divergências do rollup"""
+    client, user_id = authenticated_client
+    _seed_transactions(db_session, 4, user_id)
+    assert len(verify_monthly_totals(db_session)) == 2
+
+    rebuild_monthly_totals(db_session)
+
+    assert verify_monthly_totals(db_session) == []
+    assert _rollup_totals(db_session) == {("income", None): (22.0, 2), ("expense", None): (24.0, 2)}
+
+
+def test_rollup_follows_profile_timezone(authenticated_client, db_session):
+    """Testa que o rollup usa o fuso do perfil e é reconstruído quando ele muda"""
+    from datetime import datetime
+    from uuid import uuid4
+    from src.database import Transaction as TransactionModel, UserProfile
+    from src.rollup import rebuild_user_monthly_totals
+
+    client, user_id = authenticated_client
+    profile = UserProfile(id=uuid4(), user_id=user_id, email="fuso@example.com", timezone="UTC")
+    db_session.add(profile)
+    # 01/03 01:00 UTC ainda é fevereiro em São Paulo
+    db_session.add(TransactionModel(
+        id=uuid4(), user_id=user_id, type="income", amount_cents=1000, description="[TEST] virada",
+        created_at=datetime(2026, 3, 1, 1, 0),
+    ))
+    db_session.commit()
+    rebuild_monthly_totals(db_session)
+
+    body = client.get("/transactions/summary?months=120").json()
+    assert body["timezone"] == "UTC"
+    assert [m["month"] for m in body["months"]] == ["2026-03"]
+
+    profile.timezone = "America/Sao_Paulo"
+    db_session.flush()
+    rebuild_user_monthly_totals(db_session, user_id)
+    db_session.commit()
+
+    body = client.get("/transactions/summary?months=120").json()
+    assert body["timezone"] == "America/Sao_Paulo"
+    assert [m["month"] for m in body["months"]] == ["2026-02"]
+    assert verify_monthly_totals(db_session) == []
+
+
+def test_bulk_create_transactions(authenticated_client, db_session):
+    """Testa criação em lote com erros por item sem abortar o lote"""
+    client, _ = authenticated_client
+    from uuid import uuid4
+
+    items = [
+        {"type": "income", "amount": 10.0, "description": "[TEST] lote 0"},
+        {"type": "invalid", "amount": 10.0, "description": "[TEST] lote 1"},
+        {"type": "expense", "amount": -5.0, "description": "[TEST] lote 2"},
+        {"type": "expense", "amount": 7.5, "description": "[TEST] lote 3", "category_id": str(uuid4())},
+        {"type": "expense", "amount": 2.5, "description": "[TEST] lote 4"},
+        "não é um objeto",
+    ]
+
+    response = client.post("/transactions/bulk", json=items)
+
+    assert response.status_code == 201
+    body = response.json()
+    assert body["created"] == 2
+    assert len(body["ids"]) == 2
+    assert [error["index"] for error in body["errors"]] == [1, 2, 3, 5]
+    assert body["errors"][2]["errors"] == ["category_id: Categoria não encontrada"]
+
+    listed = client.get("/transactions/").json()["items"]
+    assert sorted(t["description"] for t in listed) == ["[TEST] lote 0", "[TEST] lote 4"]
+    assert verify_monthly_totals(db_session) == []
+
+
+def test_transactions_use_profile_currency(authenticated_client, db_session):
+    """Testa que transações ficam na moeda do perfil e outras moedas são recusadas"""
+    from uuid import uuid4
+    from src.database import Transaction as TransactionModel, UserProfile
+
+    client, user_id = authenticated_client
+    db_session.add(UserProfile(id=uuid4(), user_id=user_id, email="moeda@example.com", currency="USD"))
+    db_session.commit()
+
+    created = client.post("/transactions/", json={"type": "income", "amount": 10.0, "description": "[TEST] sem moeda"})
+    assert created.status_code == 201
+    assert created.json()["currency"] == "USD"
+
+    response = client.post("/transactions/", json={
+        "type": "income", "amount": 10.0, "currency": "BRL", "description": "[TEST] outra moeda"
+    })
+    assert response.status_code == 400
+    assert client.put(f"/transactions/{created.json()['id']}", json={"currency": "EUR"}).status_code == 400
+
+    result = client.post("/transactions/bulk", json=[
+        {"type": "expense", "amount": 1.0, "description": "[TEST] lote usd", "currency": "USD"},
+        {"type": "expense", "amount": 1.0, "description": "[TEST] lote eur", "currency": "EUR"},
+    ]).json()
+    assert result["created"] == 1
+    assert [error["index"] for error in result["errors"]] == [1]
+    assert {row[0] for row in db_session.query(TransactionModel.currency).all()} == {"USD"}
+
+
+def test_bulk_create_transactions_limit(authenticated_client, monkeypatch):
+    """Testa que lotes acima do limite são rejeitados"""
+    client, _ = authenticated_client
+    from src.config import settings
+
+    monkeypatch.setattr(settings, "TRANSACTIONS_BULK_MAX_ITEMS", 2)
+    items = [{"type": "income", "amount": 1.0, "description": "[TEST] x"}] * 3
+
+    response = client.post("/transactions/bulk", json=items)
+
+    assert response.status_code == 413
+
+
+def test_import_csv_statement_in_chunks(authenticated_client, db_session):
+    """Testa importação de CSV com commit e progresso por bloco"""
+    client, _ = authenticated_client
+    import json
+
+    csv_content = (
+        "Data;Histórico;Valor\n"
+        "15/01/2024;[TEST] Salário;1.500,00\n"
+        "16/01/2024;[TEST] Mercado;-120,50\n"
+        "17/01/2024;[TEST] Inválido;abc\n"
+        "2024-02-01;[TEST] Aluguel;-800\n"
+        "02/02/2024;[TEST] Pix recebido;50,25\n"
+    )
+
+    response = client.post(
+        "/transactions/import",
+        params={"chunk_size": 2},
+        files={"file": ("extrato.csv", csv_content.encode("utf-8"), "text/csv")},
+    )
+
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["chunk"] for event in events] == [1, 2, 3, 3]
+    assert events[-1]["done"] is True
+    assert events[-1]["rows_read"] == 5
+    assert events[-1]["created"] == 4
+    assert events[-1]["rejected"] == 1
+    assert events[1]["errors"][0]["index"] == 4
+
+    listed = client.get("/transactions/").json()["items"]
+    by_description = {t["description"]: t for t in listed}
+    assert by_description["[TEST] Salário"]["type"] == "income"
+    assert by_description["[TEST] Salário"]["amount"] == 1500.0
+    assert by_description["[TEST] Mercado"]["type"] == "expense"
+    assert by_description["[TEST] Mercado"]["amount"] == 120.5
+    assert by_description["[TEST] Aluguel"]["created_at"].startswith("2024-02-01")
+    assert verify_monthly_totals(db_session) == []
+
+
+def test_import_parses_chunks_off_the_event_loop(authenticated_client, monkeypatch):
+    """Testa que a leitura e a validação dos blocos não rodam no event loop"""
+    import asyncio
+    from src import statement_import
+
+    client, _ = authenticated_client
+    prepare_chunk = statement_import._prepare_chunk
+    loop_running = []
+
+    def spy(chunk, user_currency):
+        try:
+            asyncio.get_running_loop()
+            loop_running.append(True)
+        except RuntimeError:
+            loop_running.append(False)
+        return prepare_chunk(chunk, user_currency)
+
+    monkeypatch.setattr(statement_import, "_prepare_chunk", spy)
+    csv_content = "Data;Histórico;Valor\n15/01/2024;[TEST] a;10,00\n16/01/2024;[TEST] b;-5,00\n"
+
+    response = client.post(
+        "/transactions/import",
+        params={"chunk_size": 1},
+        files={"file": ("extrato.csv", csv_content.encode("utf-8"), "text/csv")},
+    )
+
+    assert response.status_code == 200
+    assert loop_running == [False, False]
+
+
+def test_import_ofx_statement(authenticated_client, db_session):
+    """Testa importação de OFX SGML exportado em uma única linha"""
+    client, _ = authenticated_client
+    import json
+
+    ofx_content = (
+        "OFXHEADER:100\nDATA:OFXSGML\nVERSION:102\n\n"
+        "<OFX><BANKMSGSRSV1><STMTTRNRS><STMTRS><BANKTRANLIST>"
+        "<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20240310120000[-3:BRT]<TRNAMT>-42.90<FITID>1<MEMO>[TEST] Farmácia</STMTTRN>"
+        "<STMTTRN><TRNTYPE>CREDIT<DTPOSTED>20240311<TRNAMT>300.00<FITID>2<NAME>[TEST] Reembolso</STMTTRN>"
+        "<STMTTRN><TRNTYPE>DEBIT<DTPOSTED>20240312<FITID>3<MEMO>[TEST] Sem valor</STMTTRN>"
+        "</BANKTRANLIST></STMTRS></STMTTRNRS></BANKMSGSRSV1></OFX>"
+    )
+
+    response = client.post(
+        "/transactions/import",
+        files={"file": ("extrato.ofx", ofx_content.encode("latin-1"), "application/x-ofx")},
+        params={"encoding": "latin-1"},
+    )
+
+    assert response.status_code == 200
+    events = [json.loads(line) for line in response.text.splitlines()]
+    assert events[-1]["done"] is True
+    assert events[-1]["created"] == 2
+    assert events[0]["errors"] == [{"index": 3, "errors": ["amount: TRNAMT ausente"]}]
+
+    listed = client.get("/transactions/").json()["items"]
+    by_description = {t["description"]: t for t in listed}
+    assert by_description["[TEST] Farmácia"]["type"] == "expense"
+    assert by_description["[TEST] Farmácia"]["created_at"].startswith("2024-03-10T15:00:00")
+    assert by_description["[TEST] Reembolso"]["type"] == "income"
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("1,234.56", "1234.56"),
+    ("-1,500.00", "-1500.00"),
+    ("1,234", "1234"),
+    ("1.234,56", "1234.56"),
+    ("R$ 1.234", "1234"),
+    ("-1.234.567,89", "-1234567.89"),
+    ("1234,5", "1234.5"),
+    ("0,500", "0.5"),
+    ("42.90", "42.90"),
+])
+def test_parse_amount_brazilian_and_us_formats(value, expected):
+    """Testa separadores de milhar e decimal nos formatos brasileiro e americano"""
+    from decimal import Decimal
+    from src.statement_import import parse_amount
+
+    assert parse_amount(value) == Decimal(expected)
+
+
+@pytest.mark.parametrize("value", ["1.234.56", "1,23,456.00", "1.2.3", "12,34,5", "abc", ""])
+def test_parse_amount_rejects_ambiguous_grouping(value):
+    """Testa que agrupamentos inconsistentes viram erro da linha, e não um valor errado"""
+    from src.statement_import import StatementParseError, parse_amount
+
+    with pytest.raises(StatementParseError):
+        parse_amount(value)
+
+
+def test_import_statement_missing_columns(authenticated_client):
+    """Testa que CSV sem colunas obrigatórias retorna 400"""
+    client, _ = authenticated_client
+    response = client.post(
+        "/transactions/import",
+        files={"file": ("extrato.csv", b"foo,bar\n1,2\n", "text/csv")},
+    )
+
+    assert response.status_code == 400
+    assert "amount" in response.json()["detail"]
+
+
+def test_export_transactions_csv(authenticated_client, db_session, monkeypatch):
+    """Testa exportação CSV em ordem cronológica, em vários lotes"""
+    client, user_id = authenticated_client
+    import csv
+    import io
+    from src.config import settings
+
+    monkeypatch.setattr(settings, "EXPORT_BATCH_SIZE", 2)
+    _seed_transactions(db_session, 5, user_id)
+
+    response = client.get("/transactions/export", params={"format": "csv"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert "attachment" in response.headers["content-disposition"]
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert [row["description"] for row in rows] == [f"[TEST] Transação {i}" for i in range(5)]
+    assert rows[0]["type"] == "income"
+    assert float(rows[1]["amount"]) == 11.0
+
+
+def test_export_opens_its_session_inside_the_response(authenticated_client, db_session, monkeypatch):
+    """Testa que a exportação não usa a sessão da dependency, encerrada antes do corpo no FastAPI >= 0.106"""
+    from src.database_sqlalchemy import get_async_read_db, get_async_read_sessionmaker
+    from src.main import app
+
+    client, user_id = authenticated_client
+    _seed_transactions(db_session, 3, user_id)
+    session_factory = app.dependency_overrides[get_async_read_sessionmaker]()
+    opened = []
+
+    def spy_factory():
+        opened.append(True)
+        return session_factory()
+
+    async def closed_session():
+        raise AssertionError("a exportação não deve usar get_async_read_db")
+        yield
+
+    monkeypatch.setitem(app.dependency_overrides, get_async_read_sessionmaker, lambda: spy_factory)
+    monkeypatch.setitem(app.dependency_overrides, get_async_read_db, closed_session)
+
+    response = client.get("/transactions/export", params={"format": "ndjson"})
+
     assert response.status_code == 200
+    assert len(response.text.splitlines()) == 3
+    assert opened == [True]
+
+
+def test_export_transactions_ndjson_with_filters(authenticated_client, db_session):
+    """Testa exportação NDJSON respeitando os filtros da listagem"""
+    client, user_id = authenticated_client
+    import json
+
+    _seed_transactions(db_session, 6, user_id)
+
+    response = client.get("/transactions/export", params={"format": "ndjson", "type": "expense"})
+
+    assert response.status_code == 200
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [row["description"] for row in rows] == ["[TEST] Transação 1", "[TEST] Transação 3", "[TEST] Transação 5"]
+    assert all(row["type"] == "expense" for row in rows)
+    assert rows[0]["category_name"] is None
+
+
+def test_export_transactions_invalid_format(authenticated_client):
+    """Testa que formatos desconhecidos retornam 400"""
+    client, _ = authenticated_client
+    response = client.get("/transactions/export", params={"format": "xlsx"})
+
+    assert response.status_code == 400
+
+
+def test_amounts_are_exact_in_cents(authenticated_client, db_session):
+    """Testa que valores e somas não acumulam erro de ponto flutuante"""
+    from src.database import Transaction as TransactionModel
+
+    client, _ = authenticated_client
+    for _ in range(3):
+        response = client.post("/transactions/", json={"type": "income", "amount": 0.1, "description": "[TEST] centavos"})
+        assert response.status_code == 201
+    assert response.json()["amount"] == 0.1
+    assert response.json()["currency"] == "BRL"
+    assert [row.amount_cents for row in db_session.query(TransactionModel).all()] == [10, 10, 10]
+
+    summary = client.get("/transactions/summary").json()
+    assert summary["monthly_income"] == 0.3
+    assert summary["current_balance"] == 0.3
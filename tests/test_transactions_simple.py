@@ -3,9 +3,10 @@ import pytest
 from fastapi.testclient import TestClient
 
 
-def test_create_transaction_success_mocked(test_client: TestClient):
+def test_create_transaction_success_mocked(authenticated_client):
     """Testa criação bem-sucedida de transação com mock"""
-    response = test_client.post("/transactions/", json={
+    client, user_id = authenticated_client
+    response = client.post("/transactions/", json={
         "type": "income",
         "amount": 100.0,
         "description": "[TEST] Mocked success transaction - should not save to DB"
@@ -14,8 +15,9 @@ def test_create_transaction_success_mocked(test_client: TestClient):
     assert response.status_code == 201
 
 
-def test_list_transactions_success_mocked(test_client: TestClient):
+def test_list_transactions_success_mocked(authenticated_client):
     """Testa listagem bem-sucedida de transações com mock"""
-    response = test_client.get("/transactions/")
+    client, user_id = authenticated_client
+    response = client.get("/transactions/")
 
     assert response.status_code == 200
@@ -8,7 +8,9 @@ client = TestClient(app)
 
 @pytest.fixture
 def mock_auth_service():
-    with patch('src.auth.dependencies.AuthService') as mock_service_class:
+    # Sem instância compartilhada, para que o AuthService mockado seja criado
+    with patch('src.auth.dependencies._auth_service', None), \
+            patch('src.auth.dependencies.AuthService') as mock_service_class:
         mock_service_instance = AsyncMock()
         mock_service_class.return_value = mock_service_instance
         with patch('supabase.client.create_client') as mock_create_client: